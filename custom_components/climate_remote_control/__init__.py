@@ -5,18 +5,44 @@ import logging
 from homeassistant import config_entries
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .config import async_get_config, async_remove_config
+from .const import CONF_CODE_TABLE, DOMAIN
+from .hub import async_unload_hub
+from .profiles import async_load_profiles
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [
     Platform.CLIMATE,
     Platform.BUTTON,
+    Platform.SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up integration services and load model profiles."""
+    await async_load_profiles(hass)
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant, config_entry: config_entries.ConfigEntry
 ) -> bool:
+    if config_entry.options:
+        """Options are parsed once and shared by platforms"""
+        async_remove_config(hass, config_entry)
+        try:
+            async_get_config(hass, config_entry)
+        except ValueError as ex:
+            raise ConfigEntryError(f"Invalid options: {ex}") from ex
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
     config_entry.async_on_unload(config_entry.add_update_listener(update_listener))
     return True
@@ -26,7 +52,26 @@ async def async_unload_entry(
     hass: HomeAssistant, config_entry: config_entries.ConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+    unloaded = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+    if unloaded:
+        async_remove_config(hass, config_entry)
+    if unloaded and not any(
+        entry.entry_id != config_entry.entry_id
+        for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+    ):
+        async_unload_hub(hass)
+    return unloaded
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, config_entry: config_entries.ConfigEntry
+) -> None:
+    """Delete the compiled code table of a removed entry."""
+    if (code_table := config_entry.options.get(CONF_CODE_TABLE)) is None:
+        return
+    from .codes import remove_code_table
+
+    await hass.async_add_executor_job(remove_code_table, hass.config.path(code_table))
 
 
 async def update_listener(
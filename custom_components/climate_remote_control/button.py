@@ -1,17 +1,22 @@
 """Platform for button integration."""
 
+import asyncio
 import logging
 from typing import Any
 
 from homeassistant import config_entries
 from homeassistant.components.button import ButtonEntity
 from homeassistant.components.remote import SERVICE_SEND_COMMAND
-from homeassistant.const import CONF_DEVICE, CONF_TARGET, Platform
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import CONF_MODE, CONF_MODES, CONF_SWING, DOMAIN, SwingMode
+from .config import async_get_config
+from .const import DOMAIN, SwingMode
+from .delivery import DeliveryOptions, Priority, SendResult
+from .hub import async_get_hub
+from .target import RemoteTarget
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,23 +32,21 @@ async def async_setup_entry(
         return
     devices = []
 
-    options = config_entry.options
+    config = async_get_config(hass, config_entry)
 
     unique_id = config_entry.unique_id
     name = config_entry.title
 
-    target = options[CONF_TARGET]
-    device = options[CONF_DEVICE]
-    swing = options[CONF_SWING]
-    if swing[CONF_MODE] == SwingMode.TOGGLE:
-        for mode in swing[CONF_MODES]:
+    if config.swing_mode == SwingMode.TOGGLE:
+        for mode in config.swing_modes:
             devices.append(
                 AcRemoteSwingToggle(
                     unique_id=unique_id,
                     name=name,
-                    target=target,
-                    device=device,
+                    target=config.target,
+                    device=config.device,
                     mode=mode,
+                    delivery_options=config.delivery,
                 )
             )
 
@@ -59,6 +62,8 @@ class AcRemoteSwingToggle(ButtonEntity):
     target: dict[str, Any] = {}
     device: str
     mode: str
+    remote_target: RemoteTarget | None = None
+    delivery_options: DeliveryOptions
 
     def __init__(
         self,
@@ -67,9 +72,11 @@ class AcRemoteSwingToggle(ButtonEntity):
         target,
         device,
         mode,
+        delivery_options: DeliveryOptions | None = None,
     ) -> None:
         """Initialize."""
         self.device = device
+        self.delivery_options = delivery_options or DeliveryOptions()
         self._attr_unique_id = unique_id
 
         self.target = target
@@ -82,31 +89,41 @@ class AcRemoteSwingToggle(ButtonEntity):
             name=name,
         )
 
-    def press(self) -> None:
-        services = self.hass.services
+    async def async_press(self) -> None:
         command = "swing:" + self.mode
+        if self.remote_target is None:
+            self.remote_target = RemoteTarget(self.hass, self.target)
+        remote_entity_ids = self.remote_target.entity_ids
         _LOGGER.debug(
             "Calling service %s.%s, with command=%s, target=%s",
             Platform.REMOTE,
             SERVICE_SEND_COMMAND,
             command,
-            self.target,
+            remote_entity_ids,
         )
-        try:
-            services.call(
-                domain=Platform.REMOTE,
-                service=SERVICE_SEND_COMMAND,
-                service_data={
-                    "command": command,
-                    "device": self.device,
-                    "num_repeats": 1,
-                    "delay_secs": 0,
-                    "hold_secs": 0,
-                },
-                target=self.target,
-                blocking=True,
+        service_data = {
+            "command": command,
+            "device": self.device,
+            "num_repeats": 1,
+            "delay_secs": 0,
+            "hold_secs": 0,
+        }
+        hub = async_get_hub(self.hass)
+        stats = hub.async_get_device_stats(self.unique_id)
+        results = await asyncio.gather(
+            *(
+                hub.async_get_blaster(remote_entity_id).async_send(
+                    service_data,
+                    self.delivery_options,
+                    Priority.SWING,
+                    self.unique_id,
+                    stats,
+                    idempotent=False,
+                )
+                for remote_entity_id in remote_entity_ids
             )
-        except ValueError:
+        )
+        if SendResult.MISSING_CODE in results:
             """todo: send permanent notification to learn new command"""
             _LOGGER.warning(
                 'Command "%s" for device "%s" not found. You should learn it.',
@@ -1,9 +1,13 @@
 """Platform for climate integration."""
 
 import asyncio
+import dataclasses
 from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 import logging
-from typing import Any, Self
+import time
+from typing import TYPE_CHECKING, Any, Self
 
 from homeassistant import config_entries
 from homeassistant.components.climate import (
@@ -18,6 +22,7 @@ from homeassistant.components.climate import (
     PRESET_NONE,
     ClimateEntity,
     ClimateEntityFeature,
+    HVACAction,
     HVACMode,
 )
 from homeassistant.components.remote import (
@@ -26,54 +31,96 @@ from homeassistant.components.remote import (
     ATTR_HOLD_SECS,
     ATTR_NUM_REPEATS,
 )
-from homeassistant.components.remote import (
-    SERVICE_SEND_COMMAND,
-)
 from homeassistant.components.remote import DOMAIN as RM_DOMAIN
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
 from homeassistant.const import (
     ATTR_COMMAND,
-    CONF_DEVICE,
-    CONF_TARGET,
-    CONF_TEMPERATURE_UNIT,
+    ATTR_TIME,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfTemperature,
 )
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Event,
     EventStateChangedData,
     HomeAssistant,
     State,
     callback,
 )
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
 
+from .config import EntryConfig, ModeProfile, async_get_config
+from .confirmation import PowerConfirmation
 from .const import (
+    ATTR_CIRCUIT_BREAKER,
+    ATTR_PENDING,
+    ATTR_PRECONDITION,
+    ATTR_PRECONDITION_START,
+    ATTR_RATE_LIMIT_WAIT,
     ATTR_TEMPERATURE_RANGE,
-    CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID,
-    CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID,
-    CONF_FAN_MODES,
-    CONF_GROUPING_ATTRIBUTES,
-    CONF_GROUPING_ATTRIBUTES_AS_SEQUENCE,
-    CONF_HVAC_MODES,
-    CONF_MAX,
-    CONF_MIN,
-    CONF_MODE,
-    CONF_MODES,
-    CONF_PRESET_MODES,
-    CONF_SWING,
-    CONF_TEMPERATURE,
-    CONF_TEMPERATURE_STEP,
+    ATTR_THERMAL_MODEL,
+    ATTR_THERMOSTAT_RUNNING,
+    CONF_CONFIRMATION,
+    CONF_SCHEDULE,
     DOMAIN,
+    SIGNAL_BLASTER_READY,
+    SIGNAL_CONFIG_UPDATED,
     SwingMode,
     TemperatureMode,
 )
+from .delivery import Blaster, BreakerState, Priority, SendResult
+from .hub import async_get_hub
+from .precondition import MODE_SIGNS, Precondition
+from .schedule import get_next_state
+from .target import RemoteTarget
+from .thermal import ThermalModels
+from .thermostat import Thermostat
+
+if TYPE_CHECKING:
+    from .codes import CodeTable
 
 _LOGGER = logging.getLogger(__name__)
 
+"""Attributes which can be set by async_apply_state with their entity fields"""
+STATE_ATTRIBUTES = {
+    ATTR_HVAC_MODE: "_attr_hvac_mode",
+    ATTR_TEMPERATURE: "_attr_target_temperature",
+    ATTR_FAN_MODE: "_attr_fan_mode",
+    ATTR_SWING_MODE: "_attr_swing_mode",
+    ATTR_PRESET_MODE: "_attr_preset_mode",
+}
+STATE_PRIORITIES = {
+    ATTR_HVAC_MODE: Priority.POWER,
+    ATTR_SWING_MODE: Priority.SWING,
+}
+
+"""Actions of HVAC modes while thermostat runs the unit"""
+HVAC_ACTIONS = {
+    HVACMode.COOL: HVACAction.COOLING,
+    HVACMode.HEAT: HVACAction.HEATING,
+    HVACMode.DRY: HVACAction.DRYING,
+    HVACMode.FAN_ONLY: HVACAction.FAN,
+}
+
+"""Attributes which are used as keys in imported code files"""
+CODE_TABLE_ATTRIBUTES = (
+    ATTR_HVAC_MODE,
+    ATTR_FAN_MODE,
+    ATTR_SWING_MODE,
+    ATTR_TEMPERATURE,
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -85,7 +132,21 @@ async def async_setup_entry(
         _LOGGER.debug("Climate remote control platform is not configured, skip.")
         return
 
-    async_add_devices([RestoreAcRemote(config_entry)])
+    config = async_get_config(hass, config_entry)
+    code_table = None
+    if config.code_table:
+        """Code tables are rare, their module isn't imported without one"""
+        from .codes import CodeFileError, CodeTable
+
+        try:
+            code_table = await hass.async_add_executor_job(
+                CodeTable.open, hass.config.path(config.code_table)
+            )
+            config_entry.async_on_unload(code_table.close)
+        except CodeFileError as ex:
+            _LOGGER.error("Learned commands will be used instead of code file: %s", ex)
+
+    async_add_devices([RestoreAcRemote(config_entry, config, code_table)])
 
 
 class AcRemote(ClimateEntity):
@@ -103,73 +164,66 @@ class AcRemote(ClimateEntity):
 
     _attr_supported_features = ClimateEntityFeature(0)
 
-    _target: dict[str, Any]
-    _device: str
-    _temperature_conf: dict[str, Any]
-    _hvac_modes_conf: dict[str, Any]
-    _grouping_attributes: [str]
-    _grouping_attributes_as_sequence: bool
-    _current_temperature_sensor_entity_id: str | None
-    _current_humidity_sensor_entity_id: str | None
+    """Lists of modes and temperature limits are unrecorded by climate component.
+    Delivery attributes change on every command and aren't history of the unit,
+    delivery sensors record them once a minute. Start of preconditioning moves
+    with every temperature reading.
+    """
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_PENDING,
+            ATTR_CIRCUIT_BREAKER,
+            ATTR_RATE_LIMIT_WAIT,
+            ATTR_PRECONDITION_START,
+        }
+    )
+
+    _config: EntryConfig
+    _code_table: "CodeTable | None"
+    _remote_target: RemoteTarget | None = None
+    _pending_remote_entity_ids: set[str]
+    _tracked_remote_entity_ids: tuple[str, ...] = ()
+    _unsubscribe_remote_entities: CALLBACK_TYPE | None = None
+    _thermostat: Thermostat | None = None
+    _unsubscribe_thermostat_retry: CALLBACK_TYPE | None = None
+    _thermal: ThermalModels | None = None
+    _precondition: Precondition | None = None
+    _confirmation: PowerConfirmation | None = None
+
+    """Negative cache of commands which remote reported as not learned"""
+    _missing_commands: set[tuple[str, ...]]
 
     def __init__(
         self,
         config_entry: config_entries.ConfigEntry,
+        config: EntryConfig,
+        code_table: "CodeTable | None" = None,
     ) -> None:
         """Initialize."""
-        options = config_entry.options
         unique_id = config_entry.unique_id
         self._attr_unique_id = unique_id
 
-        self._grouping_attributes = options.get(CONF_GROUPING_ATTRIBUTES)
-        self._grouping_attributes_as_sequence = options.get(
-            CONF_GROUPING_ATTRIBUTES_AS_SEQUENCE, False
-        )
-        self._temperature_conf = options.get(CONF_TEMPERATURE)
-        self._hvac_modes_conf = options.get(CONF_HVAC_MODES)
-        self._device = options.get(CONF_DEVICE)
-        self._target = options.get(CONF_TARGET)
-        temperature_unit = options.get(CONF_TEMPERATURE_UNIT)
-        if temperature_unit == "c":
-            self._attr_temperature_unit = UnitOfTemperature.CELSIUS
-        if temperature_unit == "f":
-            self._attr_temperature_unit = UnitOfTemperature.FAHRENHEIT
-        self._attr_hvac_modes = list(HVACMode(x) for x in self._hvac_modes_conf.keys())
+        self._config = config
+        self._code_table = code_table
+        self._pending_remote_entity_ids = set()
+        self._off_generation = 0
+        self._missing_commands = set()
+        if config.thermostat is not None:
+            self._thermostat = Thermostat()
+        if config.confirmation is not None:
+            self._confirmation = PowerConfirmation()
+        self._attr_temperature_unit = config.temperature_unit
+        self._attr_hvac_modes = list(config.hvac_modes)
         self._attr_hvac_mode = self._attr_hvac_modes[0]
 
-        self._fill_temperature_attributes(self._temperature_conf)
-        self._attr_target_temperature_step = options.get(CONF_TEMPERATURE_STEP)
-
-        # Configure fan modes
-        self._attr_fan_mode = None
-        self._attr_fan_modes = options.get(CONF_FAN_MODES)
-        if len(self._attr_fan_modes) > 0:
-            self._attr_fan_mode = self._attr_fan_modes[0]
-            self._attr_supported_features |= ClimateEntityFeature.FAN_MODE
-
-        # Configure preset modes
+        self._attr_target_temperature_step = config.temperature_step
+        self._attr_fan_mode = config.fan_modes[0] if config.fan_modes else None
         self._attr_preset_mode = None
-        self._attr_preset_modes = options.get(CONF_PRESET_MODES)
-        if len(self._attr_preset_modes) > 0:
-            self._attr_supported_features |= ClimateEntityFeature.PRESET_MODE
-
-        # Configure swing modes
-        swing = options[CONF_SWING]
-        self._attr_swing_modes = swing[CONF_MODES]
-        if swing[CONF_MODE] == SwingMode.STATE:
-            if len(self._attr_swing_modes) > 0:
-                self._attr_swing_mode = self._attr_swing_modes[0]
-                self._attr_supported_features |= ClimateEntityFeature.SWING_MODE
-        else:
-            self._attr_swing_mode = None
-
-        # Configure sensors
-        self._current_temperature_sensor_entity_id = options.get(
-            CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID
-        )
-        self._current_humidity_sensor_entity_id = options.get(
-            CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID
-        )
+        self._attr_preset_modes = list(config.preset_modes)
+        self._attr_swing_mode = None
+        if config.swing_mode == SwingMode.STATE and config.swing_modes:
+            self._attr_swing_mode = config.swing_modes[0]
+        self._apply_profile()
 
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, unique_id)},
@@ -177,26 +231,38 @@ class AcRemote(ClimateEntity):
             name=config_entry.title,
         )
 
-    def _fill_temperature_attributes(self, temperature):
-        if temperature[CONF_MODE] == TemperatureMode.NONE:
-            self._attr_supported_features ^= (
-                self._attr_supported_features & ClimateEntityFeature.TARGET_TEMPERATURE
-            )
+    @property
+    def _profile(self) -> ModeProfile:
+        return self._config.profiles[self._attr_hvac_mode]
+
+    def _apply_profile(self) -> None:
+        """Switch features and mode lists to the profile of the current HVAC mode"""
+        profile = self._profile
+        self._attr_supported_features = profile.supported_features
+        self._attr_fan_modes = list(profile.fan_modes)
+        self._attr_swing_modes = list(profile.swing_modes)
+        if profile.fan_modes and self._attr_fan_mode not in profile.fan_modes:
+            self._attr_fan_mode = profile.fan_modes[0]
+        if (
+            profile.supported_features & ClimateEntityFeature.SWING_MODE
+            and self._attr_swing_mode not in profile.swing_modes
+        ):
+            self._attr_swing_mode = profile.swing_modes[0]
+        temperature = profile.temperature
+        if temperature.mode == TemperatureMode.NONE:
             return
-        self._attr_min_temp = temperature[CONF_MIN]
-        self._attr_max_temp = temperature[CONF_MAX]
-        if temperature[CONF_MODE] == TemperatureMode.TARGET:
-            self._attr_supported_features |= ClimateEntityFeature.TARGET_TEMPERATURE
-            if self._attr_target_temperature is None:
-                self._attr_target_temperature = temperature[CONF_MIN]
-        if temperature[CONF_MODE] == TemperatureMode.RANGE:
-            self._attr_supported_features |= (
-                ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
-            )
+        self._attr_min_temp = temperature.min
+        self._attr_max_temp = temperature.max
+        if (
+            temperature.mode == TemperatureMode.TARGET
+            and self._attr_target_temperature is None
+        ):
+            self._attr_target_temperature = temperature.min
+        if temperature.mode == TemperatureMode.RANGE:
             if getattr(self, "_attr_target_temperature_low", None) is None:
-                self._attr_target_temperature_low = temperature[CONF_MIN]
+                self._attr_target_temperature_low = temperature.min
             if getattr(self, "_attr_target_temperature_high", None) is None:
-                self._attr_target_temperature_high = temperature[CONF_MIN]
+                self._attr_target_temperature_high = temperature.min
 
     def _get_attr_command(self, key: str) -> str:
         attr_key = key
@@ -228,84 +294,365 @@ class AcRemote(ClimateEntity):
             attr_value = str(self._attr_target_humidity)
         return attr_key + (":" + str(attr_value)) if attr_value != "" else ""
 
-    def _get_temperature_conf(self):
-        temperature_conf = self._temperature_conf
-        hvac_mode = self._attr_hvac_mode
-        if CONF_TEMPERATURE in self._hvac_modes_conf[hvac_mode]:
-            temperature_conf = self._hvac_modes_conf[hvac_mode][CONF_TEMPERATURE]
-        return temperature_conf
+    def _get_grouping_attributes(self) -> tuple[str, ...]:
+        return self._profile.grouping_attributes
 
-    def _get_grouping_attributes(self) -> [str]:
-        grouping_attributes = self._grouping_attributes.copy()
+    def _get_code_table_command(self, key: str) -> str | None:
+        """Get code from imported code file by current state"""
+        if self._code_table is None or key not in CODE_TABLE_ATTRIBUTES:
+            return None
+        return self._code_table.lookup(
+            self._attr_hvac_mode,
+            self._attr_fan_mode,
+            self._attr_swing_mode,
+            getattr(self, "_attr_target_temperature", None),
+        )
 
-        supported_features = self._attr_supported_features
-        if (
-            not supported_features & ClimateEntityFeature.TARGET_TEMPERATURE
-            and ATTR_TEMPERATURE in grouping_attributes
-        ):
-            grouping_attributes.remove(ATTR_TEMPERATURE)
-        if (
-            not supported_features & ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
-            and ATTR_TEMPERATURE_RANGE in grouping_attributes
-        ):
-            grouping_attributes.remove(ATTR_TEMPERATURE_RANGE)
-        if (
-            not supported_features & ClimateEntityFeature.TARGET_HUMIDITY
-            and ATTR_HUMIDITY in grouping_attributes
-        ):
-            grouping_attributes.remove(ATTR_HUMIDITY)
-        if len(self._attr_fan_modes) < 1 and ATTR_FAN_MODE in grouping_attributes:
-            grouping_attributes.remove(ATTR_FAN_MODE)
-        if len(self._attr_swing_modes) < 1 and ATTR_SWING_MODE in grouping_attributes:
-            grouping_attributes.remove(ATTR_SWING_MODE)
-        return grouping_attributes
+    def _get_special_command(self, command: str) -> str:
+        """Get "on" or "off" command"""
+        if self._code_table is not None:
+            code = self._code_table.lookup(command)
+            if code is not None:
+                return code
+        return command
 
     def _get_commands(self, key: str) -> [str]:
         """Get code by current state and keys"""
+        code = self._get_code_table_command(key)
+        if code is not None:
+            return [code]
         grouping_attributes = self._get_grouping_attributes()
         if key not in grouping_attributes:
             return [self._get_attr_command(key)]
         commands: [str] = []
         for grouping_key in grouping_attributes:
             commands.append(self._get_attr_command(grouping_key))
-        if self._grouping_attributes_as_sequence:
+        if self._config.grouping_attributes_as_sequence:
             return commands
         return ["_".join(str(x) for x in commands)]
 
+    def _is_whole_state_command(self, commands: list[str]) -> bool:
+        """Whether commands carry all grouped attributes of the current state"""
+        code = self._get_code_table_command(ATTR_HVAC_MODE)
+        if code is not None:
+            return commands == [code]
+        grouping_attributes = self._get_grouping_attributes()
+        return bool(grouping_attributes) and commands == self._get_commands(
+            grouping_attributes[0]
+        )
+
+    def _get_state_commands(self) -> list[tuple[list[str], bool]]:
+        """Get commands with "should learn" flags which set the current state"""
+        if self._attr_hvac_mode == HVACMode.OFF or self._is_held_off():
+            return [([self._get_special_command("off")], True)]
+        state_commands = [
+            ([self._get_special_command("on")], False),
+            (self._get_commands(ATTR_HVAC_MODE), True),
+        ]
+        grouping_attributes = self._get_grouping_attributes()
+        if ATTR_HVAC_MODE not in grouping_attributes:
+            grouping_attributes = ()
+        supported_features = self._attr_supported_features
+        for key, feature in (
+            (ATTR_FAN_MODE, ClimateEntityFeature.FAN_MODE),
+            (ATTR_SWING_MODE, ClimateEntityFeature.SWING_MODE),
+            (ATTR_TEMPERATURE, ClimateEntityFeature.TARGET_TEMPERATURE),
+            (ATTR_TEMPERATURE_RANGE, ClimateEntityFeature.TARGET_TEMPERATURE_RANGE),
+        ):
+            if supported_features & feature and key not in grouping_attributes:
+                state_commands.append((self._get_commands(key), True))
+        return state_commands
+
+    async def _async_send_state(
+        self, remote_entity_ids: tuple[str, ...] | None = None
+    ) -> None:
+        """Send commands which set the current state"""
+        off_generation = self._off_generation
+        for index, (commands, should_learn) in enumerate(self._get_state_commands()):
+            if index == 1:
+                await asyncio.sleep(1)
+                if off_generation != self._off_generation:
+                    return
+            await self._async_call_remote_command(
+                commands,
+                should_learn,
+                remote_entity_ids,
+                self._get_state_command_priority(index),
+            )
+
+    def _get_state_command_priority(self, index: int) -> Priority:
+        """Get priority of a command from _get_state_commands by its index"""
+        if self._attr_hvac_mode == HVACMode.OFF or self._is_held_off():
+            return Priority.OFF
+        if index < 2:
+            return Priority.POWER
+        return Priority.ADJUSTMENT
+
+    def _get_remote_entity_ids(self) -> tuple[str, ...]:
+        """Get remote entity ids resolved from the target"""
+        if self._remote_target is None:
+            self._remote_target = RemoteTarget(self.hass, self._config.target)
+        remote_entity_ids = self._remote_target.entity_ids
+        if remote_entity_ids != self._tracked_remote_entity_ids:
+            self._async_track_remote_entities(remote_entity_ids)
+        return remote_entity_ids
+
+    @callback
+    def _async_track_remote_entities(self, remote_entity_ids: tuple[str, ...]):
+        """Subscribe to availability of remote entities"""
+        if self.platform is None:
+            return
+        if self._unsubscribe_remote_entities is not None:
+            self._unsubscribe_remote_entities()
+        self._tracked_remote_entity_ids = remote_entity_ids
+        self._pending_remote_entity_ids &= set(remote_entity_ids)
+        self._unsubscribe_remote_entities = async_track_state_change_event(
+            self.hass, remote_entity_ids, self._async_remote_state_changed
+        )
+
+    @callback
+    def _async_untrack_remote_entities(self) -> None:
+        if self._unsubscribe_remote_entities is not None:
+            self._unsubscribe_remote_entities()
+            self._unsubscribe_remote_entities = None
+        self._tracked_remote_entity_ids = ()
+
+    @callback
+    def _async_remote_state_changed(self, event: Event[EventStateChangedData]):
+        """Flush pending state when remote entity becomes available"""
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
+        if new_state is None or new_state.state == STATE_UNAVAILABLE:
+            return
+        self._async_send_pending_state(entity_id)
+
+    @callback
+    def _async_send_pending_state(self, remote_entity_id: str) -> None:
+        """Send the latest state to remote if it was postponed"""
+        if remote_entity_id not in self._pending_remote_entity_ids:
+            return
+        self._pending_remote_entity_ids.discard(remote_entity_id)
+        _LOGGER.debug("Remote %s is ready, sending pending state", remote_entity_id)
+        self.hass.async_create_task(self._async_flush_state(remote_entity_id))
+        self.async_write_ha_state()
+
+    async def _async_flush_state(self, remote_entity_id: str) -> None:
+        await self._async_send_state((remote_entity_id,))
+        self.async_write_ha_state()
+
+    def _is_remote_unavailable(self, remote_entity_id: str) -> bool:
+        state = self.hass.states.get(remote_entity_id)
+        return state is not None and state.state == STATE_UNAVAILABLE
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        attributes = {
+            ATTR_PENDING: bool(self._pending_remote_entity_ids),
+            ATTR_CIRCUIT_BREAKER: self._get_circuit_breaker_state(),
+            ATTR_RATE_LIMIT_WAIT: round(
+                max((x.wait_time for x in self._get_blasters()), default=0.0), 2
+            ),
+        }
+        if self._precondition is not None:
+            attributes[ATTR_PRECONDITION] = {
+                ATTR_TIME: dt_util.utc_from_timestamp(self._precondition.deadline),
+                ATTR_HVAC_MODE: self._precondition.hvac_mode,
+                ATTR_TEMPERATURE: self._precondition.temperature,
+            }
+            start = async_get_hub(self.hass).timers.get_fire_time(
+                (ATTR_PRECONDITION, self.unique_id)
+            )
+            if start is not None:
+                attributes[ATTR_PRECONDITION_START] = dt_util.utc_from_timestamp(start)
+        return attributes
+
+    def _get_blasters(self) -> list[Blaster]:
+        """Get blasters of target remotes which have been used"""
+        if self.hass is None or self._remote_target is None:
+            return []
+        blasters = async_get_hub(self.hass).blasters
+        return [blasters[x] for x in self._remote_target.entity_ids if x in blasters]
+
+    def _get_circuit_breaker_state(self) -> BreakerState:
+        """Get the worst circuit breaker state of target remotes"""
+        states = {x.breaker.state() for x in self._get_blasters()}
+        for state in (BreakerState.OPEN, BreakerState.HALF_OPEN):
+            if state in states:
+                return state
+        return BreakerState.CLOSED
+
     async def _async_call_remote_command(
-        self, commands: [str], should_learn: bool = True
+        self,
+        commands: [str],
+        should_learn: bool = True,
+        remote_entity_ids: tuple[str, ...] | None = None,
+        priority: Priority = Priority.ADJUSTMENT,
     ):
-        services = self.hass.services
+        if priority == Priority.OFF:
+            """Commands which wait for sending after "off" are cancelled"""
+            self._off_generation += 1
+        elif self._is_held_off():
+            """Unit is held off by thermostat, the state is sent when it starts"""
+            return
+        if remote_entity_ids is None:
+            remote_entity_ids = self._get_remote_entity_ids()
+        hub = async_get_hub(self.hass)
+        if not remote_entity_ids:
+            _LOGGER.warning(
+                "Target %s doesn't contain any remote entity, command %s is skipped",
+                self._config.target,
+                commands,
+            )
+            return
+        unavailable = [x for x in remote_entity_ids if self._is_remote_unavailable(x)]
+        if unavailable:
+            """Only the latest state is sent when remote becomes available"""
+            _LOGGER.debug(
+                "Remotes %s are unavailable, command %s is postponed",
+                unavailable,
+                commands,
+            )
+            self._pending_remote_entity_ids.update(unavailable)
+            hub.async_get_device_stats(self.unique_id).record_suppressed(
+                len(unavailable)
+            )
+            remote_entity_ids = tuple(
+                x for x in remote_entity_ids if x not in unavailable
+            )
+            if not remote_entity_ids:
+                return
         _LOGGER.debug(
             "Calling service %s.%s, with command=%s, device=%s, target=%s",
             RM_DOMAIN,
             SERVICE_SEND_COMMAND,
             commands,
-            self._device,
-            self._target,
+            self._config.device,
+            remote_entity_ids,
         )
-        try:
-            await services.async_call(
-                domain=RM_DOMAIN,
-                service=SERVICE_SEND_COMMAND,
-                service_data={
-                    ATTR_COMMAND: commands,
-                    ATTR_NUM_REPEATS: 1,
-                    ATTR_DELAY_SECS: 1,
-                    ATTR_HOLD_SECS: 0,
-                    ATTR_DEVICE: self._device,
-                },
-                target=self._target,
-                blocking=True,
+        service_data = {
+            ATTR_COMMAND: commands,
+            ATTR_NUM_REPEATS: 1,
+            ATTR_DELAY_SECS: 1,
+            ATTR_HOLD_SECS: 0,
+            ATTR_DEVICE: self._config.device,
+        }
+        stats = hub.async_get_device_stats(self.unique_id)
+        whole_state = self._is_whole_state_command(commands)
+        results = await asyncio.gather(
+            *(
+                hub.async_get_blaster(remote_entity_id).async_send(
+                    service_data,
+                    self._config.delivery,
+                    priority,
+                    self.unique_id,
+                    stats,
+                    whole_state,
+                )
+                for remote_entity_id in remote_entity_ids
             )
-        except ValueError:
-            """todo: send permanent notification to learn new command"""
-            if should_learn:
-                _LOGGER.warning(
-                    'Command "%s" for device "%s" not found. You should learn it.',
-                    commands,
-                    self._device,
+        )
+        for remote_entity_id, result in zip(remote_entity_ids, results, strict=True):
+            if result == SendResult.REJECTED:
+                """Latest state is sent when circuit breaker allows it"""
+                self._pending_remote_entity_ids.add(remote_entity_id)
+        if priority in (Priority.OFF, Priority.POWER):
+            self._async_expect_power(
+                tuple(
+                    remote_entity_id
+                    for remote_entity_id, result in zip(
+                        remote_entity_ids, results, strict=True
+                    )
+                    if result in (SendResult.DELIVERED, SendResult.UNKNOWN)
                 )
+            )
+        if SendResult.MISSING_CODE in results and should_learn:
+            if tuple(commands) in self._missing_commands:
+                _LOGGER.debug("Command %s is still not learned", commands)
+                return
+            self._missing_commands.add(tuple(commands))
+            """todo: send permanent notification to learn new command"""
+            _LOGGER.warning(
+                'Command "%s" for device "%s" not found. You should learn it.',
+                commands,
+                self._config.device,
+            )
+
+    @callback
+    def _async_expect_power(self, remote_entity_ids: tuple[str, ...]) -> None:
+        """Wait for the power sensor to confirm frames which start or stop the unit"""
+        if self._confirmation is None or not remote_entity_ids:
+            return
+        options = self._config.confirmation
+        running = self._attr_hvac_mode != HVACMode.OFF and not self._is_held_off()
+        self._confirmation.expect(running, remote_entity_ids)
+        timers = async_get_hub(self.hass).timers
+        key = (CONF_CONFIRMATION, self.unique_id)
+        if self._confirmation.observe(
+            options,
+            self._get_power(self.hass.states.get(options.power_sensor_entity_id)),
+        ):
+            """Unit is already in the state, e.g. mode changed while running"""
+            timers.async_cancel(key)
+            return
+        timers.async_schedule(
+            key,
+            dt_util.utcnow().timestamp() + options.timeout,
+            self._async_confirmation_timeout,
+        )
+
+    def _get_power(self, new_state: State | None) -> float | None:
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            return float(new_state.state)
+        except ValueError as ex:
+            _LOGGER.error("Unable to update from power sensor: %s", ex)
+            return None
+
+    @callback
+    def _async_power_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Handle power sensor changes."""
+        confirmation = self._confirmation
+        remote_entity_ids = confirmation.remote_entity_ids
+        if confirmation.observe(
+            self._config.confirmation, self._get_power(event.data["new_state"])
+        ):
+            async_get_hub(self.hass).timers.async_cancel(
+                (CONF_CONFIRMATION, self.unique_id)
+            )
+            self._async_record_confirmation(remote_entity_ids, True)
+
+    @callback
+    def _async_record_confirmation(
+        self, remote_entity_ids: tuple[str, ...], confirmed: bool
+    ) -> None:
+        hub = async_get_hub(self.hass)
+        hub.async_get_device_stats(self.unique_id).record_confirmation(confirmed)
+        for remote_entity_id in remote_entity_ids:
+            hub.async_get_blaster(remote_entity_id).stats.record_confirmation(confirmed)
+
+    async def _async_confirmation_timeout(self) -> None:
+        """Resend frames the unit missed, the number of resends is bounded"""
+        confirmation = self._confirmation
+        expected = confirmation.expected
+        remote_entity_ids = confirmation.remote_entity_ids
+        self._async_record_confirmation(remote_entity_ids, False)
+        if not confirmation.timeout(self._config.confirmation):
+            _LOGGER.warning(
+                "Unit %s didn't %s after %s resends, power sensor %s",
+                self.entity_id,
+                "start" if expected else "stop",
+                self._config.confirmation.max_resends,
+                self._config.confirmation.power_sensor_entity_id,
+            )
+            return
+        _LOGGER.debug(
+            "Unit %s didn't confirm, resending state to %s",
+            self.entity_id,
+            remote_entity_ids,
+        )
+        await self._async_send_state(remote_entity_ids)
 
     async def _async_update_current_temperature_changed(
         self, event: Event[EventStateChangedData]
@@ -313,6 +660,9 @@ class AcRemote(ClimateEntity):
         """Handle temperature sensor changes."""
         new_state = event.data["new_state"]
         self._async_update_current_temperature(new_state)
+        self._async_observe_thermal(new_state)
+        self._async_plan_precondition()
+        await self._async_control_thermostat()
 
     async def _async_update_current_humidity_changed(
         self, event: Event[EventStateChangedData]
@@ -332,6 +682,43 @@ class AcRemote(ClimateEntity):
         except ValueError as ex:
             _LOGGER.error("Unable to update from temperature sensor: %s", ex)
 
+    @callback
+    def _async_observe_thermal(self, new_state: State | None) -> None:
+        """Add sensor reading to the thermal model of the room"""
+        if (
+            self._thermal is None
+            or new_state is None
+            or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+        ):
+            return
+        try:
+            temperature = float(new_state.state)
+        except ValueError:
+            return
+        self._thermal.observe(
+            self.unique_id,
+            temperature,
+            new_state.last_updated_timestamp,
+            *self._get_thermal_input(),
+        )
+
+    def _get_thermal_input(self) -> tuple[bool, bool]:
+        """Whether the unit heats and cools the room now"""
+        if self._is_held_off():
+            return False, False
+        return (
+            self._attr_hvac_mode == HVACMode.HEAT,
+            self._attr_hvac_mode == HVACMode.COOL,
+        )
+
+    @callback
+    def _async_interrupt_thermal(self) -> None:
+        """Tell the thermal model that the unit changed between readings"""
+        if self._thermal is not None:
+            self._thermal.interrupt(
+                self.unique_id, *self._get_thermal_input(), dt_util.utcnow().timestamp()
+            )
+
     @callback
     def _async_update_current_humidity(self, new_state: State | None):
         """Update current humidity."""
@@ -350,6 +737,7 @@ class AcRemote(ClimateEntity):
             commands = self._get_commands(ATTR_TEMPERATURE)
             self._reset_preset_mode()
             await self._async_call_remote_command(commands)
+            await self._async_control_thermostat()
             return
         temperature_low: float | None = kwargs.get(ATTR_TARGET_TEMP_LOW)
         temperature_high: float | None = kwargs.get(ATTR_TARGET_TEMP_HIGH)
@@ -371,20 +759,196 @@ class AcRemote(ClimateEntity):
         old_mode = self._attr_hvac_mode
         self._attr_hvac_mode = hvac_mode
         self._reset_preset_mode()
-        self._fill_temperature_attributes(self._get_temperature_conf())
+        self._apply_profile()
         if hvac_mode == HVACMode.OFF:
-            await self._async_call_remote_command(["off"])
+            await self._async_call_remote_command(
+                [self._get_special_command("off")], priority=Priority.OFF
+            )
+            await self._async_control_thermostat()
+            return
+        if self._thermostat is not None and (
+            await self._async_control_thermostat() or self._is_held_off()
+        ):
+            """Thermostat decides first, the room may need no start frames"""
             return
+        off_generation = self._off_generation
         if hvac_mode != HVACMode.OFF and old_mode == HVACMode.OFF:
-            await self._async_call_remote_command(["on"], False)
+            await self._async_call_remote_command(
+                [self._get_special_command("on")], False, priority=Priority.POWER
+            )
             await asyncio.sleep(1)
+            if off_generation != self._off_generation:
+                return
         commands = self._get_commands(ATTR_HVAC_MODE)
-        await self._async_call_remote_command(commands)
+        await self._async_call_remote_command(commands, priority=Priority.POWER)
+        await self._async_control_thermostat()
+
+    def _is_held_off(self) -> bool:
+        """Whether thermostat keeps the unit off in the selected mode"""
+        return self._thermostat is not None and not self._thermostat.running
+
+    async def _async_control_thermostat(self) -> bool:
+        """Evaluate the hysteresis loop and start or stop the unit.
+
+        Runs after every change of the unit, so the thermal model follows it.
+        Returns True if the state was sent because the loop switched the unit.
+        """
+        thermostat = self._thermostat
+        if thermostat is None:
+            self._async_interrupt_thermal()
+            return False
+        running = thermostat.update(
+            self._config.thermostat,
+            self._attr_hvac_mode,
+            self._attr_current_temperature,
+            getattr(self, "_attr_target_temperature", None),
+            time.monotonic(),
+        )
+        self._async_schedule_thermostat_retry(thermostat.retry_at)
+        self._async_interrupt_thermal()
+        if running is None:
+            return False
+        _LOGGER.debug(
+            "Thermostat %s %s at %s",
+            "starts" if running else "stops",
+            self.entity_id,
+            self._attr_current_temperature,
+        )
+        await self._async_send_state()
+        if self.platform is not None:
+            self.async_write_ha_state()
+        return True
+
+    @callback
+    def _async_schedule_thermostat_retry(self, retry_at: float | None) -> None:
+        """Evaluate blocked switch again when the minimal cycle time passes"""
+        if self._unsubscribe_thermostat_retry is not None:
+            self._unsubscribe_thermostat_retry()
+            self._unsubscribe_thermostat_retry = None
+        if retry_at is None or self.hass is None:
+            return
+        self._unsubscribe_thermostat_retry = async_call_later(
+            self.hass, retry_at - time.monotonic(), self._async_thermostat_retry
+        )
+
+    async def _async_thermostat_retry(self, _now: Any) -> None:
+        self._unsubscribe_thermostat_retry = None
+        await self._async_control_thermostat()
+
+    @property
+    def hvac_action(self) -> HVACAction | None:
+        """Action of the unit when thermostat switches it."""
+        if self._thermostat is None:
+            return None
+        if self._attr_hvac_mode == HVACMode.OFF:
+            return HVACAction.OFF
+        if not self._thermostat.running:
+            return HVACAction.IDLE
+        return HVAC_ACTIONS.get(self._attr_hvac_mode)
+
+    async def async_precondition(
+        self, temperature: float, deadline: datetime, hvac_mode: HVACMode | None = None
+    ) -> None:
+        """Reach temperature by deadline, the unit starts as late as the room allows."""
+        if deadline <= dt_util.utcnow():
+            raise ServiceValidationError(f"{ATTR_TIME} {deadline} has already passed")
+        if hvac_mode is None:
+            """Direction is chosen by the room, the unit doesn't fight it"""
+            if self._attr_current_temperature is None:
+                raise ServiceValidationError(
+                    f"{ATTR_HVAC_MODE} is required without current temperature"
+                )
+            hvac_mode = next(
+                mode
+                for mode, sign in MODE_SIGNS.items()
+                if (temperature - self._attr_current_temperature) * sign >= 0
+            )
+        if hvac_mode == HVACMode.OFF:
+            raise ServiceValidationError(f"{ATTR_HVAC_MODE} can't be off")
+        self._validate_state({ATTR_HVAC_MODE: hvac_mode, ATTR_TEMPERATURE: temperature})
+        self._precondition = Precondition(deadline.timestamp(), hvac_mode, temperature)
+        self._async_plan_precondition()
+        self.async_write_ha_state()
+
+    async def async_cancel_precondition(self) -> None:
+        """Drop the planned start of the unit."""
+        self._precondition = None
+        async_get_hub(self.hass).timers.async_cancel(
+            (ATTR_PRECONDITION, self.unique_id)
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def _async_plan_precondition(self) -> None:
+        """Plan the start again from the latest reading and thermal estimate"""
+        if (precondition := self._precondition) is None:
+            return
+        start = precondition.get_start_time(
+            self._attr_current_temperature,
+            (
+                self._thermal.estimate(self.unique_id)
+                if self._thermal is not None
+                else None
+            ),
+        )
+        async_get_hub(self.hass).timers.async_schedule(
+            (ATTR_PRECONDITION, self.unique_id), start, self._async_start_precondition
+        )
+
+    async def _async_start_precondition(self) -> None:
+        if (precondition := self._precondition) is None:
+            return
+        self._precondition = None
+        _LOGGER.debug(
+            "Preconditioning %s to %s at %s",
+            self.entity_id,
+            precondition.temperature,
+            self._attr_current_temperature,
+        )
+        try:
+            await self.async_apply_state(
+                {
+                    ATTR_HVAC_MODE: precondition.hvac_mode,
+                    ATTR_TEMPERATURE: precondition.temperature,
+                }
+            )
+        except HomeAssistantError as ex:
+            _LOGGER.warning("Preconditioning of %s failed: %s", self.entity_id, ex)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_schedule_next_state(self, after: datetime | None = None) -> None:
+        """Time the next events of the weekly schedule"""
+        timers = async_get_hub(self.hass).timers
+        key = (CONF_SCHEDULE, self.unique_id)
+        upcoming = get_next_state(self._config.schedule, after or dt_util.utcnow())
+        if upcoming is None:
+            timers.async_cancel(key)
+            return
+        fire_at, state = upcoming
+        timers.async_schedule(
+            key,
+            fire_at.timestamp(),
+            partial(self._async_apply_scheduled_state, fire_at, state),
+        )
+
+    async def _async_apply_scheduled_state(
+        self, fire_at: datetime, state: dict[str, Any]
+    ) -> None:
+        """Unchanged attributes are skipped by async_apply_state, nothing is resent"""
+        _LOGGER.debug("Applying scheduled state %s to %s", state, self.entity_id)
+        try:
+            await self.async_apply_state(state)
+        except HomeAssistantError as ex:
+            _LOGGER.warning(
+                "Scheduled state of %s isn't applied: %s", self.entity_id, ex
+            )
+        self._async_schedule_next_state(fire_at)
 
     async def async_set_swing_mode(self, swing_mode: str) -> None:
         self._attr_swing_mode = swing_mode
         commands = self._get_commands(ATTR_SWING_MODE)
-        await self._async_call_remote_command(commands)
+        await self._async_call_remote_command(commands, priority=Priority.SWING)
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         self._attr_fan_mode = fan_mode
@@ -396,6 +960,174 @@ class AcRemote(ClimateEntity):
         commands = self._get_commands(ATTR_PRESET_MODE)
         await self._async_call_remote_command(commands)
 
+    @callback
+    def async_update_config(self, config: EntryConfig) -> None:
+        """Switch to changed options of the model profile without reloading.
+
+        Nothing is sent, the unit keeps its state if the current mode stays.
+        """
+        self._config = config
+        self._missing_commands.clear()
+        if config.thermostat is None and self._is_held_off():
+            """Unit which was held off runs in the selected mode"""
+            self._thermostat = None
+            self.hass.async_create_task(self._async_send_state())
+        elif config.thermostat is None:
+            self._thermostat = None
+        elif self._thermostat is None:
+            self._thermostat = Thermostat()
+        self._async_interrupt_thermal()
+        self._attr_temperature_unit = config.temperature_unit
+        self._attr_target_temperature_step = config.temperature_step
+        self._attr_hvac_modes = list(config.hvac_modes)
+        if self._attr_hvac_mode not in config.hvac_modes:
+            self._attr_hvac_mode = self._attr_hvac_modes[0]
+        self._attr_preset_modes = list(config.preset_modes)
+        if self._attr_preset_mode not in config.preset_modes:
+            self._attr_preset_mode = None
+        self._apply_profile()
+        if self.hass is not None:
+            self._async_schedule_next_state()
+        if self.platform is not None:
+            self.async_write_ha_state()
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Compiled configuration and runtime state for diagnostics."""
+        return {
+            "compiled": {
+                "supported_features": self.supported_features,
+                "hvac_modes": self._attr_hvac_modes,
+                "fan_modes": self._attr_fan_modes,
+                "swing_modes": self._attr_swing_modes,
+                "preset_modes": self._attr_preset_modes,
+                "grouping_attributes": list(self._get_grouping_attributes()),
+                "grouping_attributes_as_sequence": (
+                    self._config.grouping_attributes_as_sequence
+                ),
+                "state_commands": self._get_state_commands(),
+                "code_table": (
+                    self._code_table.path if self._code_table is not None else None
+                ),
+                "delivery": dataclasses.asdict(self._config.delivery),
+                "thermostat": (
+                    dataclasses.asdict(self._config.thermostat)
+                    if self._config.thermostat is not None
+                    else None
+                ),
+                "confirmation": (
+                    dataclasses.asdict(self._config.confirmation)
+                    if self._config.confirmation is not None
+                    else None
+                ),
+            },
+            "thermostat_running": (
+                self._thermostat.running if self._thermostat is not None else None
+            ),
+            "remote_entity_ids": list(self.remote_entity_ids),
+            "pending_remote_entity_ids": sorted(self._pending_remote_entity_ids),
+            "missing_commands": sorted(list(x) for x in self._missing_commands),
+            "sensors": {
+                "current_temperature": self._get_sensor_diagnostics(
+                    self._config.current_temperature_sensor_entity_id,
+                    self.current_temperature,
+                ),
+                "current_humidity": self._get_sensor_diagnostics(
+                    self._config.current_humidity_sensor_entity_id,
+                    self.current_humidity,
+                ),
+            },
+        }
+
+    def _get_sensor_diagnostics(
+        self, entity_id: str | None, value: float | None
+    ) -> dict[str, Any]:
+        state = self.hass.states.get(entity_id) if entity_id is not None else None
+        return {
+            "entity_id": entity_id,
+            "state": state.state if state is not None else None,
+            "last_updated": state.last_updated if state is not None else None,
+            "value": value,
+        }
+
+    @property
+    def remote_entity_ids(self) -> tuple[str, ...]:
+        """Remote entity ids resolved from the target."""
+        return self._get_remote_entity_ids()
+
+    async def async_apply_state(self, state: dict[str, Any]) -> bool:
+        """Set several attributes at once and send each distinct command once.
+
+        Returns False if the state is already applied and nothing is sent.
+        """
+        self._validate_state(state)
+        changed = [
+            key
+            for key, value in state.items()
+            if value is not None and getattr(self, STATE_ATTRIBUTES[key]) != value
+        ]
+        if not changed:
+            return False
+        old_mode = self._attr_hvac_mode
+        for key in changed:
+            setattr(self, STATE_ATTRIBUTES[key], state[key])
+        if ATTR_HVAC_MODE in changed:
+            if ATTR_PRESET_MODE not in changed:
+                self._reset_preset_mode()
+            self._apply_profile()
+
+        if self._attr_hvac_mode == HVACMode.OFF:
+            if old_mode != HVACMode.OFF:
+                await self._async_call_remote_command(
+                    [self._get_special_command("off")], priority=Priority.OFF
+                )
+        elif self._thermostat is not None and (
+            await self._async_control_thermostat() or self._is_held_off()
+        ):
+            """Thermostat decides first, the room may need no start frames"""
+        elif old_mode == HVACMode.OFF:
+            await self._async_send_state()
+        else:
+            sent: list[list[str]] = []
+            for key in changed:
+                commands = self._get_commands(key)
+                if commands in sent:
+                    """Grouped attributes are sent in one command"""
+                    continue
+                sent.append(commands)
+                await self._async_call_remote_command(
+                    commands, priority=STATE_PRIORITIES.get(key, Priority.ADJUSTMENT)
+                )
+        await self._async_control_thermostat()
+        if self.platform is not None:
+            self.async_write_ha_state()
+        return True
+
+    def _validate_state(self, state: dict[str, Any]) -> None:
+        """Validate the state against the profile of its HVAC mode"""
+        hvac_mode = state.get(ATTR_HVAC_MODE) or self._attr_hvac_mode
+        if hvac_mode not in self._config.profiles:
+            raise ServiceValidationError(
+                f"{ATTR_HVAC_MODE} {hvac_mode} is not supported by {self.entity_id}"
+            )
+        profile = self._config.profiles[hvac_mode]
+        for key, supported in (
+            (ATTR_FAN_MODE, profile.fan_modes),
+            (ATTR_SWING_MODE, profile.swing_modes),
+            (ATTR_PRESET_MODE, self._attr_preset_modes),
+        ):
+            if state.get(key) is not None and state[key] not in (supported or []):
+                raise ServiceValidationError(
+                    f"{key} {state[key]} is not supported by {self.entity_id}"
+                )
+        temperature = state.get(ATTR_TEMPERATURE)
+        if temperature is not None and not (
+            profile.supported_features & ClimateEntityFeature.TARGET_TEMPERATURE
+            and profile.temperature.min <= temperature <= profile.temperature.max
+        ):
+            raise ServiceValidationError(
+                f"temperature {temperature} is not supported by {self.entity_id}"
+            )
+
     def _reset_preset_mode(self) -> None:
         if (
             self._attr_preset_modes is None
@@ -413,6 +1145,9 @@ class AcRemoteExtraStoredData(ExtraStoredData):
     target_temperature: float | None
     target_temperature_low: float | None
     target_temperature_high: float | None
+    thermostat_running: bool | None = None
+    thermal_model: list[float] | None = None
+    precondition: Precondition | None = None
 
     def as_dict(self) -> dict[str, Any]:
         """Return a dict representation of additional data."""
@@ -423,6 +1158,11 @@ class AcRemoteExtraStoredData(ExtraStoredData):
             ATTR_TEMPERATURE: target_temperature,
             ATTR_TARGET_TEMP_LOW: target_temperature_low,
             ATTR_TARGET_TEMP_HIGH: target_temperature_high,
+            ATTR_THERMOSTAT_RUNNING: self.thermostat_running,
+            ATTR_THERMAL_MODEL: self.thermal_model,
+            ATTR_PRECONDITION: (
+                self.precondition.as_dict() if self.precondition is not None else None
+            ),
         }
 
     @classmethod
@@ -432,15 +1172,26 @@ class AcRemoteExtraStoredData(ExtraStoredData):
         target_temperature_low = restored.get(ATTR_TARGET_TEMP_LOW)
         target_temperature_high = restored.get(ATTR_TARGET_TEMP_HIGH)
 
-        return cls(target_temperature, target_temperature_low, target_temperature_high)
+        return cls(
+            target_temperature,
+            target_temperature_low,
+            target_temperature_high,
+            restored.get(ATTR_THERMOSTAT_RUNNING),
+            restored.get(ATTR_THERMAL_MODEL),
+            (
+                Precondition.from_dict(restored[ATTR_PRECONDITION])
+                if restored.get(ATTR_PRECONDITION) is not None
+                else None
+            ),
+        )
 
 
 class RestoreAcRemote(AcRemote, RestoreEntity):
     """Mixin class for restoring previous state."""
 
     @callback
-    async def _async_restore_last_state(self) -> None:
-        """Restore previous state."""
+    async def _async_restore_last_state(self) -> bool:
+        """Restore previous state. Returns True if state has been restored."""
         last_state = await self.async_get_last_state()
         if last_state is not None:
             attributes = last_state.attributes
@@ -458,7 +1209,39 @@ class RestoreAcRemote(AcRemote, RestoreEntity):
             self._attr_target_temperature = last_extra_data.target_temperature
             self._attr_target_temperature_low = last_extra_data.target_temperature_low
             self._attr_target_temperature_high = last_extra_data.target_temperature_high
-        self._fill_temperature_attributes(self._get_temperature_conf())
+            if self._thermostat is not None and last_state is not None:
+                self._thermostat.restore(
+                    self._attr_hvac_mode, last_extra_data.thermostat_running
+                )
+        if (
+            last_extra_data is not None
+            and last_extra_data.precondition is not None
+            and last_extra_data.precondition.deadline > dt_util.utcnow().timestamp()
+        ):
+            self._precondition = last_extra_data.precondition
+        if self._config.current_temperature_sensor_entity_id is not None:
+            """Model of the room is learned from its sensor, it survives restarts"""
+            self._thermal = async_get_hub(self.hass).thermal
+            self._thermal.add(
+                self.unique_id,
+                last_extra_data.thermal_model if last_extra_data is not None else None,
+            )
+        self._apply_profile()
+        return last_state is not None
+
+    @callback
+    def _async_request_resync(self, _hass: HomeAssistant) -> None:
+        """Queue sending of restored state when Home Assistant is started"""
+        self.async_on_remove(
+            async_get_hub(self.hass).async_request_resync(
+                self._async_resync, self.remote_entity_ids
+            )
+        )
+
+    async def _async_resync(self) -> None:
+        _LOGGER.debug("Sending restored state of %s", self.entity_id)
+        await self._async_send_state()
+        self.async_write_ha_state()
 
     @property
     def extra_restore_state_data(self) -> AcRemoteExtraStoredData:
@@ -467,6 +1250,13 @@ class RestoreAcRemote(AcRemote, RestoreEntity):
             getattr(self, "_attr_target_temperature", None),
             getattr(self, "_attr_target_temperature_low", None),
             getattr(self, "_attr_target_temperature_high", None),
+            self._thermostat.running if self._thermostat is not None else None,
+            (
+                self._thermal.get_state(self.unique_id)
+                if self._thermal is not None
+                else None
+            ),
+            self._precondition,
         )
 
     async def async_get_last_climate_data(self) -> AcRemoteExtraStoredData | None:
@@ -479,30 +1269,89 @@ class RestoreAcRemote(AcRemote, RestoreEntity):
         """Run when about to be added to hass."""
         await super().async_added_to_hass()
 
-        await self._async_restore_last_state()
+        self._async_track_remote_entities(self._get_remote_entity_ids())
+        self.async_on_remove(self._async_untrack_remote_entities)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_BLASTER_READY, self._async_send_pending_state
+            )
+        )
+        self.async_on_remove(lambda: self._async_schedule_thermostat_retry(None))
+        self.async_on_remove(
+            lambda: async_get_hub(self.hass).timers.async_cancel(
+                (ATTR_PRECONDITION, self.unique_id)
+            )
+        )
+        self.async_on_remove(
+            lambda: async_get_hub(self.hass).timers.async_cancel(
+                (CONF_SCHEDULE, self.unique_id)
+            )
+        )
+        if self._config.confirmation is not None:
+            self.async_on_remove(
+                lambda: async_get_hub(self.hass).timers.async_cancel(
+                    (CONF_CONFIRMATION, self.unique_id)
+                )
+            )
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass,
+                    self._config.confirmation.power_sensor_entity_id,
+                    self._async_power_changed,
+                )
+            )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_CONFIG_UPDATED.format(self.platform.config_entry.entry_id),
+                self.async_update_config,
+            )
+        )
+
+        if (
+            await self._async_restore_last_state()
+            and self._config.delivery.resync_on_start
+        ):
+            self.async_on_remove(
+                async_at_started(self.hass, self._async_request_resync)
+            )
 
         """Subscribe to current temperature sensor updates"""
-        if getattr(self, "_current_temperature_sensor_entity_id", None) is not None:
-            async_track_state_change_event(
-                self.hass,
-                self._current_temperature_sensor_entity_id,
-                self._async_update_current_temperature_changed,
+        if self._config.current_temperature_sensor_entity_id is not None:
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass,
+                    self._config.current_temperature_sensor_entity_id,
+                    self._async_update_current_temperature_changed,
+                )
             )
 
             current_temperature_sensor_state = self.hass.states.get(
-                self._current_temperature_sensor_entity_id
+                self._config.current_temperature_sensor_entity_id
             )
             self._async_update_current_temperature(current_temperature_sensor_state)
+            self._async_observe_thermal(current_temperature_sensor_state)
 
         """Subscribe to current humidity sensor updates"""
-        if getattr(self, "_current_humidity_sensor_entity_id", None) is not None:
-            async_track_state_change_event(
-                self.hass,
-                self._current_humidity_sensor_entity_id,
-                self._async_update_current_humidity_changed,
+        if self._config.current_humidity_sensor_entity_id is not None:
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass,
+                    self._config.current_humidity_sensor_entity_id,
+                    self._async_update_current_humidity_changed,
+                )
             )
 
             current_humidity_sensor_state = self.hass.states.get(
-                self._current_humidity_sensor_entity_id
+                self._config.current_humidity_sensor_entity_id
             )
             self._async_update_current_humidity(current_humidity_sensor_state)
+
+        self._async_plan_precondition()
+        self._async_schedule_next_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Free the thermal model after its state is saved."""
+        await super().async_will_remove_from_hass()
+        if self._thermal is not None:
+            self._thermal.remove(self.unique_id)
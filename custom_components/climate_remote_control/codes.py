@@ -0,0 +1,312 @@
+"""Compact code tables compiled from SmartIR-style device code files."""
+
+import base64
+from bisect import bisect_left
+import contextlib
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Any, Self
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+"""Suffix of a table which is compiled by options flow until it is saved"""
+STAGED_SUFFIX = ".new"
+
+MAGIC = b"CRCT"
+VERSION = 1
+
+"""magic, version, flags, strings count, records count, index offset, blob offset"""
+HEADER = struct.Struct("<4sHHIIII")
+
+"""mode, fan, swing, temperature (tenths of degree), code offset, code length"""
+RECORD = struct.Struct("<HHHiII")
+
+STRING_LENGTH = struct.Struct("<H")
+
+"""Blob holds decoded bytes which should be encoded with base64 on lookup"""
+FLAG_BASE64 = 0x1
+
+"""Index of empty string in string table, used for not defined attributes"""
+NO_VALUE = 0
+NO_TEMPERATURE = -(2**31)
+
+"""Index of the command prefix in string table"""
+PREFIX_INDEX = 1
+
+CONTROLLER_PREFIXES = {
+    ("broadlink", "base64"): "b64:",
+    ("xiaomi", "raw"): "raw:",
+    ("xiaomi", "pronto"): "pronto:",
+}
+
+
+class CodeFileError(HomeAssistantError):
+    """Device code file can't be compiled or opened."""
+
+
+def get_code_table_path(entry_id: str) -> str:
+    """Path of the compiled table of an entry, relative to the config dir."""
+    return os.path.join(STORAGE_DIR, DOMAIN, entry_id + ".codes")
+
+
+def install_code_table(staged: str, path: str) -> None:
+    """Replace compiled table with a staged one. It's blocking."""
+    try:
+        os.replace(staged, path)
+    except OSError as ex:
+        raise CodeFileError(f"Unable to install code table {path}: {ex}") from ex
+
+
+def remove_code_table(path: str) -> None:
+    """Delete compiled table, e.g. of removed entry. It's blocking."""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def temperature_key(temperature: Any) -> int:
+    """Convert temperature to the key used in the index."""
+    if temperature is None or temperature == "":
+        return NO_TEMPERATURE
+    return int(round(float(temperature) * 10))
+
+
+def compile_code_file(source: str, destination: str) -> int:
+    """Compile SmartIR JSON code file into the compact table.
+
+    Returns count of compiled codes. It's blocking, so call it in executor.
+    Any invalid input or write failure is raised as CodeFileError.
+    """
+    try:
+        with open(source, encoding="utf-8") as file:
+            content = json.load(file)
+    except FileNotFoundError as ex:
+        raise CodeFileError(f"Code file {source} not found") from ex
+    except (OSError, ValueError) as ex:
+        raise CodeFileError(f"Unable to read code file {source}: {ex}") from ex
+
+    if not isinstance(content, dict) or not isinstance(content.get("commands"), dict):
+        raise CodeFileError(f"Code file {source} doesn't contain commands")
+    controller = str(content.get("supportedController", "Broadlink")).lower()
+    encoding = str(content.get("commandsEncoding", "Base64")).lower()
+    prefix = CONTROLLER_PREFIXES.get((controller, encoding))
+    if prefix is None:
+        raise CodeFileError(
+            f"Controller {controller} with encoding {encoding} can't be used via "
+            "remote.send_command"
+        )
+    has_swing = bool(content.get("swingModes"))
+
+    strings: dict[str, int] = {"": NO_VALUE, prefix: PREFIX_INDEX}
+    codes: dict[bytes, int] = {}
+    blob = bytearray()
+    records: list[tuple[int, int, int, int, int, int]] = []
+
+    def intern(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    def add(keys: list[str], code: Any) -> None:
+        if not isinstance(code, str):
+            raise CodeFileError(f"Code for {keys} is not a string")
+        if encoding == "base64":
+            try:
+                data = base64.b64decode(code, validate=True)
+            except ValueError as ex:
+                raise CodeFileError(f"Invalid base64 code for {keys}") from ex
+        else:
+            try:
+                data = code.encode("ascii")
+            except UnicodeEncodeError as ex:
+                raise CodeFileError(f"Invalid raw code for {keys}") from ex
+        if len(keys) > 4:
+            raise CodeFileError(f"Too deep nesting for {keys}")
+        offset = codes.get(data)
+        if offset is None:
+            offset = codes[data] = len(blob)
+            blob.extend(data)
+        keys = keys + [""] * (4 - len(keys))
+        mode, fan, swing, temperature = keys
+        try:
+            temperature = temperature_key(temperature)
+        except ValueError as ex:
+            raise CodeFileError(f"Invalid temperature {temperature}") from ex
+        records.append(
+            (intern(mode), intern(fan), intern(swing), temperature, offset, len(data))
+        )
+
+    def walk(keys: list[str], node: Any) -> None:
+        if isinstance(node, str):
+            add(keys, node)
+            return
+        if not isinstance(node, dict):
+            raise CodeFileError(f"Unexpected value for {keys}")
+        for key, value in node.items():
+            next_keys = keys + [str(key)]
+            if len(keys) == 2 and not has_swing:
+                """No swing level: mode -> fan -> temperature"""
+                next_keys = keys + ["", str(key)]
+            walk(next_keys, value)
+
+    walk([], content["commands"])
+
+    records.sort()
+    try:
+        string_table = bytearray()
+        for value in sorted(strings, key=strings.get):
+            encoded = value.encode("utf-8")
+            string_table += STRING_LENGTH.pack(len(encoded)) + encoded
+        index_offset = HEADER.size + len(string_table)
+        blob_offset = index_offset + RECORD.size * len(records)
+        flags = FLAG_BASE64 if encoding == "base64" else 0
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            flags,
+            len(strings),
+            len(records),
+            index_offset,
+            blob_offset,
+        )
+        index = b"".join(RECORD.pack(*record) for record in records)
+    except struct.error as ex:
+        raise CodeFileError(f"Code file {source} is too large: {ex}") from ex
+
+    try:
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        with open(destination + ".tmp", "wb") as file:
+            file.write(header)
+            file.write(string_table)
+            file.write(index)
+            file.write(blob)
+        os.replace(destination + ".tmp", destination)
+    except OSError as ex:
+        """Partial table is never left next to the compiled one"""
+        with contextlib.suppress(OSError):
+            os.remove(destination + ".tmp")
+        raise CodeFileError(f"Unable to write code table {destination}: {ex}") from ex
+    _LOGGER.debug("Compiled %s codes from %s to %s", len(records), source, destination)
+    return len(records)
+
+
+class _Index:
+    """Sequence view over index records for binary search."""
+
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> tuple[int, int, int, int]:
+        return self.record(position)[:4]
+
+    def record(self, position: int) -> tuple[int, int, int, int, int, int]:
+        return RECORD.unpack_from(self._buffer, self._offset + position * RECORD.size)
+
+
+class CodeTable:
+    """Memory-mapped compiled code table.
+
+    Only the header and the small string table are parsed on open. Codes are
+    looked up with binary search over the mapped index.
+    """
+
+    def __init__(self, path: str, file, buffer: mmap.mmap) -> None:
+        """Initialize."""
+        self.path = path
+        self._file = file
+        self._buffer = buffer
+        (
+            magic,
+            version,
+            self._flags,
+            strings_count,
+            records_count,
+            index_offset,
+            self._blob_offset,
+        ) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise CodeFileError(f"{path} is not a compiled code table")
+        self._strings: dict[str, int] = {}
+        position = HEADER.size
+        for index in range(strings_count):
+            (length,) = STRING_LENGTH.unpack_from(buffer, position)
+            position += STRING_LENGTH.size
+            value = bytes(buffer[position : position + length]).decode("utf-8")
+            self._strings[value] = index
+            position += length
+        self.prefix = next(
+            value for value, index in self._strings.items() if index == PREFIX_INDEX
+        )
+        self._index = _Index(buffer, index_offset, records_count)
+
+    @classmethod
+    def open(cls, path: str) -> Self:
+        """Open compiled table. It's blocking, so call it in executor."""
+        try:
+            file = open(path, "rb")  # noqa: SIM115
+        except OSError as ex:
+            raise CodeFileError(f"Unable to open code table {path}: {ex}") from ex
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(path, file, buffer)
+        except (OSError, ValueError, struct.error, StopIteration) as ex:
+            file.close()
+            raise CodeFileError(f"Unable to read code table {path}: {ex}") from ex
+
+    def close(self) -> None:
+        """Release memory map and file."""
+        self._buffer.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(
+        self,
+        mode: str,
+        fan: str | None = None,
+        swing: str | None = None,
+        temperature: float | None = None,
+    ) -> str | None:
+        """Return command for attribute values or None if code isn't defined.
+
+        Attributes which are not defined in the table for a mode are ignored.
+        """
+        mode_index = self._strings.get(str(mode))
+        if mode_index is None:
+            return None
+        fan_index = self._strings.get(str(fan), NO_VALUE) if fan else NO_VALUE
+        swing_index = self._strings.get(str(swing), NO_VALUE) if swing else NO_VALUE
+        temperature = temperature_key(temperature)
+        for key in (
+            (mode_index, fan_index, swing_index, temperature),
+            (mode_index, fan_index, swing_index, NO_TEMPERATURE),
+            (mode_index, fan_index, NO_VALUE, temperature),
+            (mode_index, fan_index, NO_VALUE, NO_TEMPERATURE),
+            (mode_index, NO_VALUE, NO_VALUE, NO_TEMPERATURE),
+        ):
+            code = self._get(key)
+            if code is not None:
+                return code
+        return None
+
+    def _get(self, key: tuple[int, int, int, int]) -> str | None:
+        position = bisect_left(self._index, key)
+        if position >= len(self._index) or self._index[position] != key:
+            return None
+        offset, length = self._index.record(position)[4:]
+        start = self._blob_offset + offset
+        data = self._buffer[start : start + length]
+        if self._flags & FLAG_BASE64:
+            return self.prefix + base64.b64encode(data).decode("ascii")
+        return self.prefix + data.decode("ascii")
@@ -0,0 +1,307 @@
+"""Options of config entries parsed once per setup."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Self
+
+from homeassistant import config_entries
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HUMIDITY,
+    ATTR_SWING_MODE,
+    ClimateEntityFeature,
+    HVACMode,
+)
+from homeassistant.const import (
+    ATTR_TEMPERATURE,
+    CONF_DEVICE,
+    CONF_TARGET,
+    CONF_TEMPERATURE_UNIT,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, callback
+
+from .confirmation import ConfirmationOptions
+from .const import (
+    ATTR_TEMPERATURE_RANGE,
+    CONF_CODE_TABLE,
+    CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID,
+    CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID,
+    CONF_FAN_MODES,
+    CONF_GROUPING_ATTRIBUTES,
+    CONF_GROUPING_ATTRIBUTES_AS_SEQUENCE,
+    CONF_HVAC_MODES,
+    CONF_MAX,
+    CONF_MIN,
+    CONF_MODE,
+    CONF_MODES,
+    CONF_PRESET_MODES,
+    CONF_PROFILE,
+    CONF_SWING,
+    CONF_TEMPERATURE,
+    CONF_TEMPERATURE_STEP,
+    DATA_CONFIG,
+    DATA_PROFILES,
+    DOMAIN,
+    SwingMode,
+    TemperatureMode,
+)
+from .delivery import DeliveryOptions
+from .schedule import ScheduleEvent, schedule_from_options
+from .thermostat import ThermostatOptions
+
+TEMPERATURE_UNITS = {
+    "c": UnitOfTemperature.CELSIUS,
+    "f": UnitOfTemperature.FAHRENHEIT,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TemperatureConfig:
+    """Temperature control of the device or of one HVAC mode."""
+
+    mode: TemperatureMode
+    min: float | None = None
+    max: float | None = None
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Create from temperature options."""
+        return cls(
+            mode=TemperatureMode(options[CONF_MODE]),
+            min=options.get(CONF_MIN),
+            max=options.get(CONF_MAX),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ModeConfig:
+    """Options of one HVAC mode, None means the option of the device is used."""
+
+    temperature: TemperatureConfig | None = None
+    fan_modes: tuple[str, ...] | None = None
+    swing_modes: tuple[str, ...] | None = None
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Create from options of HVAC mode."""
+        return cls(
+            temperature=(
+                TemperatureConfig.from_options(options[CONF_TEMPERATURE])
+                if CONF_TEMPERATURE in options
+                else None
+            ),
+            fan_modes=(
+                tuple(options[CONF_FAN_MODES]) if CONF_FAN_MODES in options else None
+            ),
+            swing_modes=(
+                tuple(options[CONF_SWING][CONF_MODES])
+                if CONF_SWING in options
+                else None
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ModeProfile:
+    """What the entity supports and sends in one HVAC mode."""
+
+    supported_features: ClimateEntityFeature
+    temperature: TemperatureConfig
+    fan_modes: tuple[str, ...]
+    swing_modes: tuple[str, ...]
+    grouping_attributes: tuple[str, ...]
+    """Grouping attributes without attributes which aren't supported in the mode"""
+
+
+@dataclass(frozen=True, slots=True)
+class EntryConfig:
+    """Validated options of a config entry.
+
+    Enums are converted and lists are frozen, so entities read attributes
+    instead of looking up option dicts by string keys.
+    """
+
+    device: str
+    target: Mapping[str, Any]
+    temperature_unit: UnitOfTemperature
+    temperature_step: float | None
+    temperature: TemperatureConfig
+    hvac_modes: Mapping[HVACMode, ModeConfig]
+    fan_modes: tuple[str, ...]
+    preset_modes: tuple[str, ...]
+    swing_mode: SwingMode
+    swing_modes: tuple[str, ...]
+    grouping_attributes: tuple[str, ...]
+    grouping_attributes_as_sequence: bool
+    current_temperature_sensor_entity_id: str | None
+    current_humidity_sensor_entity_id: str | None
+    code_table: str | None
+    delivery: DeliveryOptions
+    thermostat: ThermostatOptions | None
+    schedule: tuple[ScheduleEvent, ...]
+    confirmation: ConfirmationOptions | None
+    profiles: Mapping[HVACMode, ModeProfile] = field(
+        init=False, repr=False, compare=False
+    )
+    """Profile of each HVAC mode, switching the mode doesn't compute anything"""
+
+    def __post_init__(self) -> None:
+        """Get profiles of HVAC modes, entries of one model share them."""
+        object.__setattr__(
+            self,
+            "profiles",
+            _get_profiles(
+                tuple(self.hvac_modes.items()),
+                self.temperature,
+                self.fan_modes,
+                self.preset_modes,
+                self.swing_mode,
+                self.swing_modes,
+                self.grouping_attributes,
+            ),
+        )
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Create from config entry options, raise ValueError if they are invalid."""
+        try:
+            hvac_modes = {
+                HVACMode(mode): ModeConfig.from_options(mode_options)
+                for mode, mode_options in options[CONF_HVAC_MODES].items()
+            }
+            if not hvac_modes:
+                raise ValueError("hvac_modes is empty")
+            swing = options[CONF_SWING]
+            return cls(
+                device=options[CONF_DEVICE],
+                target=options[CONF_TARGET],
+                temperature_unit=TEMPERATURE_UNITS.get(
+                    options.get(CONF_TEMPERATURE_UNIT), UnitOfTemperature.CELSIUS
+                ),
+                temperature_step=options.get(CONF_TEMPERATURE_STEP),
+                temperature=TemperatureConfig.from_options(options[CONF_TEMPERATURE]),
+                hvac_modes=MappingProxyType(hvac_modes),
+                fan_modes=tuple(options.get(CONF_FAN_MODES) or ()),
+                preset_modes=tuple(options.get(CONF_PRESET_MODES) or ()),
+                swing_mode=SwingMode(swing[CONF_MODE]),
+                swing_modes=tuple(swing.get(CONF_MODES) or ()),
+                grouping_attributes=tuple(options.get(CONF_GROUPING_ATTRIBUTES) or ()),
+                grouping_attributes_as_sequence=bool(
+                    options.get(CONF_GROUPING_ATTRIBUTES_AS_SEQUENCE, False)
+                ),
+                current_temperature_sensor_entity_id=options.get(
+                    CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID
+                ),
+                current_humidity_sensor_entity_id=options.get(
+                    CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID
+                ),
+                code_table=options.get(CONF_CODE_TABLE) or None,
+                delivery=DeliveryOptions.from_options(options),
+                thermostat=ThermostatOptions.from_options(options),
+                schedule=schedule_from_options(options),
+                confirmation=ConfirmationOptions.from_options(options),
+            )
+        except KeyError as ex:
+            raise ValueError(f"{ex.args[0]} is required") from ex
+
+
+@lru_cache(maxsize=64)
+def _get_profiles(
+    hvac_modes: tuple[tuple[HVACMode, ModeConfig], ...],
+    temperature: TemperatureConfig,
+    fan_modes: tuple[str, ...],
+    preset_modes: tuple[str, ...],
+    swing_mode: SwingMode,
+    swing_modes: tuple[str, ...],
+    grouping_attributes: tuple[str, ...],
+) -> Mapping[HVACMode, ModeProfile]:
+    """Compute profiles of HVAC modes once per distinct model."""
+    profiles: dict[HVACMode, ModeProfile] = {}
+    for mode, mode_config in hvac_modes:
+        for name, modes, mode_modes in (
+            ("fan_modes", fan_modes, mode_config.fan_modes),
+            ("swing_modes", swing_modes, mode_config.swing_modes),
+        ):
+            if unknown := set(mode_modes or ()) - set(modes):
+                raise ValueError(
+                    f"{name} {sorted(unknown)} of {mode} are not in {name}"
+                )
+        mode_temperature = mode_config.temperature or temperature
+        mode_fan_modes = (
+            fan_modes if mode_config.fan_modes is None else mode_config.fan_modes
+        )
+        mode_swing_modes = (
+            swing_modes if mode_config.swing_modes is None else mode_config.swing_modes
+        )
+        features = ClimateEntityFeature(0)
+        if mode_temperature.mode == TemperatureMode.TARGET:
+            features |= ClimateEntityFeature.TARGET_TEMPERATURE
+        if mode_temperature.mode == TemperatureMode.RANGE:
+            features |= ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
+        if mode_fan_modes:
+            features |= ClimateEntityFeature.FAN_MODE
+        if preset_modes:
+            features |= ClimateEntityFeature.PRESET_MODE
+        if swing_mode == SwingMode.STATE and mode_swing_modes:
+            features |= ClimateEntityFeature.SWING_MODE
+
+        unsupported = set()
+        if not features & ClimateEntityFeature.TARGET_TEMPERATURE:
+            unsupported.add(ATTR_TEMPERATURE)
+        if not features & ClimateEntityFeature.TARGET_TEMPERATURE_RANGE:
+            unsupported.add(ATTR_TEMPERATURE_RANGE)
+        if not features & ClimateEntityFeature.TARGET_HUMIDITY:
+            unsupported.add(ATTR_HUMIDITY)
+        if not mode_fan_modes:
+            unsupported.add(ATTR_FAN_MODE)
+        if not mode_swing_modes:
+            unsupported.add(ATTR_SWING_MODE)
+        profiles[mode] = ModeProfile(
+            supported_features=features,
+            temperature=mode_temperature,
+            fan_modes=mode_fan_modes,
+            swing_modes=mode_swing_modes,
+            grouping_attributes=tuple(
+                x for x in grouping_attributes if x not in unsupported
+            ),
+        )
+    return MappingProxyType(profiles)
+
+
+def merge_profile(
+    options: Mapping[str, Any], profiles: Mapping[str, Mapping[str, Any]]
+) -> dict[str, Any]:
+    """Get options of entry over options of its model profile.
+
+    Raise ValueError if the profile doesn't exist.
+    """
+    if not (profile_id := options.get(CONF_PROFILE)):
+        return dict(options)
+    if (profile := profiles.get(profile_id)) is None:
+        raise ValueError(f"profile {profile_id} doesn't exist")
+    return {**profile, **options}
+
+
+@callback
+def async_get_config(
+    hass: HomeAssistant, config_entry: config_entries.ConfigEntry
+) -> EntryConfig:
+    """Get parsed options of config entry, parse them on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    configs = data.setdefault(DATA_CONFIG, {})
+    if (config := configs.get(config_entry.entry_id)) is None:
+        config = configs[config_entry.entry_id] = EntryConfig.from_options(
+            merge_profile(config_entry.options, data.get(DATA_PROFILES, {}))
+        )
+    return config
+
+
+@callback
+def async_remove_config(
+    hass: HomeAssistant, config_entry: config_entries.ConfigEntry
+) -> None:
+    """Forget parsed options, they are parsed again on the next setup."""
+    hass.data.get(DOMAIN, {}).get(DATA_CONFIG, {}).pop(config_entry.entry_id, None)
@@ -1,17 +1,30 @@
+from functools import cache
 from typing import Any
 
 from homeassistant import config_entries
-from homeassistant.components.climate import HVAC_MODES, HVACMode
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
+    ATTR_SWING_MODE,
+    HVAC_MODES,
+    HVACMode,
+)
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import (
     ATTR_AREA_ID,
     ATTR_DEVICE_ID,
     ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    CONF_AT,
     CONF_DEVICE,
+    CONF_ENABLED,
     CONF_NAME,
     CONF_TARGET,
     CONF_TEMPERATURE_UNIT,
     CONF_UNIQUE_ID,
+    CONF_WEEKDAY,
+    WEEKDAYS,
     Platform,
 )
 from homeassistant.core import callback
@@ -20,22 +33,66 @@ from homeassistant.helpers import selector
 from homeassistant.helpers.selector import SelectSelectorMode
 import voluptuous as vol
 
+from .codes import (
+    STAGED_SUFFIX,
+    CodeFileError,
+    compile_code_file,
+    get_code_table_path,
+    install_code_table,
+    remove_code_table,
+)
+from .config import EntryConfig, merge_profile
 from .const import (
+    CONF_BREAKER_RESET_TIMEOUT,
+    CONF_BREAKER_THRESHOLD,
     CONF_CAN_DISABLE_ENTITY_FEATURES,
+    CONF_CODE_FILE,
+    CONF_CODE_TABLE,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_CONFIRMATION,
     CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID,
     CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID,
+    CONF_DELIVERY,
     CONF_FAN_MODES,
     CONF_GROUPING_ATTRIBUTES,
     CONF_GROUPING_ATTRIBUTES_AS_SEQUENCE,
     CONF_HVAC_MODES,
+    CONF_HYSTERESIS,
     CONF_MAX,
+    CONF_MAX_RESENDS,
     CONF_MIN,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
     CONF_MODE,
     CONF_MODES,
+    CONF_OPTIONS,
+    CONF_POWER_SENSOR_ENTITY_ID,
+    CONF_POWER_THRESHOLD,
     CONF_PRESET_MODES,
+    CONF_PROFILE,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_RESYNC_ON_START,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BACKOFF,
+    CONF_SCHEDULE,
+    CONF_SEND_TIMEOUT,
     CONF_SWING,
     CONF_TEMPERATURE,
     CONF_TEMPERATURE_STEP,
+    CONF_THERMOSTAT,
+    DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_MAX_RESENDS,
+    DEFAULT_MIN_CYCLE_TIME,
+    DEFAULT_POWER_THRESHOLD,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_SEND_TIMEOUT,
     DOMAIN,
     FAN_MODES,
     GROUPING_ATTRIBUTES,
@@ -45,23 +102,234 @@ from .const import (
     TEMPERATURE_MODES,
     TemperatureMode,
 )
+from .profiles import async_get_profiles
+
+
+@cache
+def _get_temperature_schema() -> vol.Schema:
+    """Schema of temperature options, built when a flow uses it"""
+    return vol.Schema(
+        {
+            vol.Required(CONF_MODE): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    multiple=False,
+                    mode=SelectSelectorMode.DROPDOWN,
+                    translation_key="temperature_mode",
+                    options=TEMPERATURE_MODES,
+                )
+            ),
+            vol.Optional(CONF_MIN, default=16.0): vol.Coerce(float),
+            vol.Optional(CONF_MAX, default=30.0): vol.Coerce(float),
+        }
+    )
+
+
+def _get_delivery_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Schema of delivery options, defaults are current options"""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_RETRY_ATTEMPTS,
+                default=defaults.get(CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+            vol.Required(
+                CONF_RETRY_BACKOFF,
+                default=defaults.get(CONF_RETRY_BACKOFF, DEFAULT_RETRY_BACKOFF),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+            vol.Required(
+                CONF_BREAKER_THRESHOLD,
+                default=defaults.get(CONF_BREAKER_THRESHOLD, DEFAULT_BREAKER_THRESHOLD),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+            vol.Required(
+                CONF_BREAKER_RESET_TIMEOUT,
+                default=defaults.get(
+                    CONF_BREAKER_RESET_TIMEOUT, DEFAULT_BREAKER_RESET_TIMEOUT
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_SEND_TIMEOUT,
+                default=defaults.get(CONF_SEND_TIMEOUT, DEFAULT_SEND_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1, max=120)),
+            vol.Required(
+                CONF_RATE_LIMIT,
+                default=defaults.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Required(
+                CONF_RATE_BURST,
+                default=defaults.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+            vol.Required(
+                CONF_RESYNC_ON_START,
+                default=defaults.get(CONF_RESYNC_ON_START, False),
+            ): bool,
+        }
+    )
+
+
+def _get_thermostat_schema(defaults: dict[str, Any]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_HYSTERESIS,
+                default=defaults.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+            vol.Required(
+                CONF_MIN_ON_TIME,
+                default=defaults.get(CONF_MIN_ON_TIME, DEFAULT_MIN_CYCLE_TIME),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+            vol.Required(
+                CONF_MIN_OFF_TIME,
+                default=defaults.get(CONF_MIN_OFF_TIME, DEFAULT_MIN_CYCLE_TIME),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
+        }
+    )
+
+
+def _get_confirmation_schema(defaults: dict[str, Any]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_POWER_THRESHOLD,
+                default=defaults.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_CONFIRM_TIMEOUT,
+                default=defaults.get(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_MAX_RESENDS,
+                default=defaults.get(CONF_MAX_RESENDS, DEFAULT_MAX_RESENDS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+        }
+    )
 
-TEMPERATURE_SCHEMA = vol.Schema(
-    {
-        vol.Required(CONF_MODE): selector.SelectSelector(
-            selector.SelectSelectorConfig(
-                multiple=False,
-                mode=SelectSelectorMode.DROPDOWN,
-                translation_key="temperature_mode",
-                options=TEMPERATURE_MODES,
+
+def _validate_time(value: Any) -> str:
+    """Time of day which is kept as text in options, schedule reads it back"""
+    return cv.time(value).isoformat()
+
+
+@cache
+def _get_schedule_schema() -> vol.Schema:
+    return vol.Schema(
+        [
+            vol.All(
+                {
+                    vol.Required(CONF_AT): _validate_time,
+                    vol.Optional(CONF_WEEKDAY): vol.All(
+                        cv.ensure_list, [vol.In(WEEKDAYS)]
+                    ),
+                    vol.Optional(ATTR_HVAC_MODE): vol.In(HVAC_MODES),
+                    vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+                    vol.Optional(ATTR_FAN_MODE): cv.string,
+                    vol.Optional(ATTR_SWING_MODE): cv.string,
+                    vol.Optional(ATTR_PRESET_MODE): cv.string,
+                },
+                cv.has_at_least_one_key(
+                    ATTR_HVAC_MODE,
+                    ATTR_TEMPERATURE,
+                    ATTR_FAN_MODE,
+                    ATTR_SWING_MODE,
+                    ATTR_PRESET_MODE,
+                ),
             )
-        ),
-        vol.Optional(CONF_MIN, default=16.0): vol.Coerce(float),
-        vol.Optional(CONF_MAX, default=30.0): vol.Coerce(float),
-    }
+        ]
+    )
+
+
+@cache
+def get_options_schema() -> vol.Schema:
+    """Schema of entry options in bulk import, values are checked like in steps.
+
+    Options which aren't given keep their current values, so nothing has a
+    default except nested options.
+    """
+    entity_ids = vol.All(cv.ensure_list, [cv.string])
+    return vol.Schema(
+        {
+            vol.Optional(CONF_DEVICE): cv.string,
+            vol.Optional(CONF_TARGET): vol.Schema(
+                {
+                    vol.Optional(ATTR_ENTITY_ID, default=[]): cv.entity_ids,
+                    vol.Optional(ATTR_DEVICE_ID, default=[]): entity_ids,
+                    vol.Optional(ATTR_AREA_ID, default=[]): entity_ids,
+                }
+            ),
+            vol.Optional(CONF_TEMPERATURE): _get_temperature_schema(),
+            vol.Optional(CONF_TEMPERATURE_UNIT): vol.In(["c", "f"]),
+            vol.Optional(CONF_TEMPERATURE_STEP): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=10)
+            ),
+            vol.Optional(CONF_SWING): vol.Schema(
+                {
+                    vol.Required(CONF_MODE): vol.In(SWING_MODES),
+                    vol.Optional(CONF_MODES, default=[]): [vol.In(SWING_STATES)],
+                }
+            ),
+            vol.Optional(CONF_HVAC_MODES): {
+                vol.In(HVAC_MODES): vol.Schema(
+                    {
+                        vol.Optional(CONF_TEMPERATURE): _get_temperature_schema(),
+                        vol.Optional(CONF_FAN_MODES): [cv.string],
+                        vol.Optional(CONF_SWING): {
+                            vol.Required(CONF_MODES): [vol.In(SWING_STATES)]
+                        },
+                    }
+                )
+            },
+            vol.Optional(CONF_CAN_DISABLE_ENTITY_FEATURES): bool,
+            vol.Optional(CONF_FAN_MODES): [cv.string],
+            vol.Optional(CONF_GROUPING_ATTRIBUTES): [vol.In(GROUPING_ATTRIBUTES)],
+            vol.Optional(CONF_GROUPING_ATTRIBUTES_AS_SEQUENCE): bool,
+            vol.Optional(CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID): vol.Any(
+                None, cv.entity_id
+            ),
+            vol.Optional(CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID): vol.Any(
+                None, cv.entity_id
+            ),
+            vol.Optional(CONF_PRESET_MODES): [cv.string],
+            vol.Optional(CONF_CODE_FILE): vol.Any(None, cv.string),
+            vol.Optional(CONF_CODE_TABLE): vol.Any(None, cv.string),
+            vol.Optional(CONF_DELIVERY): _get_delivery_schema({}),
+            vol.Optional(CONF_THERMOSTAT): vol.Any(None, _get_thermostat_schema({})),
+            vol.Optional(CONF_SCHEDULE): vol.Any(None, _get_schedule_schema()),
+            vol.Optional(CONF_CONFIRMATION): vol.Any(
+                None,
+                vol.Schema(
+                    {vol.Required(CONF_POWER_SENSOR_ENTITY_ID): cv.entity_id}
+                ).extend(_get_confirmation_schema({}).schema),
+            ),
+            vol.Optional(CONF_PROFILE): vol.Any(None, cv.string),
+        }
+    )
+
+
+"""Options of one unit which can't be shared by a model profile"""
+ENTRY_ONLY_OPTIONS = (
+    CONF_DEVICE,
+    CONF_TARGET,
+    CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID,
+    CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID,
+    CONF_CODE_FILE,
+    CONF_CODE_TABLE,
+    CONF_PROFILE,
+    CONF_SCHEDULE,
+    CONF_CONFIRMATION,
 )
 
 
+@cache
+def get_profile_schema() -> vol.Schema:
+    """Schema of model profile options, entries override them."""
+    return vol.Schema(
+        {
+            key: value
+            for key, value in get_options_schema().schema.items()
+            if key not in ENTRY_ONLY_OPTIONS
+        }
+    )
+
+
 class ACRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 2
@@ -84,6 +352,19 @@ class ACRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data=user_input,
         )
 
+    async def async_step_import(self, import_data: dict[str, Any]):
+        """Create entry with options from bulk import."""
+        await self.async_set_unique_id(import_data[CONF_UNIQUE_ID])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=import_data[CONF_NAME],
+            data={
+                CONF_UNIQUE_ID: import_data[CONF_UNIQUE_ID],
+                CONF_NAME: import_data[CONF_NAME],
+            },
+            options=import_data[CONF_OPTIONS],
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -94,7 +375,9 @@ class ACRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    result: dict[str, Any] = {}
+    def __init__(self) -> None:
+        """Initialize, changed options are kept per flow."""
+        self.result: dict[str, Any] = {}
 
     def _is_previously_configured(self) -> bool:
         if self.config_entry.options is None or self.config_entry.options == {}:
@@ -109,6 +392,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 menu_options=[
                     "device",
                     "target",
+                    "profile",
                     "temperature",
                     "hvac_modes",
                     "swing",
@@ -116,6 +400,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     "grouping_attributes",
                     "sensors",
                     "preset_modes",
+                    "code_file",
+                    "delivery",
+                    "thermostat",
+                    "schedule",
+                    "confirmation",
                     "finish",
                 ],
             )
@@ -202,6 +491,48 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         else:
             return await self.async_step_temperature()
 
+    async def async_step_profile(self, user_input: dict[str, Any] | None = None):
+        """Select model profile which provides options the entry doesn't override."""
+        errors = {}
+        profiles = async_get_profiles(self.hass)
+        if user_input is not None:
+            profile_id = user_input.get(CONF_PROFILE) or None
+            try:
+                EntryConfig.from_options(
+                    merge_profile(
+                        self.config_entry.options
+                        | self.result
+                        | {CONF_PROFILE: profile_id},
+                        profiles,
+                    )
+                )
+            except ValueError:
+                errors[CONF_PROFILE] = "profile_invalid"
+            else:
+                self.result[CONF_PROFILE] = profile_id
+                return await self.async_step_init()
+
+        return self.async_show_form(
+            step_id="profile",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_PROFILE, default=self._get_option(CONF_PROFILE)
+                    ): vol.Any(
+                        None,
+                        selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                multiple=False,
+                                mode=SelectSelectorMode.DROPDOWN,
+                                options=sorted(profiles),
+                            )
+                        ),
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
     async def async_step_temperature(self, user_input: dict[str, Any] | None = None):
         if user_input is None:
             default_temperature = self._get_option(
@@ -327,9 +658,9 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         mode in (HVACMode.OFF, HVACMode.FAN_ONLY, HVACMode.DRY)
                         and can_disable_entity_features
                     ):
-                        self.result[CONF_HVAC_MODES][mode][CONF_TEMPERATURE] = (
-                            TEMPERATURE_SCHEMA({CONF_MODE: TemperatureMode.NONE})
-                        )
+                        self.result[CONF_HVAC_MODES][mode][
+                            CONF_TEMPERATURE
+                        ] = _get_temperature_schema()({CONF_MODE: TemperatureMode.NONE})
         if user_input is None or bool(errors):
             default_hvac_modes = self._get_option(CONF_HVAC_MODES, {})
             return self.async_show_form(
@@ -508,16 +839,196 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         else:
             return await self.async_step_finish()
 
+    async def async_step_code_file(self, user_input: dict[str, Any] | None = None):
+        """Import SmartIR-style device code file instead of learned commands."""
+        errors = {}
+        if user_input is not None:
+            code_file = user_input.get(CONF_CODE_FILE, "").strip()
+            if code_file == "":
+                """Table on disk is removed when the options are saved"""
+                self.result[CONF_CODE_FILE] = None
+                self.result[CONF_CODE_TABLE] = None
+                return await self.async_step_init()
+            code_table = get_code_table_path(self.config_entry.entry_id)
+            try:
+                await self.hass.async_add_executor_job(
+                    compile_code_file,
+                    self.hass.config.path(code_file),
+                    self.hass.config.path(code_table + STAGED_SUFFIX),
+                )
+            except CodeFileError:
+                errors[CONF_CODE_FILE] = "code_file_invalid"
+            else:
+                self.result[CONF_CODE_FILE] = code_file
+                self.result[CONF_CODE_TABLE] = code_table
+                return await self.async_step_init()
+
+        return self.async_show_form(
+            step_id="code_file",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_CODE_FILE,
+                        default=self._get_option(CONF_CODE_FILE) or "",
+                    ): cv.string,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_delivery(self, user_input: dict[str, Any] | None = None):
+        """Manage retries and circuit breaker of remote commands."""
+        if user_input is None:
+            return self.async_show_form(
+                step_id="delivery",
+                data_schema=_get_delivery_schema(self._get_option(CONF_DELIVERY) or {}),
+            )
+
+        self.result[CONF_DELIVERY] = {
+            CONF_RETRY_ATTEMPTS: user_input[CONF_RETRY_ATTEMPTS],
+            CONF_RETRY_BACKOFF: user_input[CONF_RETRY_BACKOFF],
+            CONF_BREAKER_THRESHOLD: user_input[CONF_BREAKER_THRESHOLD],
+            CONF_BREAKER_RESET_TIMEOUT: user_input[CONF_BREAKER_RESET_TIMEOUT],
+            CONF_SEND_TIMEOUT: user_input[CONF_SEND_TIMEOUT],
+            CONF_RATE_LIMIT: user_input[CONF_RATE_LIMIT],
+            CONF_RATE_BURST: user_input[CONF_RATE_BURST],
+            CONF_RESYNC_ON_START: user_input[CONF_RESYNC_ON_START],
+        }
+        return await self.async_step_init()
+
+    async def async_step_thermostat(self, user_input: dict[str, Any] | None = None):
+        """Manage hysteresis loop which switches the unit by current temperature."""
+        thermostat = self._get_option(CONF_THERMOSTAT)
+        if user_input is None:
+            return self.async_show_form(
+                step_id="thermostat",
+                data_schema=vol.Schema(
+                    {vol.Required(CONF_ENABLED, default=bool(thermostat)): bool}
+                ).extend(_get_thermostat_schema(thermostat or {}).schema),
+            )
+
+        self.result[CONF_THERMOSTAT] = None
+        if user_input[CONF_ENABLED]:
+            self.result[CONF_THERMOSTAT] = {
+                CONF_HYSTERESIS: user_input[CONF_HYSTERESIS],
+                CONF_MIN_ON_TIME: user_input[CONF_MIN_ON_TIME],
+                CONF_MIN_OFF_TIME: user_input[CONF_MIN_OFF_TIME],
+            }
+        return await self.async_step_init()
+
+    async def async_step_schedule(self, user_input: dict[str, Any] | None = None):
+        """Manage weekly schedule of states which the entity applies."""
+        errors = {}
+        if user_input is not None:
+            try:
+                schedule = _get_schedule_schema()(user_input.get(CONF_SCHEDULE) or [])
+            except vol.Invalid:
+                errors[CONF_SCHEDULE] = "schedule_invalid"
+            else:
+                self.result[CONF_SCHEDULE] = schedule
+                return await self.async_step_init()
+        return self.async_show_form(
+            step_id="schedule",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_SCHEDULE, default=self._get_option(CONF_SCHEDULE) or []
+                    ): selector.ObjectSelector(),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_confirmation(self, user_input: dict[str, Any] | None = None):
+        """Manage power sensor which confirms that the unit starts and stops."""
+        confirmation = self._get_option(CONF_CONFIRMATION) or {}
+        if user_input is None:
+            return self.async_show_form(
+                step_id="confirmation",
+                data_schema=vol.Schema(
+                    {
+                        vol.Optional(
+                            CONF_POWER_SENSOR_ENTITY_ID,
+                            default=confirmation.get(CONF_POWER_SENSOR_ENTITY_ID),
+                        ): vol.Any(
+                            None,
+                            selector.EntitySelector(
+                                selector.EntitySelectorConfig(
+                                    multiple=False,
+                                    domain=Platform.SENSOR,
+                                    device_class=[
+                                        SensorDeviceClass.POWER,
+                                        SensorDeviceClass.CURRENT,
+                                    ],
+                                )
+                            ),
+                        ),
+                    }
+                ).extend(_get_confirmation_schema(confirmation).schema),
+            )
+
+        self.result[CONF_CONFIRMATION] = None
+        if user_input.get(CONF_POWER_SENSOR_ENTITY_ID):
+            self.result[CONF_CONFIRMATION] = {
+                CONF_POWER_SENSOR_ENTITY_ID: user_input[CONF_POWER_SENSOR_ENTITY_ID],
+                CONF_POWER_THRESHOLD: user_input[CONF_POWER_THRESHOLD],
+                CONF_CONFIRM_TIMEOUT: user_input[CONF_CONFIRM_TIMEOUT],
+                CONF_MAX_RESENDS: user_input[CONF_MAX_RESENDS],
+            }
+        return await self.async_step_init()
+
     async def async_step_finish(self, user_input: dict[str, Any] | None = None):
-        options = self.config_entry.options | {}
-        return self.async_create_entry(
-            title=self.config_entry.title,
-            data=options | self.result,
+        options = self.config_entry.options | self.result
+        if profile := async_get_profiles(self.hass).get(options.get(CONF_PROFILE)):
+            """Options equal to the profile aren't kept, they follow its changes"""
+            options = {
+                key: value
+                for key, value in options.items()
+                if key in ENTRY_ONLY_OPTIONS
+                or key not in profile
+                or profile[key] != value
+            }
+        try:
+            await self._async_save_code_table()
+        except CodeFileError:
+            return self.async_abort(reason="code_table_missing")
+        return self.async_create_entry(title=self.config_entry.title, data=options)
+
+    async def _async_save_code_table(self) -> None:
+        """Install the staged table or remove the cleared one"""
+        if CONF_CODE_TABLE not in self.result:
+            return
+        code_table = self.hass.config.path(
+            get_code_table_path(self.config_entry.entry_id)
         )
+        if self.result[CONF_CODE_TABLE] is None:
+            await self.hass.async_add_executor_job(remove_code_table, code_table)
+        else:
+            await self.hass.async_add_executor_job(
+                install_code_table, code_table + STAGED_SUFFIX, code_table
+            )
 
-    def _get_option(self, option_name: str, default_value: Any = None) -> Any:
-        return getattr(
-            self.result,
-            option_name,
-            self.config_entry.options.get(option_name, default_value),
+    @callback
+    def async_remove(self) -> None:
+        """Drop table which was compiled by the flow but not saved."""
+        if self.result.get(CONF_CODE_TABLE) is None:
+            return
+        self.hass.async_add_executor_job(
+            remove_code_table,
+            self.hass.config.path(self.result[CONF_CODE_TABLE] + STAGED_SUFFIX),
         )
+
+    def _get_option(self, option_name: str, default_value: Any = None) -> Any:
+        if option_name in self.result:
+            return self.result[option_name]
+        return self._get_entry_options().get(option_name, default_value)
+
+    def _get_entry_options(self) -> dict[str, Any]:
+        """Options of the entry over its profile, which may be selected by the flow"""
+        options = dict(self.config_entry.options)
+        if CONF_PROFILE in self.result:
+            options[CONF_PROFILE] = self.result[CONF_PROFILE]
+        try:
+            return merge_profile(options, async_get_profiles(self.hass))
+        except ValueError:
+            return options
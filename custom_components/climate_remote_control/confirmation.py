@@ -0,0 +1,87 @@
+"""Confirmation of power frames by the power or current draw of the unit."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Self
+
+from .const import (
+    CONF_CONFIRM_TIMEOUT,
+    CONF_CONFIRMATION,
+    CONF_MAX_RESENDS,
+    CONF_POWER_SENSOR_ENTITY_ID,
+    CONF_POWER_THRESHOLD,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_MAX_RESENDS,
+    DEFAULT_POWER_THRESHOLD,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfirmationOptions:
+    """Power sensor settings of a config entry."""
+
+    power_sensor_entity_id: str
+    """Draw above which the unit runs, in the unit of the sensor"""
+    power_threshold: float = DEFAULT_POWER_THRESHOLD
+    timeout: float = DEFAULT_CONFIRM_TIMEOUT
+    max_resends: int = DEFAULT_MAX_RESENDS
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self | None:
+        """Create from config entry options, None without power sensor."""
+        confirmation = options.get(CONF_CONFIRMATION) or {}
+        if not (entity_id := confirmation.get(CONF_POWER_SENSOR_ENTITY_ID)):
+            return None
+        return cls(
+            power_sensor_entity_id=entity_id,
+            power_threshold=float(
+                confirmation.get(CONF_POWER_THRESHOLD, DEFAULT_POWER_THRESHOLD)
+            ),
+            timeout=float(
+                confirmation.get(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT)
+            ),
+            max_resends=int(confirmation.get(CONF_MAX_RESENDS, DEFAULT_MAX_RESENDS)),
+        )
+
+
+class PowerConfirmation:
+    """Expected running state of the unit after a power frame.
+
+    Frames with the same expectation continue it, so a resend doesn't reset
+    the number of resends.
+    """
+
+    __slots__ = ("expected", "remote_entity_ids", "resends")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.expected: bool | None = None
+        self.resends = 0
+        """Blasters which sent the frames which are being confirmed"""
+        self.remote_entity_ids: tuple[str, ...] = ()
+
+    def expect(self, running: bool, remote_entity_ids: tuple[str, ...]) -> None:
+        """Start waiting for the unit to start or stop."""
+        if self.expected != running:
+            self.expected = running
+            self.resends = 0
+        self.remote_entity_ids = remote_entity_ids
+
+    def observe(self, options: ConfirmationOptions, power: float | None) -> bool:
+        """Check the draw, returns True if it confirms the expected state."""
+        if self.expected is None or power is None:
+            return False
+        if (power > options.power_threshold) != self.expected:
+            return False
+        self.expected = None
+        return True
+
+    def timeout(self, options: ConfirmationOptions) -> bool:
+        """Handle missing confirmation, returns True if frames should be resent."""
+        if self.expected is None:
+            return False
+        if self.resends >= options.max_resends:
+            self.expected = None
+            return False
+        self.resends += 1
+        return True
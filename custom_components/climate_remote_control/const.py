@@ -36,9 +36,34 @@ from homeassistant.components.climate import (
 DOMAIN = "climate_remote_control"
 
 DATA_CONFIG = "config"
+DATA_HUB = "hub"
+DATA_PROFILES = "profiles"
+
+SERVICE_SET_ALL = "set_all"
+SERVICE_EXPORT_OPTIONS = "export_options"
+SERVICE_IMPORT_OPTIONS = "import_options"
+SERVICE_SET_PROFILE = "set_profile"
+SERVICE_REMOVE_PROFILE = "remove_profile"
+SERVICE_PRECONDITION = "precondition"
+SERVICE_CANCEL_PRECONDITION = "cancel_precondition"
+SIGNAL_BLASTER_READY = DOMAIN + "_blaster_ready"
+SIGNAL_CONFIG_UPDATED = DOMAIN + "_config_updated_{}"
 
 ATTR_TEMPERATURE_RANGE = "temperature_range"
 ATTR_PRESET_MODE = "preset"
+ATTR_PENDING = "pending"
+ATTR_CIRCUIT_BREAKER = "circuit_breaker"
+ATTR_RATE_LIMIT_WAIT = "rate_limit_wait"
+ATTR_THERMOSTAT_RUNNING = "thermostat_running"
+ATTR_THERMAL_MODEL = "thermal_model"
+ATTR_PRECONDITION = "precondition"
+ATTR_PRECONDITION_START = "precondition_start"
+ATTR_DOCUMENT = "document"
+ATTR_ENTRIES = "entries"
+ATTR_PROFILE_ID = "profile_id"
+ATTR_MAX_LANES = "max_lanes"
+CONF_OPTIONS = "options"
+CONF_PROFILE = "profile"
 CONF_TEMPERATURE = "temperature"
 CONF_TEMPERATURE_STEP = "temperature_step"
 CONF_TEMPERATURE_OFFSET = "temperature_offset"
@@ -56,6 +81,40 @@ CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID = "current_temperature_sensor_entity_i
 CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID = "current_humidity_sensor_entity_id"
 CONF_GROUPING_ATTRIBUTES = "grouping_attributes"
 CONF_GROUPING_ATTRIBUTES_AS_SEQUENCE = "grouping_attributes_as_sequence"
+CONF_CODE_FILE = "code_file"
+CONF_CODE_TABLE = "code_table"
+CONF_DELIVERY = "delivery"
+CONF_RETRY_ATTEMPTS = "retry_attempts"
+CONF_RETRY_BACKOFF = "retry_backoff"
+CONF_BREAKER_THRESHOLD = "breaker_threshold"
+CONF_BREAKER_RESET_TIMEOUT = "breaker_reset_timeout"
+CONF_SEND_TIMEOUT = "send_timeout"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_BURST = "rate_burst"
+CONF_RESYNC_ON_START = "resync_on_start"
+CONF_THERMOSTAT = "thermostat"
+CONF_HYSTERESIS = "hysteresis"
+CONF_MIN_ON_TIME = "min_on_time"
+CONF_MIN_OFF_TIME = "min_off_time"
+CONF_SCHEDULE = "schedule"
+CONF_CONFIRMATION = "confirmation"
+CONF_POWER_SENSOR_ENTITY_ID = "power_sensor_entity_id"
+CONF_POWER_THRESHOLD = "power_threshold"
+CONF_CONFIRM_TIMEOUT = "confirm_timeout"
+CONF_MAX_RESENDS = "max_resends"
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET_TIMEOUT = 60.0
+DEFAULT_SEND_TIMEOUT = 10.0
+DEFAULT_RATE_LIMIT = 0.0
+DEFAULT_RATE_BURST = 3
+DEFAULT_HYSTERESIS = 0.5
+DEFAULT_MIN_CYCLE_TIME = 300.0
+DEFAULT_POWER_THRESHOLD = 50.0
+DEFAULT_CONFIRM_TIMEOUT = 60.0
+DEFAULT_MAX_RESENDS = 2
+DEFAULT_MAX_LANES = 10
 GROUPING_ATTRIBUTES = [
     ATTR_HVAC_MODE,
     ATTR_FAN_MODE,
@@ -0,0 +1,488 @@
+"""Delivery of commands to IR blasters (remote entities)."""
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from enum import IntEnum, StrEnum
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Any, Self
+
+from homeassistant.components.remote import DOMAIN as RM_DOMAIN
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_COMMAND, ATTR_ENTITY_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_BREAKER_RESET_TIMEOUT,
+    CONF_BREAKER_THRESHOLD,
+    CONF_DELIVERY,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_RESYNC_ON_START,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BACKOFF,
+    CONF_SEND_TIMEOUT,
+    DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_SEND_TIMEOUT,
+    DOMAIN,
+    SIGNAL_BLASTER_READY,
+)
+from .metrics import DeliveryStats, Transmission
+
+_LOGGER = logging.getLogger(__name__)
+
+"""Upper bound for one backoff delay between retries"""
+MAX_RETRY_BACKOFF = 30.0
+
+
+class SendResult(StrEnum):
+    """Outcome of sending command to one blaster"""
+
+    """Remote integration accepted command"""
+    DELIVERED = "delivered"
+
+    """Command is not learned for the device"""
+    MISSING_CODE = "missing_code"
+
+    """All attempts failed"""
+    FAILED = "failed"
+
+    """Circuit breaker of the blaster is open, command wasn't sent"""
+    REJECTED = "rejected"
+
+    """Remote integration didn't answer in time, command may be transmitted"""
+    UNKNOWN = "unknown"
+
+    """Command was dropped from the queue by "off" of the same device"""
+    SUPERSEDED = "superseded"
+
+
+class Priority(IntEnum):
+    """Delivery priority class of a command, lower is sent first"""
+
+    """Turn off"""
+    OFF = 0
+
+    """Turn on and HVAC mode changes"""
+    POWER = 1
+
+    """Temperature, fan, preset and other adjustments"""
+    ADJUSTMENT = 2
+
+    """Swing changes and toggles"""
+    SWING = 3
+
+
+class BreakerState(StrEnum):
+    """Circuit breaker state"""
+
+    """Commands are sent"""
+    CLOSED = "closed"
+
+    """Blaster failed repeatedly, commands are rejected"""
+    OPEN = "open"
+
+    """Reset timeout passed, next command is a trial"""
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryOptions:
+    """Delivery settings of a config entry."""
+
+    retry_attempts: int = DEFAULT_RETRY_ATTEMPTS
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF
+    breaker_threshold: int = DEFAULT_BREAKER_THRESHOLD
+    breaker_reset_timeout: float = DEFAULT_BREAKER_RESET_TIMEOUT
+    send_timeout: float = DEFAULT_SEND_TIMEOUT
+    rate_limit: float = DEFAULT_RATE_LIMIT
+    rate_burst: int = DEFAULT_RATE_BURST
+    resync_on_start: bool = False
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Create from config entry options."""
+        delivery = options.get(CONF_DELIVERY) or {}
+        return cls(
+            retry_attempts=int(
+                delivery.get(CONF_RETRY_ATTEMPTS, DEFAULT_RETRY_ATTEMPTS)
+            ),
+            retry_backoff=float(
+                delivery.get(CONF_RETRY_BACKOFF, DEFAULT_RETRY_BACKOFF)
+            ),
+            breaker_threshold=int(
+                delivery.get(CONF_BREAKER_THRESHOLD, DEFAULT_BREAKER_THRESHOLD)
+            ),
+            breaker_reset_timeout=float(
+                delivery.get(CONF_BREAKER_RESET_TIMEOUT, DEFAULT_BREAKER_RESET_TIMEOUT)
+            ),
+            send_timeout=float(delivery.get(CONF_SEND_TIMEOUT, DEFAULT_SEND_TIMEOUT)),
+            rate_limit=float(delivery.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT)),
+            rate_burst=int(delivery.get(CONF_RATE_BURST, DEFAULT_RATE_BURST)),
+            resync_on_start=bool(delivery.get(CONF_RESYNC_ON_START, False)),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry, exponential with full jitter."""
+        return random.uniform(
+            0, min(MAX_RETRY_BACKOFF, self.retry_backoff * 2**attempt)
+        )
+
+
+class TokenBucket:
+    """Rate limiter which allows bursts of commands."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._tokens: float | None = None
+        self._updated = 0.0
+        self.ready_at = 0.0
+
+    def reserve(self, now: float, rate: float, burst: int) -> float:
+        """Take one token. Returns delay until the token is available."""
+        if rate <= 0:
+            return 0.0
+        burst = max(burst, 1)
+        if self._tokens is None:
+            tokens = float(burst)
+        else:
+            tokens = min(burst, self._tokens + (now - self._updated) * rate)
+        self._tokens = tokens - 1
+        self._updated = now
+        delay = -self._tokens / rate if self._tokens < 0 else 0.0
+        self.ready_at = now + delay
+        return delay
+
+    def wait_time(self, now: float | None = None) -> float:
+        """Seconds until the reserved token is available."""
+        return max(0.0, self.ready_at - (now if now is not None else time.monotonic()))
+
+
+class CircuitBreaker:
+    """Consecutive failures counter which stops sending to a failing blaster."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.failures = 0
+        self._open_until: float | None = None
+        self._trial = False
+
+    def state(self, now: float | None = None) -> BreakerState:
+        """Current state."""
+        if self._open_until is None:
+            return BreakerState.CLOSED
+        if (now if now is not None else time.monotonic()) < self._open_until:
+            return BreakerState.OPEN
+        return BreakerState.HALF_OPEN
+
+    def allow(self, now: float) -> bool:
+        """Check that command can be sent. Half open breaker allows one trial."""
+        state = self.state(now)
+        if state == BreakerState.CLOSED:
+            return True
+        if state == BreakerState.HALF_OPEN and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def half_open(self) -> None:
+        """Allow trial now, reset timeout has passed."""
+        if self._open_until is not None:
+            self._open_until = float("-inf")
+
+    def record_success(self) -> bool:
+        """Close breaker. Returns True if breaker has been closed after opening."""
+        recovered = self._open_until is not None
+        self.failures = 0
+        self._open_until = None
+        self._trial = False
+        return recovered
+
+    def record_failure(self, now: float, threshold: int, reset_timeout: float) -> bool:
+        """Count failure. Returns True if breaker has been opened."""
+        self.failures += 1
+        if self._trial or self.failures >= threshold:
+            self._open_until = now + reset_timeout
+            self._trial = False
+            return True
+        return False
+
+
+def record_result(stats: DeliveryStats, result: SendResult, latency: float) -> None:
+    """Count result of sending command to one blaster."""
+    if result in (SendResult.REJECTED, SendResult.SUPERSEDED):
+        stats.record_suppressed()
+        return
+    stats.record_send(
+        latency,
+        missing_code=result == SendResult.MISSING_CODE,
+        timeout=result == SendResult.UNKNOWN,
+    )
+
+
+@dataclass(order=True, slots=True)
+class _Frame:
+    """Queued command, ordered by priority and then by arrival."""
+
+    priority: Priority
+    sequence: int
+    owner: str | None = field(compare=False)
+    service_data: dict[str, Any] = field(compare=False)
+    options: DeliveryOptions = field(compare=False)
+    future: asyncio.Future[SendResult] = field(compare=False)
+    whole_state: bool = field(default=False, compare=False)
+    idempotent: bool = field(default=True, compare=False)
+
+
+class Blaster:
+    """Remote entity which transmits IR commands.
+
+    Commands are transmitted one at a time in priority order, so "off" doesn't
+    wait behind adjustments which are queued earlier.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entity_id = entity_id
+        self.breaker = CircuitBreaker()
+        self.bucket = TokenBucket()
+        self.stats = DeliveryStats()
+        self._unsubscribe_reset: CALLBACK_TYPE | None = None
+        self._queue: list[_Frame] = []
+        self._sequence = itertools.count()
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of commands waiting for transmission."""
+        return len(self._queue)
+
+    @property
+    def wait_time(self) -> float:
+        """Seconds until rate limit allows the reserved command."""
+        return self.bucket.wait_time()
+
+    async def async_send(
+        self,
+        service_data: dict[str, Any],
+        options: DeliveryOptions,
+        priority: Priority = Priority.ADJUSTMENT,
+        owner: str | None = None,
+        stats: DeliveryStats | None = None,
+        whole_state: bool = False,
+        idempotent: bool = True,
+    ) -> SendResult:
+        """Queue command and wait until it is transmitted.
+
+        "Off" drops queued commands of the same owner (unique id of the device).
+        Command which carries the whole state of the owner, e.g. grouped
+        attributes, drops queued commands of the owner which carry an older one.
+        Result and latency including the time in the queue are counted in stats.
+        Command which isn't idempotent, e.g. swing toggle, isn't retried, since
+        the blaster may have sent it before the error.
+        """
+        start = time.monotonic()
+        if priority == Priority.OFF and owner is not None:
+            self._async_drop(owner)
+        elif whole_state and owner is not None:
+            self._async_drop(owner, whole_state=True)
+        frame = _Frame(
+            priority,
+            next(self._sequence),
+            owner,
+            service_data,
+            options,
+            self.hass.loop.create_future(),
+            whole_state,
+            idempotent,
+        )
+        heapq.heappush(self._queue, frame)
+        if self._worker is None or self._worker.done():
+            self._worker = self.hass.async_create_background_task(
+                self._async_work(), f"{DOMAIN} {self.entity_id} delivery"
+            )
+        result = await frame.future
+        if stats is not None:
+            latency = time.monotonic() - start
+            record_result(stats, result, latency)
+            stats.history.append(
+                Transmission(
+                    dt_util.utcnow(),
+                    self.entity_id,
+                    service_data.get(ATTR_COMMAND),
+                    priority,
+                    result,
+                    latency,
+                )
+            )
+        return result
+
+    @callback
+    def _async_drop(self, owner: str, whole_state: bool = False) -> None:
+        queue = []
+        for frame in self._queue:
+            if frame.owner != owner or (whole_state and not frame.whole_state):
+                queue.append(frame)
+            elif not frame.future.done():
+                frame.future.set_result(SendResult.SUPERSEDED)
+                self.stats.record_suppressed()
+        if len(queue) != len(self._queue):
+            _LOGGER.debug(
+                "%s queued commands of %s are dropped by %s",
+                len(self._queue) - len(queue),
+                owner,
+                "newer state" if whole_state else "off",
+            )
+            heapq.heapify(queue)
+            self._queue = queue
+
+    async def _async_work(self) -> None:
+        while self._queue:
+            frame = heapq.heappop(self._queue)
+            if frame.future.done():
+                continue
+            start = time.monotonic()
+            try:
+                result = await self._async_transmit(
+                    frame.service_data, frame.options, frame.idempotent
+                )
+            except asyncio.CancelledError:
+                frame.future.cancel()
+                raise
+            except Exception as ex:  # noqa: BLE001
+                if not frame.future.done():
+                    frame.future.set_exception(ex)
+                continue
+            record_result(self.stats, result, time.monotonic() - start)
+            if not frame.future.done():
+                frame.future.set_result(result)
+
+    async def _async_transmit(
+        self,
+        service_data: dict[str, Any],
+        options: DeliveryOptions,
+        idempotent: bool = True,
+    ) -> SendResult:
+        """Send command via "Remote: send command" with retries."""
+        if not self.breaker.allow(time.monotonic()):
+            _LOGGER.debug("Circuit breaker of %s is open", self.entity_id)
+            return SendResult.REJECTED
+        attempts = max(options.retry_attempts, 1) if idempotent else 1
+        for attempt in range(attempts):
+            if attempt > 0:
+                await asyncio.sleep(options.backoff(attempt - 1))
+            if delay := self.bucket.reserve(
+                time.monotonic(), options.rate_limit, options.rate_burst
+            ):
+                _LOGGER.debug("Rate limit of %s delays command", self.entity_id)
+                await asyncio.sleep(delay)
+            try:
+                async with asyncio.timeout(options.send_timeout) as timeout:
+                    await self.hass.services.async_call(
+                        domain=RM_DOMAIN,
+                        service=SERVICE_SEND_COMMAND,
+                        service_data=service_data,
+                        target={ATTR_ENTITY_ID: [self.entity_id]},
+                        blocking=True,
+                    )
+            except ValueError:
+                self._async_record_success()
+                return SendResult.MISSING_CODE
+            except ServiceValidationError as ex:
+                _LOGGER.warning("Unable to send command via %s: %s", self.entity_id, ex)
+                return SendResult.FAILED
+            except (HomeAssistantError, TimeoutError) as ex:
+                if timeout.expired():
+                    """Command may be transmitted already, so it isn't repeated"""
+                    _LOGGER.warning(
+                        "Sending command via %s timed out after %s seconds",
+                        self.entity_id,
+                        options.send_timeout,
+                    )
+                    self._async_record_failure(options)
+                    return SendResult.UNKNOWN
+                _LOGGER.debug(
+                    "Attempt %s to send command via %s failed: %s",
+                    attempt + 1,
+                    self.entity_id,
+                    ex,
+                )
+                if self._async_record_failure(options):
+                    return SendResult.REJECTED
+                continue
+            self._async_record_success()
+            return SendResult.DELIVERED
+        _LOGGER.warning(
+            "Unable to send command via %s after %s attempts",
+            self.entity_id,
+            attempts,
+        )
+        return SendResult.FAILED
+
+    @callback
+    def _async_record_failure(self, options: DeliveryOptions) -> bool:
+        """Count failure. Returns True if circuit breaker has been opened."""
+        if not self.breaker.record_failure(
+            time.monotonic(), options.breaker_threshold, options.breaker_reset_timeout
+        ):
+            return False
+        _LOGGER.warning(
+            "Circuit breaker of %s is open for %s seconds after %s failures",
+            self.entity_id,
+            options.breaker_reset_timeout,
+            self.breaker.failures,
+        )
+        self._async_schedule_reset(options.breaker_reset_timeout)
+        return True
+
+    @callback
+    def _async_record_success(self) -> None:
+        if self.breaker.record_success():
+            _LOGGER.info("Circuit breaker of %s is closed", self.entity_id)
+            self._async_cancel_reset()
+            async_dispatcher_send(self.hass, SIGNAL_BLASTER_READY, self.entity_id)
+
+    @callback
+    def _async_schedule_reset(self, reset_timeout: float) -> None:
+        self._async_cancel_reset()
+        self._unsubscribe_reset = async_call_later(
+            self.hass, reset_timeout, self._async_half_open
+        )
+
+    @callback
+    def _async_half_open(self, _now) -> None:
+        self._unsubscribe_reset = None
+        self.breaker.half_open()
+        _LOGGER.debug("Circuit breaker of %s is half open", self.entity_id)
+        async_dispatcher_send(self.hass, SIGNAL_BLASTER_READY, self.entity_id)
+
+    @callback
+    def _async_cancel_reset(self) -> None:
+        if self._unsubscribe_reset is not None:
+            self._unsubscribe_reset()
+            self._unsubscribe_reset = None
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel timers and queued commands."""
+        self._async_cancel_reset()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for frame in self._queue:
+            frame.future.cancel()
+        self._queue.clear()
@@ -0,0 +1,56 @@
+"""Diagnostics support for Climate remote control."""
+
+from typing import Any
+
+from homeassistant.components.climate import DATA_COMPONENT as CLIMATE_COMPONENT
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .climate import AcRemote
+from .hub import async_get_hub
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hub = async_get_hub(hass)
+    entity = _get_climate_entity(hass, config_entry)
+    stats = hub.device_stats.get(config_entry.unique_id)
+    remote_entity_ids = entity.remote_entity_ids if entity is not None else ()
+    return {
+        "options": dict(config_entry.options),
+        "entity": entity.get_diagnostics() if entity is not None else None,
+        "stats": stats.as_dict() if stats is not None else None,
+        "transmissions": (
+            [x._asdict() for x in stats.history] if stats is not None else []
+        ),
+        "blasters": {
+            remote_entity_id: {
+                "queue_depth": blaster.queue_depth,
+                "circuit_breaker": blaster.breaker.state(),
+                "failures": blaster.breaker.failures,
+                "rate_limit_wait": blaster.wait_time,
+                "stats": blaster.stats.as_dict(),
+            }
+            for remote_entity_id in remote_entity_ids
+            if (blaster := hub.blasters.get(remote_entity_id)) is not None
+        },
+    }
+
+
+def _get_climate_entity(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> AcRemote | None:
+    if (component := hass.data.get(CLIMATE_COMPONENT)) is None:
+        return None
+    for entry in er.async_entries_for_config_entry(
+        er.async_get(hass), config_entry.entry_id
+    ):
+        if entry.domain == CLIMATE_DOMAIN and isinstance(
+            entity := component.get_entity(entry.entity_id), AcRemote
+        ):
+            return entity
+    return None
@@ -0,0 +1,174 @@
+"""Runtime data shared by all config entries of the integration."""
+
+from collections.abc import Callable, Coroutine
+from functools import partial
+import logging
+import random
+from typing import Any
+
+from homeassistant.components.remote import DOMAIN as RM_DOMAIN
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_HUB, DOMAIN
+from .delivery import Blaster
+from .metrics import TRANSMISSION_HISTORY, DeliveryStats
+from .thermal import ThermalModels
+from .timers import TimerQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+"""Seconds between resyncs of two devices on one blaster, and random addition"""
+RESYNC_INTERVAL = 2.0
+RESYNC_JITTER = 1.0
+
+type ResyncJob = Callable[[], Coroutine[Any, Any, None]]
+
+
+class Hub:
+    """Integration-wide state which doesn't belong to one config entry."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+
+        """Increased on each registry change which can affect resolved targets"""
+        self.target_generation = 0
+
+        self.blasters: dict[str, Blaster] = {}
+
+        """Delivery stats of devices by unique id"""
+        self.device_stats: dict[str, DeliveryStats] = {}
+
+        """Thermal models of rooms by unique id of devices"""
+        self.thermal = ThermalModels()
+
+        """Time-triggered jobs of all devices"""
+        self.timers = TimerQueue(hass)
+
+        """Resync jobs and their timers by remote entity id of blaster"""
+        self._resync_jobs: dict[str | None, dict[object, ResyncJob]] = {}
+        self._unsubscribe_resync: dict[str | None, CALLBACK_TYPE] = {}
+
+        self._unsubscribes: list[CALLBACK_TYPE] = [
+            hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_invalidate_targets,
+                event_filter=_is_remote_entity_event,
+            ),
+            hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_invalidate_targets
+            ),
+            hass.bus.async_listen(
+                ar.EVENT_AREA_REGISTRY_UPDATED, self._async_invalidate_targets
+            ),
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop),
+        ]
+
+    @callback
+    def async_get_blaster(self, entity_id: str) -> Blaster:
+        """Get blaster by remote entity id, create it on first use."""
+        if (blaster := self.blasters.get(entity_id)) is None:
+            blaster = self.blasters[entity_id] = Blaster(self.hass, entity_id)
+        return blaster
+
+    @callback
+    def async_get_device_stats(self, unique_id: str) -> DeliveryStats:
+        """Get delivery stats of device, create them on first use."""
+        if (stats := self.device_stats.get(unique_id)) is None:
+            stats = self.device_stats[unique_id] = DeliveryStats(TRANSMISSION_HISTORY)
+        return stats
+
+    @callback
+    def async_request_resync(
+        self, job: ResyncJob, remote_entity_ids: tuple[str, ...]
+    ) -> CALLBACK_TYPE:
+        """Queue resync of restored state.
+
+        Jobs of devices on one blaster run one by one with jittered interval,
+        so a restart doesn't flood it, blasters are resynced concurrently. Job
+        of device with several blasters is queued on the first one, the others
+        are paced by their rate limits. Returns callback which cancels the job.
+        """
+        blaster = remote_entity_ids[0] if remote_entity_ids else None
+        key = object()
+        self._resync_jobs.setdefault(blaster, {})[key] = job
+        if blaster not in self._unsubscribe_resync:
+            self._async_schedule_resync(blaster)
+
+        @callback
+        def _async_cancel() -> None:
+            if (jobs := self._resync_jobs.get(blaster)) is not None:
+                jobs.pop(key, None)
+
+        return _async_cancel
+
+    @callback
+    def _async_schedule_resync(self, blaster: str | None) -> None:
+        self._unsubscribe_resync[blaster] = async_call_later(
+            self.hass,
+            RESYNC_INTERVAL + random.uniform(0, RESYNC_JITTER),
+            partial(self._async_resync_next, blaster),
+        )
+
+    @callback
+    def _async_resync_next(self, blaster: str | None, _now) -> None:
+        del self._unsubscribe_resync[blaster]
+        if not (jobs := self._resync_jobs.get(blaster)):
+            self._resync_jobs.pop(blaster, None)
+            return
+        job = jobs.pop(next(iter(jobs)))
+        self.hass.async_create_task(job())
+        if jobs:
+            self._async_schedule_resync(blaster)
+        else:
+            del self._resync_jobs[blaster]
+
+    @callback
+    def _async_invalidate_targets(self, event: Event) -> None:
+        self.target_generation += 1
+        _LOGGER.debug("Resolved targets are invalidated by %s", event.event_type)
+
+    @callback
+    def _async_stop(self, _event: Event) -> None:
+        self._unsubscribes.pop()
+        self.async_shutdown()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Release listeners and timers."""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes.clear()
+        self._resync_jobs.clear()
+        for unsubscribe in self._unsubscribe_resync.values():
+            unsubscribe()
+        self._unsubscribe_resync.clear()
+        for blaster in self.blasters.values():
+            blaster.async_shutdown()
+        self.timers.async_shutdown()
+
+
+@callback
+def _is_remote_entity_event(event_data: er.EventEntityRegistryUpdatedData) -> bool:
+    return event_data["entity_id"].startswith(RM_DOMAIN + ".")
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> Hub:
+    """Get hub, create it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (hub := data.get(DATA_HUB)) is None:
+        hub = data[DATA_HUB] = Hub(hass)
+    return hub
+
+
+@callback
+def async_unload_hub(hass: HomeAssistant) -> None:
+    """Release hub if it was created."""
+    if (hub := hass.data.get(DOMAIN, {}).pop(DATA_HUB, None)) is not None:
+        hub.async_shutdown()
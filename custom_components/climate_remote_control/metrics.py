@@ -0,0 +1,141 @@
+"""Low-overhead delivery metrics."""
+
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Any, NamedTuple
+
+"""Upper bounds of latency histogram buckets in seconds, the last bucket is unbounded"""
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+"""Number of the last transmissions which are kept for diagnostics"""
+TRANSMISSION_HISTORY = 50
+
+
+class Transmission(NamedTuple):
+    """Command sent to one blaster"""
+
+    time: datetime
+    remote_entity_id: str
+    commands: list[str] | str
+    priority: int
+    result: str
+    latency: float
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies."""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, latency: float) -> None:
+        """Add latency in seconds."""
+        self.counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total += latency
+
+    @property
+    def mean(self) -> float | None:
+        """Mean latency in seconds."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket which contains the quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(LATENCY_BUCKETS):
+                    return LATENCY_BUCKETS[index]
+                return float("inf")
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Bucket counts keyed by upper bound."""
+        return {
+            **{
+                f"le_{bound}": count
+                for bound, count in zip(LATENCY_BUCKETS, self.counts)
+            },
+            "le_inf": self.counts[-1],
+        }
+
+
+class DeliveryStats:
+    """Counters and latency histogram of sent commands."""
+
+    __slots__ = (
+        "latency",
+        "sends",
+        "suppressed",
+        "missing_codes",
+        "timeouts",
+        "confirmed",
+        "unconfirmed",
+        "history",
+    )
+
+    def __init__(self, history_size: int = 0) -> None:
+        """Initialize. The last history_size transmissions are kept in history."""
+        self.latency = LatencyHistogram()
+        self.history: deque[Transmission] = deque(maxlen=history_size)
+        self.sends = 0
+        self.suppressed = 0
+        self.missing_codes = 0
+        self.timeouts = 0
+        """Power frames which the power sensor of the unit confirmed or not"""
+        self.confirmed = 0
+        self.unconfirmed = 0
+
+    def record_send(
+        self, latency: float, missing_code: bool = False, timeout: bool = False
+    ) -> None:
+        """Count command which has been passed to remote integration."""
+        self.sends += 1
+        self.latency.observe(latency)
+        if missing_code:
+            self.missing_codes += 1
+        if timeout:
+            self.timeouts += 1
+
+    def record_suppressed(self, count: int = 1) -> None:
+        """Count commands which weren't sent, e.g. to unavailable remote."""
+        self.suppressed += count
+
+    def record_confirmation(self, confirmed: bool) -> None:
+        """Count power frame which was watched on the power sensor."""
+        if confirmed:
+            self.confirmed += 1
+        else:
+            self.unconfirmed += 1
+
+    @property
+    def confirmation_rate(self) -> float | None:
+        """Share of watched power frames which the unit executed."""
+        if not (total := self.confirmed + self.unconfirmed):
+            return None
+        return self.confirmed / total
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summary for attributes and diagnostics."""
+        return {
+            "sends": self.sends,
+            "suppressed": self.suppressed,
+            "missing_codes": self.missing_codes,
+            "timeouts": self.timeouts,
+            "confirmed": self.confirmed,
+            "unconfirmed": self.unconfirmed,
+            "latency_p50": self.latency.quantile(0.5),
+            "latency_p99": self.latency.quantile(0.99),
+            "latency_buckets": self.latency.as_dict(),
+        }
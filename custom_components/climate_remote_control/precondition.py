@@ -0,0 +1,110 @@
+"""Start of the unit which brings the room to a temperature by a given time."""
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+import math
+from typing import Any, Self
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, HVACMode
+from homeassistant.const import ATTR_TEMPERATURE, ATTR_TIME
+from homeassistant.util import dt as dt_util
+
+from .thermal import ThermalEstimate
+
+"""Direction in which modes change the temperature"""
+MODE_SIGNS = {
+    HVACMode.HEAT: 1,
+    HVACMode.COOL: -1,
+}
+
+"""Rate in degrees per hour used until the thermal model is learned"""
+DEFAULT_RATE = 1.0
+
+"""Estimated lead time is extended by this share for errors of the model"""
+LEAD_MARGIN = 0.1
+
+"""Unit is never started earlier than this before the deadline"""
+MAX_LEAD_TIME = 6 * 3600.0
+
+
+@dataclass(frozen=True, slots=True)
+class Precondition:
+    """Target of the room at a deadline."""
+
+    deadline: float
+    hvac_mode: HVACMode
+    temperature: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Representation for restore state."""
+        return {
+            ATTR_TIME: self.deadline,
+            ATTR_HVAC_MODE: self.hvac_mode,
+            ATTR_TEMPERATURE: self.temperature,
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> Self | None:
+        """Create from restore state, None if it is invalid."""
+        try:
+            return cls(
+                float(restored[ATTR_TIME]),
+                HVACMode(restored[ATTR_HVAC_MODE]),
+                float(restored[ATTR_TEMPERATURE]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def get_start_time(
+        self, current: float | None, estimate: ThermalEstimate | None
+    ) -> float:
+        """Timestamp when the unit should start."""
+        return self.deadline - get_lead_time(
+            estimate, self.hvac_mode, current, self.temperature
+        )
+
+
+def get_lead_time(
+    estimate: ThermalEstimate | None,
+    hvac_mode: HVACMode,
+    current: float | None,
+    target: float,
+) -> float:
+    """Seconds the unit needs to bring the room from current to target.
+
+    The room approaches its equilibrium exponentially with the drift rate, so
+    the time is the logarithm of the ratio of the distances to it.
+    """
+    if (sign := MODE_SIGNS.get(hvac_mode)) is None or current is None:
+        return 0.0
+    distance = (target - current) * sign
+    if distance <= 0:
+        return 0.0
+    if estimate is None:
+        hours = distance / DEFAULT_RATE
+    else:
+        rate = estimate.heating_rate if sign > 0 else estimate.cooling_rate
+        if estimate.ambient is None:
+            hours = distance / rate if rate > 0 else math.inf
+        else:
+            equilibrium = estimate.ambient + sign * rate / estimate.drift
+            remaining = (equilibrium - target) * sign
+            hours = (
+                math.log((equilibrium - current) * sign / remaining) / estimate.drift
+                if remaining > 0
+                else math.inf
+            )
+    return min(hours * 3600 * (1 + LEAD_MARGIN), MAX_LEAD_TIME)
+
+
+def get_deadline(value: datetime | time) -> datetime:
+    """Deadline in UTC, time of day is the next one in local time zone"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=dt_util.get_default_time_zone())
+        return dt_util.as_utc(value)
+    now = dt_util.now()
+    deadline = datetime.combine(now.date(), value, now.tzinfo)
+    if deadline <= now:
+        deadline = datetime.combine(now.date() + timedelta(days=1), value, now.tzinfo)
+    return dt_util.as_utc(deadline)
@@ -0,0 +1,125 @@
+"""Model profiles shared by config entries.
+
+A profile holds options of one air conditioner model. Entries reference it by
+the profile option and keep only their own options, which override the
+profile. Profiles are stored once in integration storage.
+"""
+
+from collections.abc import Mapping
+import logging
+from typing import Any
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .config import EntryConfig, async_get_config, async_remove_config, merge_profile
+from .const import (
+    CONF_PROFILE,
+    DATA_CONFIG,
+    DATA_PROFILES,
+    DOMAIN,
+    SIGNAL_CONFIG_UPDATED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.profiles"
+STORAGE_VERSION = 1
+
+
+def _get_store(hass: HomeAssistant) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+
+async def async_load_profiles(hass: HomeAssistant) -> None:
+    """Load profiles from storage, entries are set up after that."""
+    data = await _get_store(hass).async_load()
+    hass.data.setdefault(DOMAIN, {})[DATA_PROFILES] = dict(
+        (data or {}).get(DATA_PROFILES, {})
+    )
+
+
+@callback
+def async_get_profiles(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Get options of profiles by profile id."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PROFILES, {})
+
+
+@callback
+def async_get_profile_entries(
+    hass: HomeAssistant, profile_id: str
+) -> list[config_entries.ConfigEntry]:
+    """Get config entries which reference the profile."""
+    return [
+        x
+        for x in hass.config_entries.async_entries(DOMAIN)
+        if x.options.get(CONF_PROFILE) == profile_id
+    ]
+
+
+async def async_set_profile(
+    hass: HomeAssistant, profile_id: str, options: Mapping[str, Any]
+) -> dict[str, list[str]]:
+    """Create or change profile and update entities of all entries which use it.
+
+    Every entry is validated with the new profile first, nothing is changed if
+    any of them is invalid. Entries are reloaded only if their buttons change.
+    """
+    profiles = async_get_profiles(hass) | {profile_id: dict(options)}
+    entries = async_get_profile_entries(hass, profile_id)
+    errors: list[str] = []
+    for entry in entries:
+        try:
+            EntryConfig.from_options(merge_profile(entry.options, profiles))
+        except ValueError as ex:
+            errors.append(f"{entry.unique_id}: {ex}")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    async_get_profiles(hass)[profile_id] = dict(options)
+    await _async_save(hass)
+    result: dict[str, list[str]] = {"updated": [], "reloaded": []}
+    for entry in entries:
+        if entry.state is not config_entries.ConfigEntryState.LOADED:
+            continue
+        old_config = hass.data[DOMAIN][DATA_CONFIG].get(entry.entry_id)
+        async_remove_config(hass, entry)
+        config = async_get_config(hass, entry)
+        if old_config is None or _is_reload_required(old_config, config):
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+            result["reloaded"].append(entry.unique_id)
+            continue
+        async_dispatcher_send(
+            hass, SIGNAL_CONFIG_UPDATED.format(entry.entry_id), config
+        )
+        result["updated"].append(entry.unique_id)
+    _LOGGER.debug("Profile %s is applied to %s", profile_id, result)
+    return result
+
+
+async def async_remove_profile(hass: HomeAssistant, profile_id: str) -> None:
+    """Remove profile, raise ValueError if it doesn't exist or is used."""
+    if profile_id not in async_get_profiles(hass):
+        raise ValueError(f"profile {profile_id} doesn't exist")
+    if entries := async_get_profile_entries(hass, profile_id):
+        raise ValueError(
+            f"profile {profile_id} is used by {sorted(x.unique_id for x in entries)}"
+        )
+    del async_get_profiles(hass)[profile_id]
+    await _async_save(hass)
+
+
+async def _async_save(hass: HomeAssistant) -> None:
+    await _get_store(hass).async_save({DATA_PROFILES: async_get_profiles(hass)})
+
+
+def _is_reload_required(old_config: EntryConfig, config: EntryConfig) -> bool:
+    """Buttons and code table are created on setup, climate entity is updated"""
+    return (
+        old_config.swing_mode != config.swing_mode
+        or old_config.swing_modes != config.swing_modes
+        or old_config.delivery != config.delivery
+        or old_config.code_table != config.code_table
+    )
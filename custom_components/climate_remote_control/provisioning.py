@@ -0,0 +1,236 @@
+"""Bulk import and export of entry options.
+
+Document is a mapping of unique ids to entry names and options, the same
+mapping is returned by export:
+
+entries:
+  living_room:
+    name: Living room
+    options:
+      device: lg_living_room
+      ...
+
+Compiled code tables belong to their entries, so they aren't exported. Code
+files of imported entries are compiled into tables of these entries.
+"""
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+import uuid
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_NAME, CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.yaml import parse_yaml
+import voluptuous as vol
+
+from .codes import (
+    STAGED_SUFFIX,
+    CodeFileError,
+    compile_code_file,
+    get_code_table_path,
+    install_code_table,
+    remove_code_table,
+)
+from .config import EntryConfig, merge_profile
+from .config_flow import get_options_schema
+from .const import (
+    ATTR_ENTRIES,
+    CONF_CODE_FILE,
+    CONF_CODE_TABLE,
+    CONF_OPTIONS,
+    DOMAIN,
+)
+from .profiles import async_get_profiles
+
+DOCUMENT_SCHEMA = vol.Schema({vol.Required(ATTR_ENTRIES): dict}, extra=vol.ALLOW_EXTRA)
+ENTRY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_NAME): str,
+        vol.Required(CONF_OPTIONS): dict,
+    }
+)
+
+
+class ImportedEntry(NamedTuple):
+    """Validated entry of a document"""
+
+    unique_id: str
+    name: str | None
+    options: dict[str, Any]
+    config_entry: config_entries.ConfigEntry | None
+    """Table compiled from imported code file, installed with the entry"""
+    staged_code_table: str | None = None
+
+
+def parse_document(document: str) -> dict[str, Any]:
+    """Get entries from YAML or JSON document, raise ValueError if it is invalid."""
+    try:
+        return DOCUMENT_SCHEMA(parse_yaml(document))[ATTR_ENTRIES]
+    except (HomeAssistantError, vol.Invalid) as ex:
+        raise ValueError(f"Invalid document: {ex}") from ex
+
+
+async def async_validate_entries(
+    hass: HomeAssistant, entries: Mapping[str, Any]
+) -> list[ImportedEntry]:
+    """Validate all entries, raise ValueError with errors of every invalid entry.
+
+    Options of existing entries are merged with imported options. Imported code
+    files are compiled to staged tables, which are dropped if any entry fails.
+    """
+    config_entries_by_id = {
+        x.unique_id: x for x in hass.config_entries.async_entries(DOMAIN)
+    }
+    options_schema = get_options_schema()
+    profiles = async_get_profiles(hass)
+    validated: list[ImportedEntry] = []
+    errors: list[str] = []
+    for unique_id, entry in entries.items():
+        unique_id = str(unique_id)
+        config_entry = config_entries_by_id.get(unique_id)
+        try:
+            entry = ENTRY_SCHEMA(entry)
+            imported = options_schema(entry[CONF_OPTIONS])
+        except vol.Invalid as ex:
+            errors.append(f"{unique_id}: {ex}")
+            continue
+        """Table of another entry is never shared, it's compiled per entry"""
+        imported.pop(CONF_CODE_TABLE, None)
+        if CONF_CODE_FILE in imported and not imported[CONF_CODE_FILE]:
+            imported[CONF_CODE_TABLE] = None
+        options = imported
+        if config_entry is not None:
+            options = dict(config_entry.options) | imported
+        try:
+            EntryConfig.from_options(merge_profile(options, profiles))
+        except ValueError as ex:
+            errors.append(f"{unique_id}: {ex}")
+            continue
+        staged = None
+        if code_file := imported.get(CONF_CODE_FILE):
+            staged = hass.config.path(get_code_table_path(uuid.uuid4().hex))
+            staged += STAGED_SUFFIX
+            try:
+                await hass.async_add_executor_job(
+                    compile_code_file, hass.config.path(code_file), staged
+                )
+            except CodeFileError as ex:
+                errors.append(f"{unique_id}: {ex}")
+                continue
+        validated.append(
+            ImportedEntry(
+                unique_id, entry.get(CONF_NAME), options, config_entry, staged
+            )
+        )
+    if errors:
+        await async_drop_staged_tables(hass, validated)
+        raise ValueError("; ".join(errors))
+    return validated
+
+
+async def async_drop_staged_tables(
+    hass: HomeAssistant, entries: list[ImportedEntry]
+) -> None:
+    """Remove tables compiled for entries which aren't imported."""
+    for entry in entries:
+        if entry.staged_code_table is not None:
+            await hass.async_add_executor_job(
+                remove_code_table, entry.staged_code_table
+            )
+
+
+async def _async_install_code_table(
+    hass: HomeAssistant,
+    entry: ImportedEntry,
+    config_entry: config_entries.ConfigEntry,
+) -> dict[str, Any]:
+    """Move staged table to the path of the entry, get options which use it."""
+    code_table = get_code_table_path(config_entry.entry_id)
+    if entry.staged_code_table is not None:
+        await hass.async_add_executor_job(
+            install_code_table, entry.staged_code_table, hass.config.path(code_table)
+        )
+        return entry.options | {CONF_CODE_TABLE: code_table}
+    if CONF_CODE_TABLE in entry.options and entry.options[CONF_CODE_TABLE] is None:
+        await hass.async_add_executor_job(
+            remove_code_table, hass.config.path(code_table)
+        )
+    return entry.options
+
+
+async def async_import_entries(
+    hass: HomeAssistant, entries: list[ImportedEntry]
+) -> dict[str, list[str]]:
+    """Apply validated entries, new entries are created concurrently.
+
+    Updated entries are reloaded by their update listeners, entries with a
+    recompiled code table are reloaded even if their options didn't change.
+    """
+    result: dict[str, list[str]] = {"created": [], "updated": [], "unchanged": []}
+    created: list[ImportedEntry] = []
+    for entry in entries:
+        config_entry = entry.config_entry
+        if config_entry is None:
+            created.append(entry)
+            continue
+        title = entry.name or config_entry.title
+        options = await _async_install_code_table(hass, entry, config_entry)
+        if (
+            config_entry.options == options
+            and config_entry.title == title
+            and entry.staged_code_table is None
+        ):
+            result["unchanged"].append(entry.unique_id)
+            continue
+        if not hass.config_entries.async_update_entry(
+            config_entry, title=title, options=options
+        ):
+            hass.config_entries.async_schedule_reload(config_entry.entry_id)
+        result["updated"].append(entry.unique_id)
+
+    async def _async_create(entry: ImportedEntry) -> None:
+        flow_result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_IMPORT},
+            data={
+                CONF_UNIQUE_ID: entry.unique_id,
+                CONF_NAME: entry.name or entry.unique_id,
+                CONF_OPTIONS: entry.options,
+            },
+        )
+        if (config_entry := flow_result.get("result")) is None:
+            await async_drop_staged_tables(hass, [entry])
+            return
+        """Path of the table is known once the entry exists"""
+        if entry.staged_code_table is not None:
+            hass.config_entries.async_update_entry(
+                config_entry,
+                options=await _async_install_code_table(hass, entry, config_entry),
+            )
+
+    await asyncio.gather(*(_async_create(x) for x in created))
+    result["created"] = [x.unique_id for x in created]
+    return result
+
+
+@callback
+def async_export_entries(hass: HomeAssistant) -> dict[str, Any]:
+    """Get options of all entries as a document."""
+    return {
+        ATTR_ENTRIES: {
+            config_entry.unique_id: {
+                CONF_NAME: config_entry.title,
+                CONF_OPTIONS: {
+                    k: v
+                    for k, v in config_entry.options.items()
+                    if k != CONF_CODE_TABLE
+                },
+            }
+            for config_entry in sorted(
+                hass.config_entries.async_entries(DOMAIN), key=lambda x: x.unique_id
+            )
+        }
+    }
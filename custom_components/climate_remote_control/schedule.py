@@ -0,0 +1,100 @@
+"""Weekly schedule of states which an entity applies by itself."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any, Self
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
+    ATTR_SWING_MODE,
+    HVACMode,
+)
+from homeassistant.const import ATTR_TEMPERATURE, CONF_AT, CONF_WEEKDAY, WEEKDAYS
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_SCHEDULE
+
+"""Attributes which a schedule event can set, like in set_all service"""
+SCHEDULE_ATTRIBUTES = (
+    ATTR_HVAC_MODE,
+    ATTR_TEMPERATURE,
+    ATTR_FAN_MODE,
+    ATTR_SWING_MODE,
+    ATTR_PRESET_MODE,
+)
+SCHEDULE_VALUES = {
+    ATTR_HVAC_MODE: HVACMode,
+    ATTR_TEMPERATURE: float,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleEvent:
+    """State which is applied at a time of the selected days."""
+
+    at: time
+    weekdays: frozenset[int]
+    state: tuple[tuple[str, Any], ...]
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Create from one event of entry options, raise ValueError if invalid."""
+        try:
+            at = time.fromisoformat(options[CONF_AT])
+        except (KeyError, TypeError) as ex:
+            raise ValueError(f"{CONF_SCHEDULE} event requires {CONF_AT}") from ex
+        weekdays = options.get(CONF_WEEKDAY) or WEEKDAYS
+        if unknown := set(weekdays) - set(WEEKDAYS):
+            raise ValueError(f"{CONF_WEEKDAY} {sorted(unknown)} are unknown")
+        state = tuple(
+            (key, SCHEDULE_VALUES.get(key, str)(options[key]))
+            for key in SCHEDULE_ATTRIBUTES
+            if options.get(key) is not None
+        )
+        if not state:
+            raise ValueError(f"{CONF_SCHEDULE} event at {at} doesn't set anything")
+        return cls(
+            at=at,
+            weekdays=frozenset(WEEKDAYS.index(x) for x in weekdays),
+            state=state,
+        )
+
+    def get_next(self, after: datetime) -> datetime:
+        """First time of the event later than a local time."""
+        for days in range(8):
+            day = after.date() + timedelta(days=days)
+            if day.weekday() not in self.weekdays:
+                continue
+            fire_at = datetime.combine(day, self.at, after.tzinfo)
+            if fire_at > after:
+                return fire_at
+        raise ValueError(f"{CONF_SCHEDULE} event at {self.at} has no days")
+
+
+def schedule_from_options(options: Mapping[str, Any]) -> tuple[ScheduleEvent, ...]:
+    """Events of entry options, raise ValueError if any is invalid."""
+    return tuple(
+        ScheduleEvent.from_options(x) for x in options.get(CONF_SCHEDULE) or ()
+    )
+
+
+def get_next_state(
+    schedule: tuple[ScheduleEvent, ...], after: datetime
+) -> tuple[datetime, dict[str, Any]] | None:
+    """Time of the first events after a time and the state which they set.
+
+    Events at the same time are merged in their order, None without events.
+    """
+    after = dt_util.as_local(after)
+    upcoming = [(event.get_next(after), event) for event in schedule]
+    if not upcoming:
+        return None
+    fire_at = min(x[0] for x in upcoming)
+    state: dict[str, Any] = {}
+    for event_at, event in upcoming:
+        if event_at == fire_at:
+            state.update(event.state)
+    return fire_at, state
@@ -0,0 +1,289 @@
+"""Platform for diagnostic sensors of command delivery and room response."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import math
+from typing import Any
+
+from homeassistant import config_entries
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .config import async_get_config
+from .const import DOMAIN
+from .hub import async_get_hub
+from .metrics import DeliveryStats, LatencyHistogram
+from .target import RemoteTarget
+from .thermal import ThermalEstimate
+
+_LOGGER = logging.getLogger(__name__)
+
+"""Sensors are updated on interval, sending commands doesn't write states"""
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+@dataclass(frozen=True, kw_only=True)
+class DeliverySensorEntityDescription(SensorEntityDescription):
+    """Describes delivery sensor."""
+
+    value_fn: Callable[[DeliveryStats], StateType]
+    """Attributes of the device which are also given for each of its blasters"""
+    attributes_fn: Callable[[DeliveryStats], dict[str, Any]] | None = None
+
+
+def _latency_ms(latency: float | None) -> float | None:
+    if latency is None or math.isinf(latency):
+        return None
+    return round(latency * 1000, 1)
+
+
+def _histogram_attributes(histogram: LatencyHistogram) -> dict[str, Any]:
+    return {
+        "count": histogram.count,
+        "p50": _latency_ms(histogram.quantile(0.5)),
+        "p99": _latency_ms(histogram.quantile(0.99)),
+        "buckets": histogram.as_dict(),
+    }
+
+
+def _percent(share: float | None) -> float | None:
+    return round(share * 100, 1) if share is not None else None
+
+
+def _confirmation_attributes(stats: DeliveryStats) -> dict[str, Any]:
+    return {
+        "confirmed": stats.confirmed,
+        "unconfirmed": stats.unconfirmed,
+        "rate": _percent(stats.confirmation_rate),
+    }
+
+
+SENSOR_DESCRIPTIONS = (
+    DeliverySensorEntityDescription(
+        key="command_latency",
+        translation_key="command_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: _latency_ms(stats.latency.quantile(0.5)),
+        attributes_fn=lambda stats: _histogram_attributes(stats.latency),
+    ),
+    DeliverySensorEntityDescription(
+        key="commands_sent",
+        translation_key="commands_sent",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.sends,
+    ),
+    DeliverySensorEntityDescription(
+        key="commands_suppressed",
+        translation_key="commands_suppressed",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.suppressed,
+    ),
+    DeliverySensorEntityDescription(
+        key="missing_codes",
+        translation_key="missing_codes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.missing_codes,
+    ),
+    DeliverySensorEntityDescription(
+        key="send_timeouts",
+        translation_key="send_timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.timeouts,
+    ),
+)
+
+"""Added when the entry has a power sensor which confirms power frames"""
+CONFIRMATION_SENSOR_DESCRIPTION = DeliverySensorEntityDescription(
+    key="confirmation_rate",
+    translation_key="confirmation_rate",
+    native_unit_of_measurement=PERCENTAGE,
+    state_class=SensorStateClass.MEASUREMENT,
+    value_fn=lambda stats: _percent(stats.confirmation_rate),
+    attributes_fn=_confirmation_attributes,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ThermalSensorEntityDescription(SensorEntityDescription):
+    """Describes sensor of the learned thermal model."""
+
+    value_fn: Callable[[ThermalEstimate], StateType]
+    """Unit derived from the temperature unit of the entry"""
+    unit_fn: Callable[[UnitOfTemperature], str]
+
+
+THERMAL_SENSOR_DESCRIPTIONS = (
+    ThermalSensorEntityDescription(
+        key="heating_rate",
+        translation_key="heating_rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda estimate: round(estimate.heating_rate, 2),
+        unit_fn=lambda unit: f"{unit}/h",
+    ),
+    ThermalSensorEntityDescription(
+        key="cooling_rate",
+        translation_key="cooling_rate",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda estimate: round(estimate.cooling_rate, 2),
+        unit_fn=lambda unit: f"{unit}/h",
+    ),
+    ThermalSensorEntityDescription(
+        key="thermal_time_constant",
+        translation_key="thermal_time_constant",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda estimate: (
+            round(1 / estimate.drift, 2) if estimate.ambient is not None else None
+        ),
+        unit_fn=lambda _unit: UnitOfTime.HOURS,
+    ),
+    ThermalSensorEntityDescription(
+        key="ambient_temperature",
+        translation_key="ambient_temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda estimate: (
+            round(estimate.ambient, 1) if estimate.ambient is not None else None
+        ),
+        unit_fn=lambda unit: unit,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: config_entries.ConfigEntry,
+    async_add_devices: AddEntitiesCallback,
+) -> None:
+    """Set up diagnostic sensors"""
+    if config_entry.options == {}:
+        _LOGGER.debug("Climate remote control platform is not configured, skip.")
+        return
+    config = async_get_config(hass, config_entry)
+    entities: list[SensorEntity] = [
+        DeliverySensor(
+            unique_id=config_entry.unique_id,
+            name=config_entry.title,
+            target=config.target,
+            description=description,
+        )
+        for description in SENSOR_DESCRIPTIONS
+    ]
+    if config.confirmation is not None:
+        entities.append(
+            DeliverySensor(
+                unique_id=config_entry.unique_id,
+                name=config_entry.title,
+                target=config.target,
+                description=CONFIRMATION_SENSOR_DESCRIPTION,
+            )
+        )
+    if config.current_temperature_sensor_entity_id is not None:
+        """Thermal model is learned only from the room sensor"""
+        entities.extend(
+            ThermalSensor(
+                unique_id=config_entry.unique_id,
+                name=config_entry.title,
+                temperature_unit=config.temperature_unit,
+                description=description,
+            )
+            for description in THERMAL_SENSOR_DESCRIPTIONS
+        )
+    async_add_devices(entities, update_before_add=True)
+
+
+class DeliverySensor(SensorEntity):
+    """Delivery metric of one device"""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    """Histogram buckets are recorded as p50 state and p99 attribute"""
+    _unrecorded_attributes = frozenset({"buckets", "blasters"})
+    entity_description: DeliverySensorEntityDescription
+
+    def __init__(
+        self,
+        unique_id: str,
+        name: str,
+        target: dict[str, Any],
+        description: DeliverySensorEntityDescription,
+    ) -> None:
+        """Initialize."""
+        self.entity_description = description
+        self.device_unique_id = unique_id
+        self.target = target
+        self.remote_target: RemoteTarget | None = None
+        self._attr_unique_id = f"{unique_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, unique_id)},
+            manufacturer="avzhuiko",
+            name=name,
+        )
+
+    async def async_update(self) -> None:
+        """Read metrics collected since the last update."""
+        hub = async_get_hub(self.hass)
+        stats = hub.async_get_device_stats(self.device_unique_id)
+        self._attr_native_value = self.entity_description.value_fn(stats)
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return
+        if self.remote_target is None:
+            self.remote_target = RemoteTarget(self.hass, self.target)
+        self._attr_extra_state_attributes = attributes_fn(stats) | {
+            "blasters": {
+                remote_entity_id: attributes_fn(hub.blasters[remote_entity_id].stats)
+                for remote_entity_id in self.remote_target.entity_ids
+                if remote_entity_id in hub.blasters
+            }
+        }
+
+
+class ThermalSensor(SensorEntity):
+    """Learned thermal response of the room of one device"""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: ThermalSensorEntityDescription
+
+    def __init__(
+        self,
+        unique_id: str,
+        name: str,
+        temperature_unit: UnitOfTemperature,
+        description: ThermalSensorEntityDescription,
+    ) -> None:
+        """Initialize."""
+        self.entity_description = description
+        self.device_unique_id = unique_id
+        self._attr_unique_id = f"{unique_id}_{description.key}"
+        self._attr_native_unit_of_measurement = description.unit_fn(temperature_unit)
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, unique_id)},
+            manufacturer="avzhuiko",
+            name=name,
+        )
+
+    async def async_update(self) -> None:
+        """Read the estimate, unknown until the model has enough samples."""
+        estimate = async_get_hub(self.hass).thermal.estimate(self.device_unique_id)
+        self._attr_native_value = (
+            self.entity_description.value_fn(estimate) if estimate is not None else None
+        )
@@ -0,0 +1,350 @@
+"""Integration-level services."""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+    ATTR_PRESET_MODE,
+    ATTR_SWING_MODE,
+)
+from homeassistant.components.climate import DATA_COMPONENT as CLIMATE_COMPONENT
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_LABEL_ID,
+    ATTR_TEMPERATURE,
+    ATTR_TIME,
+)
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import (
+    async_extract_entity_ids,
+    async_extract_referenced_entity_ids,
+)
+import voluptuous as vol
+
+from .const import (
+    ATTR_DOCUMENT,
+    ATTR_ENTRIES,
+    ATTR_MAX_LANES,
+    ATTR_PROFILE_ID,
+    CONF_OPTIONS,
+    DEFAULT_MAX_LANES,
+    DOMAIN,
+    SERVICE_CANCEL_PRECONDITION,
+    SERVICE_EXPORT_OPTIONS,
+    SERVICE_IMPORT_OPTIONS,
+    SERVICE_PRECONDITION,
+    SERVICE_REMOVE_PROFILE,
+    SERVICE_SET_ALL,
+    SERVICE_SET_PROFILE,
+)
+
+if TYPE_CHECKING:
+    from .climate import AcRemote
+
+_LOGGER = logging.getLogger(__name__)
+
+SET_ALL_ATTRIBUTES = (
+    ATTR_HVAC_MODE,
+    ATTR_TEMPERATURE,
+    ATTR_FAN_MODE,
+    ATTR_SWING_MODE,
+    ATTR_PRESET_MODE,
+)
+
+SET_ALL_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_HVAC_MODE): vol.Coerce(HVACMode),
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_FAN_MODE): cv.string,
+            vol.Optional(ATTR_SWING_MODE): cv.string,
+            vol.Optional(ATTR_PRESET_MODE): cv.string,
+            vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_LABEL_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_MAX_LANES, default=DEFAULT_MAX_LANES): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(*SET_ALL_ATTRIBUTES),
+)
+IMPORT_OPTIONS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(ATTR_DOCUMENT, ATTR_ENTRIES): cv.string,
+            vol.Exclusive(ATTR_ENTRIES, ATTR_ENTRIES): dict,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DOCUMENT, ATTR_ENTRIES),
+)
+SET_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_PROFILE_ID): cv.slug,
+        vol.Required(CONF_OPTIONS): dict,
+    }
+)
+REMOVE_PROFILE_SCHEMA = vol.Schema({vol.Required(ATTR_PROFILE_ID): cv.string})
+PRECONDITION_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
+        vol.Required(ATTR_TIME): vol.Any(cv.datetime, cv.time),
+        vol.Optional(ATTR_HVAC_MODE): vol.In([HVACMode.HEAT, HVACMode.COOL]),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_ALL,
+        _async_set_all,
+        schema=SET_ALL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_OPTIONS,
+        _async_import_options,
+        schema=IMPORT_OPTIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_OPTIONS,
+        _async_export_options,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PROFILE,
+        _async_set_profile,
+        schema=SET_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REMOVE_PROFILE,
+        _async_remove_profile,
+        schema=REMOVE_PROFILE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PRECONDITION,
+        _async_precondition,
+        schema=PRECONDITION_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CANCEL_PRECONDITION,
+        _async_cancel_precondition,
+        schema=cv.make_entity_service_schema({}),
+    )
+
+
+async def _async_set_all(call: ServiceCall) -> ServiceResponse:
+    """Apply state to all climate entities of the integration.
+
+    Entities which share an IR blaster are updated one by one in the lane of
+    the blaster, at most max_lanes lanes run concurrently. Failure of one
+    entity is recorded in its result and doesn't stop the others.
+    """
+    hass = call.hass
+    start = time.monotonic()
+    state = {key: call.data[key] for key in SET_ALL_ATTRIBUTES if key in call.data}
+    lanes = _get_lanes(_async_get_entities(hass, call))
+    semaphore = asyncio.Semaphore(call.data[ATTR_MAX_LANES])
+    results: dict[str, str] = {}
+
+    async def _async_run_lane(entities: list["AcRemote"]) -> None:
+        async with semaphore:
+            for entity in entities:
+                try:
+                    changed = await entity.async_apply_state(state)
+                except HomeAssistantError as ex:
+                    results[entity.entity_id] = str(ex)
+                    continue
+                except Exception as ex:  # noqa: BLE001
+                    _LOGGER.exception("Unable to apply state to %s", entity.entity_id)
+                    results[entity.entity_id] = f"{type(ex).__name__}: {ex}"
+                    continue
+                results[entity.entity_id] = "changed" if changed else "unchanged"
+
+    await asyncio.gather(*(_async_run_lane(x) for x in lanes))
+    wall_time = time.monotonic() - start
+    _LOGGER.debug(
+        "State %s is applied to %s entities in %s lanes in %.3f seconds",
+        state,
+        len(results),
+        len(lanes),
+        wall_time,
+    )
+    return {"results": results, "wall_time": round(wall_time, 3)}
+
+
+def _get_lanes(entities: list["AcRemote"]) -> list[list["AcRemote"]]:
+    """Group entities which share any IR blaster into one lane.
+
+    Entity which sends to several blasters joins their lanes, so no blaster
+    gets commands from two lanes at once.
+    """
+    lanes: list[tuple[set[str | None], list["AcRemote"]]] = []
+    for entity in entities:
+        blasters: set[str | None] = set(entity.remote_entity_ids) or {None}
+        entities_in_lane = []
+        for other in [x for x in lanes if x[0] & blasters]:
+            lanes.remove(other)
+            blasters |= other[0]
+            entities_in_lane += other[1]
+        lanes.append((blasters, entities_in_lane + [entity]))
+    return [x[1] for x in lanes]
+
+
+async def _async_import_options(call: ServiceCall) -> ServiceResponse:
+    """Create or update entries from a document.
+
+    Every entry is validated before anything is applied, so an invalid entry
+    leaves all entries unchanged.
+    """
+    from .provisioning import (
+        async_import_entries,
+        async_validate_entries,
+        parse_document,
+    )
+
+    start = time.monotonic()
+    try:
+        entries = call.data.get(ATTR_ENTRIES)
+        if entries is None:
+            entries = parse_document(call.data[ATTR_DOCUMENT])
+        validated = await async_validate_entries(call.hass, entries)
+    except ValueError as ex:
+        raise ServiceValidationError(str(ex)) from ex
+    result = await async_import_entries(call.hass, validated)
+    wall_time = time.monotonic() - start
+    _LOGGER.debug("%s entries are imported in %.3f seconds", len(validated), wall_time)
+    return result | {"wall_time": round(wall_time, 3)}
+
+
+async def _async_export_options(call: ServiceCall) -> ServiceResponse:
+    """Get options of all entries as a document for import_options."""
+    from .provisioning import async_export_entries
+
+    return async_export_entries(call.hass)
+
+
+async def _async_set_profile(call: ServiceCall) -> ServiceResponse:
+    """Create or change model profile and update entities which use it.
+
+    Entities are updated in place, entries are reloaded only if their buttons
+    or code table change.
+    """
+    from .config_flow import get_profile_schema
+    from .profiles import async_set_profile
+
+    start = time.monotonic()
+    try:
+        options = get_profile_schema()(call.data[CONF_OPTIONS])
+    except vol.Invalid as ex:
+        raise ServiceValidationError(f"Invalid options: {ex}") from ex
+    try:
+        result = await async_set_profile(call.hass, call.data[ATTR_PROFILE_ID], options)
+    except ValueError as ex:
+        raise ServiceValidationError(str(ex)) from ex
+    wall_time = time.monotonic() - start
+    _LOGGER.debug("Profile is applied in %.3f seconds", wall_time)
+    return result | {"wall_time": round(wall_time, 3)}
+
+
+async def _async_remove_profile(call: ServiceCall) -> None:
+    """Remove model profile which isn't used by any entry."""
+    from .profiles import async_remove_profile
+
+    try:
+        await async_remove_profile(call.hass, call.data[ATTR_PROFILE_ID])
+    except ValueError as ex:
+        raise ServiceValidationError(str(ex)) from ex
+
+
+async def _async_precondition(call: ServiceCall) -> None:
+    """Plan start of selected units which brings rooms to temperature by time."""
+    from .precondition import get_deadline
+
+    deadline = get_deadline(call.data[ATTR_TIME])
+    for entity in await _async_get_target_entities(call):
+        await entity.async_precondition(
+            call.data[ATTR_TEMPERATURE], deadline, call.data.get(ATTR_HVAC_MODE)
+        )
+
+
+async def _async_cancel_precondition(call: ServiceCall) -> None:
+    """Drop planned start of selected units."""
+    for entity in await _async_get_target_entities(call):
+        await entity.async_cancel_precondition()
+
+
+async def _async_get_target_entities(call: ServiceCall) -> list["AcRemote"]:
+    """Get climate entities of the integration selected by service target."""
+    if (component := call.hass.data.get(CLIMATE_COMPONENT)) is None:
+        return []
+    """Climate platform is imported on the first call, not on integration setup"""
+    from .climate import AcRemote
+
+    return [
+        entity
+        for entity_id in sorted(await async_extract_entity_ids(call.hass, call))
+        if isinstance(entity := component.get_entity(entity_id), AcRemote)
+    ]
+
+
+@callback
+def _async_get_entities(hass: HomeAssistant, call: ServiceCall) -> list["AcRemote"]:
+    """Get climate entities of loaded entries filtered by area and label."""
+    entity_registry = er.async_get(hass)
+    entity_ids = {
+        entry.entity_id
+        for config_entry in hass.config_entries.async_loaded_entries(DOMAIN)
+        for entry in er.async_entries_for_config_entry(
+            entity_registry, config_entry.entry_id
+        )
+        if entry.domain == CLIMATE_DOMAIN
+    }
+    if ATTR_AREA_ID in call.data or ATTR_LABEL_ID in call.data:
+        selected = async_extract_referenced_entity_ids(
+            hass,
+            ServiceCall(
+                hass,
+                DOMAIN,
+                SERVICE_SET_ALL,
+                {
+                    ATTR_AREA_ID: call.data.get(ATTR_AREA_ID, []),
+                    ATTR_LABEL_ID: call.data.get(ATTR_LABEL_ID, []),
+                },
+            ),
+        )
+        entity_ids &= selected.referenced | selected.indirectly_referenced
+    if (component := hass.data.get(CLIMATE_COMPONENT)) is None:
+        return []
+    from .climate import AcRemote
+
+    return [
+        entity
+        for entity_id in sorted(entity_ids)
+        if isinstance(entity := component.get_entity(entity_id), AcRemote)
+    ]
@@ -0,0 +1,52 @@
+"""Resolution of remote command target to concrete remote entities."""
+
+import logging
+from typing import Any
+
+from homeassistant.components.remote import DOMAIN as RM_DOMAIN
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .hub import async_get_hub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RemoteTarget:
+    """Target for "Remote: send command" resolved to remote entity ids.
+
+    Areas and devices are resolved once and the result is cached until one of
+    entity, device or area registries is updated.
+    """
+
+    def __init__(self, hass: HomeAssistant, target: dict[str, Any]) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._hub = async_get_hub(hass)
+        self._target = target or {}
+        self._generation: int | None = None
+        self._entity_ids: tuple[str, ...] = ()
+
+    @property
+    def entity_ids(self) -> tuple[str, ...]:
+        """Remote entity ids, sorted."""
+        if self._generation != self._hub.target_generation:
+            self._entity_ids = self._resolve()
+            self._generation = self._hub.target_generation
+        return self._entity_ids
+
+    def _resolve(self) -> tuple[str, ...]:
+        selected = async_extract_referenced_entity_ids(
+            self._hass,
+            ServiceCall(self._hass, RM_DOMAIN, SERVICE_SEND_COMMAND, self._target),
+        )
+        entity_ids = tuple(
+            sorted(
+                entity_id
+                for entity_id in selected.referenced | selected.indirectly_referenced
+                if entity_id.startswith(RM_DOMAIN + ".")
+            )
+        )
+        _LOGGER.debug("Target %s is resolved to %s", self._target, entity_ids)
+        return entity_ids
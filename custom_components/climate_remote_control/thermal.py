@@ -0,0 +1,194 @@
+"""Online thermal model of rooms estimated by recursive least squares.
+
+Temperature of a room changes as
+dT/dt = drift * (ambient - T) + heating * heat - cooling * cool
+which is linear in parameters, so it is estimated as regression
+dT/dt = θ0 + θ1 * T + θ2 * heat + θ3 * cool
+where heat and cool are 1 while the unit runs in the mode. Rates are in
+degrees per hour.
+"""
+
+from array import array
+from collections.abc import Sequence
+import math
+from typing import NamedTuple
+
+PARAMETERS = 4
+
+"""Layout of one room in the arrays: parameters, covariance, last sample"""
+_THETA = 0
+_COVARIANCE = _THETA + PARAMETERS
+_TIME = _COVARIANCE + PARAMETERS * PARAMETERS
+_TEMPERATURE = _TIME + 1
+_HEAT = _TEMPERATURE + 1
+_COOL = _HEAT + 1
+_SAMPLES = _COOL + 1
+STRIDE = _SAMPLES + 1
+
+"""Old samples are forgotten, so the model follows seasons. Forgetting stops
+while the covariance is large, otherwise it grows without bound for a mode
+which isn't used.
+"""
+FORGETTING = 0.999
+INITIAL_COVARIANCE = 100.0
+MAX_COVARIANCE_TRACE = PARAMETERS * INITIAL_COVARIANCE
+
+"""Samples closer than this are skipped, the difference is mostly sensor noise"""
+MIN_INTERVAL = 120.0
+
+"""After a longer gap the next sample only starts a new interval"""
+MAX_INTERVAL = 3600.0
+
+"""Seconds in which a sample is still the start of the current interval"""
+FRESH_SAMPLE = 5.0
+
+"""Estimates are shown after this number of intervals"""
+MIN_SAMPLES = 10
+
+
+class ThermalEstimate(NamedTuple):
+    """Learned response of a room"""
+
+    heating_rate: float
+    cooling_rate: float
+    """Share of the difference to ambient temperature which is lost per hour"""
+    drift: float
+    ambient: float | None
+    samples: int
+
+
+class ThermalModels:
+    """Estimators of all rooms in one contiguous array, each update is O(1)."""
+
+    __slots__ = ("_data", "_free", "_slots")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._data = array("d")
+        self._slots: dict[str, int] = {}
+        self._free: list[int] = []
+
+    def add(self, key: str, state: Sequence[float] | None = None) -> None:
+        """Start estimating a room, optionally from saved state."""
+        if key in self._slots:
+            return
+        if state is None or len(state) != STRIDE:
+            state = _initial_state()
+        if self._free:
+            offset = self._free.pop()
+            self._data[offset : offset + STRIDE] = array("d", state)
+        else:
+            offset = len(self._data)
+            self._data.extend(state)
+        self._slots[key] = offset
+
+    def remove(self, key: str) -> None:
+        """Stop estimating a room, its place is reused."""
+        if (offset := self._slots.pop(key, None)) is not None:
+            self._free.append(offset)
+
+    def get_state(self, key: str) -> list[float] | None:
+        """State of a room for saving."""
+        if (offset := self._slots.get(key)) is None:
+            return None
+        return self._data[offset : offset + STRIDE].tolist()
+
+    def observe(
+        self, key: str, temperature: float, now: float, heat: bool, cool: bool
+    ) -> bool:
+        """Add temperature sample with the state of the unit from now on.
+
+        The interval since the previous sample is attributed to the state which
+        was given with it, time is a timestamp in seconds. Returns True if the
+        model is updated.
+        """
+        if (offset := self._slots.get(key)) is None:
+            return False
+        data = self._data
+        interval = now - data[offset + _TIME]
+        if 0 <= interval < MIN_INTERVAL:
+            if heat == data[offset + _HEAT] and cool == data[offset + _COOL]:
+                return False
+            """State changed, the short interval is dropped"""
+            interval = math.nan
+        updated = False
+        if MIN_INTERVAL <= interval <= MAX_INTERVAL:
+            x = (
+                1.0,
+                data[offset + _TEMPERATURE],
+                data[offset + _HEAT],
+                data[offset + _COOL],
+            )
+            y = (temperature - data[offset + _TEMPERATURE]) / (interval / 3600)
+            _update(data, offset, x, y)
+            data[offset + _SAMPLES] += 1
+            updated = True
+        data[offset + _TIME] = now
+        data[offset + _TEMPERATURE] = temperature
+        data[offset + _HEAT] = float(heat)
+        data[offset + _COOL] = float(cool)
+        return updated
+
+    def interrupt(self, key: str, heat: bool, cool: bool, now: float) -> None:
+        """Change the state of the unit between samples.
+
+        Interval with both states is dropped, unless it has just started.
+        """
+        if (offset := self._slots.get(key)) is None:
+            return
+        data = self._data
+        if heat == data[offset + _HEAT] and cool == data[offset + _COOL]:
+            return
+        if not 0 <= now - data[offset + _TIME] <= FRESH_SAMPLE:
+            data[offset + _TIME] = math.nan
+        data[offset + _HEAT] = float(heat)
+        data[offset + _COOL] = float(cool)
+
+    def estimate(self, key: str) -> ThermalEstimate | None:
+        """Learned response of a room, None until enough samples."""
+        if (offset := self._slots.get(key)) is None:
+            return None
+        data = self._data
+        samples = int(data[offset + _SAMPLES])
+        if samples < MIN_SAMPLES:
+            return None
+        drift = -data[offset + _THETA + 1]
+        return ThermalEstimate(
+            heating_rate=data[offset + _THETA + 2],
+            cooling_rate=-data[offset + _THETA + 3],
+            drift=drift,
+            ambient=data[offset + _THETA] / drift if drift > 1e-6 else None,
+            samples=samples,
+        )
+
+    def __len__(self) -> int:
+        """Number of rooms."""
+        return len(self._slots)
+
+
+def _initial_state() -> list[float]:
+    state = [0.0] * STRIDE
+    for index in range(PARAMETERS):
+        state[_COVARIANCE + index * PARAMETERS + index] = INITIAL_COVARIANCE
+    state[_TIME] = math.nan
+    return state
+
+
+def _update(data: array, offset: int, x: tuple[float, ...], y: float) -> None:
+    """One step of recursive least squares with forgetting, in place"""
+    theta = offset + _THETA
+    covariance = offset + _COVARIANCE
+    trace = sum(data[covariance + i * PARAMETERS + i] for i in range(PARAMETERS))
+    forgetting = FORGETTING if trace < MAX_COVARIANCE_TRACE else 1.0
+    px = [
+        sum(data[covariance + i * PARAMETERS + j] * x[j] for j in range(PARAMETERS))
+        for i in range(PARAMETERS)
+    ]
+    denominator = forgetting + sum(x[i] * px[i] for i in range(PARAMETERS))
+    gain = [value / denominator for value in px]
+    error = y - sum(data[theta + i] * x[i] for i in range(PARAMETERS))
+    for i in range(PARAMETERS):
+        data[theta + i] += gain[i] * error
+        for j in range(PARAMETERS):
+            index = covariance + i * PARAMETERS + j
+            data[index] = (data[index] - gain[i] * px[j]) / forgetting
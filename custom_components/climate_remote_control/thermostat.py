@@ -0,0 +1,129 @@
+"""Hysteresis loop which holds the unit off while the room needs nothing."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Self
+
+from homeassistant.components.climate import HVACMode
+
+from .const import (
+    CONF_HYSTERESIS,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
+    CONF_THERMOSTAT,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_MIN_CYCLE_TIME,
+)
+
+"""Modes which are switched by the loop, other modes run while selected"""
+CONTROLLED_MODES = {
+    HVACMode.COOL: 1,
+    HVACMode.HEAT: -1,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ThermostatOptions:
+    """Thermostat settings of a config entry."""
+
+    hysteresis: float = DEFAULT_HYSTERESIS
+    min_on_time: float = DEFAULT_MIN_CYCLE_TIME
+    min_off_time: float = DEFAULT_MIN_CYCLE_TIME
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self | None:
+        """Create from config entry options, None if the loop is disabled."""
+        if not (thermostat := options.get(CONF_THERMOSTAT)):
+            return None
+        return cls(
+            hysteresis=float(thermostat.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS)),
+            min_on_time=float(thermostat.get(CONF_MIN_ON_TIME, DEFAULT_MIN_CYCLE_TIME)),
+            min_off_time=float(
+                thermostat.get(CONF_MIN_OFF_TIME, DEFAULT_MIN_CYCLE_TIME)
+            ),
+        )
+
+
+class Thermostat:
+    """Running state of the unit in the selected HVAC mode.
+
+    The unit starts when the temperature leaves the band of hysteresis around
+    the target on the demand side and stops when it leaves the band on the other
+    side. Between them nothing is decided, so sensor noise doesn't send frames.
+    """
+
+    __slots__ = ("_hvac_mode", "_switched_at", "retry_at", "running")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.running = True
+        self._hvac_mode: HVACMode | None = None
+        self._switched_at = float("-inf")
+        """When a blocked switch is allowed by the minimal cycle time"""
+        self.retry_at: float | None = None
+
+    def restore(self, hvac_mode: HVACMode, running: bool | None) -> None:
+        """Continue the cycle which was running before restart."""
+        self._hvac_mode = hvac_mode
+        if running is not None:
+            self.running = running
+
+    def update(
+        self,
+        options: ThermostatOptions,
+        hvac_mode: HVACMode,
+        current: float | None,
+        target: float | None,
+        now: float,
+    ) -> bool | None:
+        """Evaluate the loop. Returns new running state if the unit is switched."""
+        self.retry_at = None
+        previous_mode, self._hvac_mode = self._hvac_mode, hvac_mode
+        if hvac_mode == HVACMode.OFF:
+            if previous_mode not in (None, HVACMode.OFF):
+                """Turning off by user ends the cycle"""
+                self.running = True
+                self._switched_at = now
+            return None
+        demand = self._get_demand(options, hvac_mode, current, target)
+        if previous_mode in (None, HVACMode.OFF):
+            """Turning on by user starts a cycle, the unit starts only on demand.
+
+            Without readings nothing can be decided, so the unit runs.
+            """
+            self.running = (
+                demand if demand is not None else current is None or target is None
+            )
+            if self.running:
+                self._switched_at = now
+            return None
+        if demand is None or demand == self.running:
+            return None
+        allowed_at = self._switched_at + (
+            options.min_on_time if self.running else options.min_off_time
+        )
+        if now < allowed_at:
+            self.retry_at = allowed_at
+            return None
+        self.running = demand
+        self._switched_at = now
+        return demand
+
+    def _get_demand(
+        self,
+        options: ThermostatOptions,
+        hvac_mode: HVACMode,
+        current: float | None,
+        target: float | None,
+    ) -> bool | None:
+        """Whether the unit should run, None inside the band"""
+        if (sign := CONTROLLED_MODES.get(hvac_mode)) is None:
+            return True
+        if current is None or target is None:
+            return None
+        error = (current - target) * sign
+        if error >= options.hysteresis:
+            return True
+        if error <= -options.hysteresis:
+            return False
+        return None
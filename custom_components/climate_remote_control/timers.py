@@ -0,0 +1,112 @@
+"""One timer for time-triggered jobs of all devices."""
+
+from collections.abc import Callable, Coroutine, Hashable
+from datetime import datetime
+import heapq
+import itertools
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+type TimerJob = Callable[[], Coroutine[Any, Any, None]]
+
+"""Jobs due within a millisecond of the timer run, its datetime rounds timestamps"""
+TIME_RESOLUTION = 0.001
+
+"""Queue is rebuilt when replaced entries outnumber live ones by this factor"""
+COMPACT_FACTOR = 2
+
+
+class TimerQueue:
+    """Jobs by key in a min-heap of fire times, only the earliest one is timed.
+
+    Rescheduling a key pushes a new entry, the old one stays in the heap until
+    it reaches the top or the heap is compacted, so each change is O(log n).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._jobs: dict[Hashable, tuple[tuple[float, int, Hashable], TimerJob]] = {}
+        self._counter = itertools.count()
+        self._armed_at: float | None = None
+        self._unsubscribe_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_schedule(self, key: Hashable, fire_at: float, job: TimerJob) -> None:
+        """Run job at timestamp, replacing the job of the key."""
+        scheduled = self._jobs.get(key)
+        if scheduled is not None and scheduled[0][0] == fire_at:
+            """Time didn't change, the heap is left as it is"""
+            self._jobs[key] = (scheduled[0], job)
+            return
+        entry = (fire_at, next(self._counter), key)
+        self._jobs[key] = (entry, job)
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > COMPACT_FACTOR * len(self._jobs) + 1:
+            self._heap = [entry for entry, _job in self._jobs.values()]
+            heapq.heapify(self._heap)
+        self._async_arm()
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Drop the job of the key."""
+        if self._jobs.pop(key, None) is not None:
+            self._async_arm()
+
+    def get_fire_time(self, key: Hashable) -> float | None:
+        """Timestamp when the job of the key runs."""
+        if (scheduled := self._jobs.get(key)) is None:
+            return None
+        return scheduled[0][0]
+
+    def __len__(self) -> int:
+        """Number of scheduled jobs."""
+        return len(self._jobs)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Time the earliest live entry"""
+        heap = self._heap
+        while heap and self._jobs.get(heap[0][2], (None,))[0] != heap[0]:
+            heapq.heappop(heap)
+        fire_at = heap[0][0] if heap else None
+        if fire_at == self._armed_at:
+            return
+        if self._unsubscribe_timer is not None:
+            self._unsubscribe_timer()
+            self._unsubscribe_timer = None
+        self._armed_at = fire_at
+        if fire_at is not None:
+            self._unsubscribe_timer = async_track_point_in_utc_time(
+                self.hass, self._async_fire, dt_util.utc_from_timestamp(fire_at)
+            )
+
+    @callback
+    def _async_fire(self, fired_at: datetime) -> None:
+        self._unsubscribe_timer = None
+        self._armed_at = None
+        now = fired_at.timestamp() + TIME_RESOLUTION
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            scheduled = self._jobs.get(entry[2])
+            if scheduled is None or scheduled[0] != entry:
+                continue
+            del self._jobs[entry[2]]
+            _LOGGER.debug("Running timer job %s", entry[2])
+            self.hass.async_create_task(scheduled[1]())
+        self._async_arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop all jobs."""
+        self._jobs.clear()
+        self._heap.clear()
+        self._async_arm()
@@ -53,6 +53,8 @@ from custom_components.climate_remote_control.const import (
     TemperatureMode,
 )
 
+from .fake_remote import FakeRemote
+
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
@@ -149,3 +151,9 @@ async def climate_remote_control(
     climate = devices[0]
     climate.hass = hass
     return climate
+
+
+@pytest.fixture
+def fake_remote(hass: HomeAssistant) -> FakeRemote:
+    """Fixture that registers remote.send_command of fake IR blasters."""
+    return FakeRemote(hass).register()
@@ -0,0 +1,123 @@
+"""Stand-in for IR blasters which are called by remote.send_command."""
+
+import asyncio
+from collections.abc import Container
+import random
+import re
+
+from homeassistant.components.climate import ATTR_FAN_MODE, HVACMode
+from homeassistant.components.remote import (
+    ATTR_DEVICE,
+    ATTR_NUM_REPEATS,
+    SERVICE_SEND_COMMAND,
+)
+from homeassistant.const import (
+    ATTR_COMMAND,
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, ServiceCall, State
+
+"""Splits grouped command "mode:fan_only_fan:low" into attribute commands"""
+_GROUP_SEPARATOR = re.compile(r"_(?=(?:mode|fan|swing|preset|temp|temprange|humid):)")
+
+
+class FakeRemote:
+    """Remote integration with air time, serialization per blaster and failures.
+
+    Each frame occupies the blaster for air_time seconds. Calls to one blaster
+    are transmitted one by one and calls which arrive while the blaster is busy
+    are counted as overlaps. Transmitted frames are applied to the state of the
+    device, unless they are dropped in the air. Unknown codes raise ValueError
+    like Broadlink does, hanging calls never return.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        air_time: float = 0.001,
+        drop_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        codes: Container[str] | None = None,
+        seed: int = 0,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.air_time = air_time
+        self.drop_rate = drop_rate
+        self.hang_rate = hang_rate
+        self.codes = codes
+        self.random = random.Random(seed)
+        self.frames = 0
+        self.dropped = 0
+        self.hangs = 0
+        self.overlaps = 0
+        self.busy_time: dict[str, float] = {}
+        self.devices: dict[str, dict[str, str]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def register(self) -> "FakeRemote":
+        """Register remote.send_command service."""
+        self.hass.services.async_register(
+            Platform.REMOTE, SERVICE_SEND_COMMAND, self._async_send_command
+        )
+        return self
+
+    async def _async_send_command(self, call: ServiceCall) -> None:
+        commands = call.data[ATTR_COMMAND]
+        if isinstance(commands, str):
+            commands = [commands]
+        if self.codes is not None:
+            for command in commands:
+                if command not in self.codes:
+                    raise ValueError(f"Command not found: {command}")
+        device = call.data.get(ATTR_DEVICE)
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            lock = self._locks.setdefault(entity_id, asyncio.Lock())
+            if lock.locked():
+                self.overlaps += 1
+            async with lock:
+                if self.random.random() < self.hang_rate:
+                    self.hangs += 1
+                    await asyncio.Event().wait()
+                await self._async_transmit(
+                    entity_id, device, commands, call.data.get(ATTR_NUM_REPEATS, 1)
+                )
+
+    async def _async_transmit(
+        self, entity_id: str, device: str | None, commands: list[str], repeats: int
+    ) -> None:
+        for command in commands:
+            for _ in range(repeats):
+                await asyncio.sleep(self.air_time)
+                self.frames += 1
+                self.busy_time[entity_id] = (
+                    self.busy_time.get(entity_id, 0.0) + self.air_time
+                )
+                if self.random.random() < self.drop_rate:
+                    self.dropped += 1
+                    continue
+                self._apply(device, command)
+
+    def _apply(self, device: str | None, command: str) -> None:
+        """Change state of the device like the air conditioner would do."""
+        state = self.devices.setdefault(device, {"power": "off"})
+        if command in ("on", "off"):
+            state["power"] = command
+            return
+        for part in _GROUP_SEPARATOR.split(command):
+            key, _, value = part.partition(":")
+            state[key] = value
+
+    def is_delivered(self, device: str, state: State) -> bool:
+        """Whether the device has the state of the climate entity."""
+        device_state = self.devices.get(device, {"power": "off"})
+        if state.state == HVACMode.OFF:
+            return device_state["power"] == "off"
+        return device_state == {
+            "power": "on",
+            "mode": state.state,
+            "fan": state.attributes[ATTR_FAN_MODE],
+            "temp": str(state.attributes[ATTR_TEMPERATURE]),
+        }
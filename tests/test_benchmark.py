@@ -0,0 +1,329 @@
+"""Benchmarks of command generation.
+
+Benchmarks are disabled in regular runs and executed once as tests. Compare with
+the stored baseline:
+pytest tests/test_benchmark.py --benchmark-enable --benchmark-compare
+--benchmark-compare-fail=mean:25%
+"""
+
+from collections.abc import Callable
+import dataclasses
+import itertools
+import time
+import tracemalloc
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HUMIDITY,
+    ATTR_HVAC_MODE,
+    ATTR_SWING_MODE,
+    SERVICE_SET_TEMPERATURE,
+    ClimateEntity,
+    ClimateEntityFeature,
+    HVACMode,
+)
+from homeassistant.components.recorder.db_schema import ALL_DOMAIN_EXCLUDE_ATTRS
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    CONF_NAME,
+    CONF_UNIQUE_ID,
+    EVENT_STATE_CHANGED,
+    Platform,
+)
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, State
+from homeassistant.helpers.entity_component import async_update_entity
+from homeassistant.helpers.json import json_bytes
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.climate_remote_control.climate import RestoreAcRemote
+from custom_components.climate_remote_control.config import (
+    EntryConfig,
+    ModeConfig,
+    TemperatureConfig,
+)
+from custom_components.climate_remote_control.const import (
+    ATTR_TEMPERATURE_RANGE,
+    DATA_CONFIG,
+    DOMAIN,
+    SwingMode,
+    TemperatureMode,
+)
+
+from .fake_remote import FakeRemote
+
+GROUPINGS = {
+    "none": (),
+    "mode": (ATTR_HVAC_MODE,),
+    "mode_fan_temp": (ATTR_HVAC_MODE, ATTR_FAN_MODE, ATTR_TEMPERATURE),
+    "all": (
+        ATTR_HVAC_MODE,
+        ATTR_FAN_MODE,
+        ATTR_SWING_MODE,
+        ATTR_TEMPERATURE,
+        ATTR_TEMPERATURE_RANGE,
+        ATTR_HUMIDITY,
+    ),
+}
+
+ATTRIBUTES = [
+    ATTR_HVAC_MODE,
+    ATTR_FAN_MODE,
+    ATTR_SWING_MODE,
+    ATTR_TEMPERATURE,
+    ATTR_TEMPERATURE_RANGE,
+    ATTR_HUMIDITY,
+]
+
+
+@pytest.fixture(
+    params=list(itertools.product(GROUPINGS, (False, True))),
+    ids=lambda x: f"{x[0]}-{'sequence' if x[1] else 'string'}",
+)
+def grouped_climate(
+    request: pytest.FixtureRequest, climate_remote_control: RestoreAcRemote
+) -> RestoreAcRemote:
+    """Climate with one of grouping configurations, as a string or as a sequence."""
+    grouping, as_sequence = request.param
+    climate_remote_control._config = dataclasses.replace(
+        climate_remote_control._config,
+        swing_mode=SwingMode.STATE,
+        swing_modes=("vertical", "horizontal"),
+        grouping_attributes=GROUPINGS[grouping],
+        grouping_attributes_as_sequence=as_sequence,
+    )
+    climate_remote_control._attr_hvac_mode = HVACMode.HEAT
+    climate_remote_control._apply_profile()
+    climate_remote_control._attr_target_temperature_low = 20.0
+    climate_remote_control._attr_target_temperature_high = 24.0
+    climate_remote_control._attr_target_humidity = 50
+    return climate_remote_control
+
+
+@pytest.mark.benchmark(group="get_commands")
+@pytest.mark.parametrize("key", ATTRIBUTES)
+async def test_get_commands(
+    benchmark: BenchmarkFixture, grouped_climate: RestoreAcRemote, key: str
+):
+    commands = benchmark(grouped_climate._get_commands, key)
+    assert len(commands) >= 1
+
+
+@pytest.mark.benchmark(group="get_attr_command")
+@pytest.mark.parametrize("key", ATTRIBUTES)
+async def test_get_attr_command(
+    benchmark: BenchmarkFixture, climate_remote_control: RestoreAcRemote, key: str
+):
+    climate_remote_control._attr_target_temperature_low = 20.0
+    climate_remote_control._attr_target_temperature_high = 24.0
+    climate_remote_control._attr_target_humidity = 50
+    assert benchmark(climate_remote_control._get_attr_command, key)
+
+
+@pytest.mark.benchmark(group="get_grouping_attributes")
+async def test_get_grouping_attributes(
+    benchmark: BenchmarkFixture, grouped_climate: RestoreAcRemote
+):
+    grouping_attributes = benchmark(grouped_climate._get_grouping_attributes)
+    assert set(grouping_attributes) <= set(grouped_climate._config.grouping_attributes)
+
+
+@pytest.mark.benchmark(group="apply_profile")
+@pytest.mark.parametrize("mode", list(TemperatureMode))
+async def test_apply_profile(
+    benchmark: BenchmarkFixture,
+    climate_remote_control: RestoreAcRemote,
+    mode: TemperatureMode,
+):
+    climate_remote_control._config = dataclasses.replace(
+        climate_remote_control._config,
+        hvac_modes={HVACMode.HEAT: ModeConfig(TemperatureConfig(mode, 16, 30))},
+    )
+    climate_remote_control._attr_hvac_mode = HVACMode.HEAT
+    benchmark(climate_remote_control._apply_profile)
+    if mode == TemperatureMode.NONE:
+        assert not (
+            climate_remote_control._attr_supported_features
+            & ClimateEntityFeature.TARGET_TEMPERATURE
+        )
+    else:
+        assert climate_remote_control._attr_max_temp == 30
+
+
+@pytest.mark.benchmark(group="command_space")
+async def test_command_space(
+    benchmark: BenchmarkFixture, grouped_climate: RestoreAcRemote
+):
+    """Generate commands for every combination of the grouped attributes."""
+    hvac_modes = [x for x in grouped_climate.hvac_modes if x != HVACMode.OFF]
+    fan_modes = grouped_climate.fan_modes
+    swing_modes = grouped_climate.swing_modes
+    temperatures = [
+        float(x)
+        for x in range(int(grouped_climate.min_temp), int(grouped_climate.max_temp) + 1)
+    ]
+    space = list(itertools.product(hvac_modes, fan_modes, swing_modes, temperatures))
+
+    def _enumerate() -> set[tuple[str, ...]]:
+        commands = set()
+        for hvac_mode, fan_mode, swing_mode, temperature in space:
+            grouped_climate._attr_hvac_mode = hvac_mode
+            grouped_climate._attr_fan_mode = fan_mode
+            grouped_climate._attr_swing_mode = swing_mode
+            grouped_climate._attr_target_temperature = temperature
+            commands.add(tuple(grouped_climate._get_commands(ATTR_HVAC_MODE)))
+        return commands
+
+    commands = benchmark(_enumerate)
+    grouping_attributes = grouped_climate._get_grouping_attributes()
+    expected = 1
+    for key, values in (
+        (ATTR_HVAC_MODE, hvac_modes),
+        (ATTR_FAN_MODE, fan_modes),
+        (ATTR_SWING_MODE, swing_modes),
+        (ATTR_TEMPERATURE, temperatures),
+    ):
+        if key in grouping_attributes or (
+            key == ATTR_HVAC_MODE and not grouping_attributes
+        ):
+            expected *= len(values)
+    assert len(commands) == expected
+
+
+@pytest.mark.parametrize("entries", [1000])
+async def test_entity_memory(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    record_property,
+    entries: int,
+):
+    """Memory of climate entities with their parsed options."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entities = [
+        RestoreAcRemote(config_entry, EntryConfig.from_options(config_entry.options))
+        for _ in range(entries)
+    ]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(x.size_diff for x in after.compare_to(before, "filename"))
+    record_property("bytes_per_entity", size / len(entities))
+    assert size / len(entities) < 10_000
+
+
+async def test_setup_entries(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    record_property,
+    request: pytest.FixtureRequest,
+):
+    """Setup time of many config entries.
+
+    Thousand entries are set up only when benchmarks are enabled.
+    """
+    entries = 50 if request.config.getoption("benchmark_disable") else 1000
+    for index in range(1, entries):
+        MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=f"ac_{index}",
+            title=f"ac_{index}",
+            data={CONF_UNIQUE_ID: f"ac_{index}", CONF_NAME: f"ac_{index}"},
+            options=config_entry.options,
+        ).add_to_hass(hass)
+    start = time.monotonic()
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    setup_time = time.monotonic() - start
+    record_property("setup_time", setup_time)
+    record_property("setup_time_per_entry", setup_time / entries)
+    assert len(hass.states.async_entity_ids(Platform.CLIMATE)) == entries
+    assert len(hass.data[DOMAIN][DATA_CONFIG]) == entries
+
+
+def _recorded_bytes(
+    events: list[Event[EventStateChangedData]], exclude: Callable[[State], set[str]]
+) -> int:
+    """Bytes of states and distinct attributes, recorder stores equal attributes once"""
+    shared_attrs: set[bytes] = set()
+    size = 0
+    for event in events:
+        state = event.data["new_state"]
+        size += len(state.entity_id) + len(state.state)
+        shared_attrs.add(
+            json_bytes(
+                {k: v for k, v in state.attributes.items() if k not in exclude(state)}
+            )
+        )
+    return size + sum(len(x) for x in shared_attrs)
+
+
+async def test_recorder_bytes_per_day(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_remote: FakeRemote,
+    record_property,
+):
+    """Recorder load of a fleet during a day of sensor updates and hourly commands.
+
+    Before excludes only attributes which climate and sensor components leave
+    unrecorded, after also excludes attributes declared by the integration.
+    """
+    entries, updates_per_hour = 10, 12
+    for index in range(1, entries):
+        MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=f"ac_{index}",
+            title=f"ac_{index}",
+            data={CONF_UNIQUE_ID: f"ac_{index}", CONF_NAME: f"ac_{index}"},
+            options=config_entry.options,
+        ).add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    climate_ids = hass.states.async_entity_ids(Platform.CLIMATE)
+    sensor_ids = [
+        x for x in hass.states.async_entity_ids(Platform.SENSOR) if "latency" in x
+    ]
+
+    events: list[Event[EventStateChangedData]] = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, events.append)
+    for hour in range(24):
+        await hass.services.async_call(
+            Platform.CLIMATE,
+            SERVICE_SET_TEMPERATURE,
+            {ATTR_ENTITY_ID: climate_ids, ATTR_TEMPERATURE: 20 + hour % 8},
+            blocking=True,
+        )
+        for update in range(updates_per_hour):
+            hass.states.async_set(
+                "sensor.sensor_temperature", 20 + (hour + update) % 30 / 10
+            )
+            await hass.async_block_till_done()
+        for entity_id in sensor_ids:
+            await async_update_entity(hass, entity_id)
+    events = [
+        x
+        for x in events
+        if x.data["new_state"] is not None
+        and x.data["entity_id"] in {*climate_ids, *sensor_ids}
+    ]
+
+    component_unrecorded = {
+        Platform.CLIMATE: ClimateEntity._entity_component_unrecorded_attributes,
+        Platform.SENSOR: SensorEntity._entity_component_unrecorded_attributes,
+    }
+    before = _recorded_bytes(
+        events,
+        lambda state: ALL_DOMAIN_EXCLUDE_ATTRS | component_unrecorded[state.domain],
+    )
+    after = _recorded_bytes(
+        events,
+        lambda state: ALL_DOMAIN_EXCLUDE_ATTRS
+        | state.state_info["unrecorded_attributes"],
+    )
+    record_property("recorder_bytes_per_day_before", before)
+    record_property("recorder_bytes_per_day_after", after)
+    assert after < before
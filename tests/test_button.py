@@ -2,7 +2,7 @@ import logging
 
 from homeassistant.components.climate import SWING_VERTICAL
 from homeassistant.components.remote import SERVICE_SEND_COMMAND
-from homeassistant.const import ATTR_ENTITY_ID, CONF_DEVICE, CONF_TARGET, Platform
+from homeassistant.const import ATTR_ENTITY_ID, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry
 from homeassistant.setup import async_setup_component
@@ -37,16 +37,13 @@ async def test_setup(
 async def test_none_mode(
     hass: HomeAssistant,
     mocker: MockerFixture,
-    config_entry_unique_id: str,
+    config_entry: MockConfigEntry,
 ):
     """Test button with none mode"""
-    config_entry = MockConfigEntry(
-        domain=DOMAIN,
-        unique_id=config_entry_unique_id,
-        title="name_test",
-        options={
-            CONF_DEVICE: "test",
-            CONF_TARGET: {ATTR_ENTITY_ID: ["remote.entity_id_test"]},
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {
             CONF_SWING: {
                 CONF_MODE: SwingMode.NONE,
             },
@@ -63,16 +60,13 @@ async def test_none_mode(
 async def test_toggle_mode(
     hass: HomeAssistant,
     mocker: MockerFixture,
-    config_entry_unique_id: str,
+    config_entry: MockConfigEntry,
 ):
     """Test button with toggle mode"""
-    config_entry = MockConfigEntry(
-        domain=DOMAIN,
-        unique_id=config_entry_unique_id,
-        title="name_test",
-        options={
-            CONF_DEVICE: "test",
-            CONF_TARGET: {ATTR_ENTITY_ID: ["remote.entity_id_test"]},
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {
             CONF_SWING: {
                 CONF_MODE: SwingMode.TOGGLE,
                 CONF_MODES: [
@@ -93,16 +87,13 @@ async def test_toggle_mode(
 async def test_state_mode(
     hass: HomeAssistant,
     mocker: MockerFixture,
-    config_entry_unique_id: str,
+    config_entry: MockConfigEntry,
 ):
     """Test button with state mode"""
-    config_entry = MockConfigEntry(
-        domain=DOMAIN,
-        unique_id=config_entry_unique_id,
-        title="name_test",
-        options={
-            CONF_DEVICE: "test",
-            CONF_TARGET: {ATTR_ENTITY_ID: ["remote.entity_id_test"]},
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {
             CONF_SWING: {
                 CONF_MODE: SwingMode.STATE,
             },
@@ -1,4 +1,6 @@
+import dataclasses
 import logging
+from typing import Any
 from unittest.mock import patch
 
 from _pytest.logging import LogCaptureFixture
@@ -11,6 +13,7 @@ from homeassistant.components.climate import (
     ATTR_TARGET_TEMP_HIGH,
     ATTR_TARGET_TEMP_LOW,
 )
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
 from homeassistant.components.climate import (
     FAN_LOW,
     FAN_MEDIUM,
@@ -22,7 +25,6 @@ from homeassistant.components.climate import (
     ClimateEntityFeature,
     HVACMode,
 )
-from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
 from homeassistant.components.remote import (
     ATTR_DELAY_SECS,
     ATTR_DEVICE,
@@ -30,8 +32,17 @@ from homeassistant.components.remote import (
     ATTR_NUM_REPEATS,
     SERVICE_SEND_COMMAND,
 )
-from homeassistant.const import ATTR_COMMAND, ATTR_ENTITY_ID, ATTR_TEMPERATURE, Platform
+from homeassistant.const import (
+    ATTR_COMMAND,
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    Platform,
+)
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import entity_registry
 from homeassistant.setup import async_setup_component
 import pytest
@@ -41,16 +52,25 @@ from pytest_homeassistant_custom_component.common import (
 )
 
 from custom_components.climate_remote_control.climate import RestoreAcRemote
+from custom_components.climate_remote_control.config import (
+    ModeConfig,
+    TemperatureConfig,
+)
 from custom_components.climate_remote_control.const import (
+    ATTR_PENDING,
     ATTR_TEMPERATURE_RANGE,
     CONF_CAN_DISABLE_ENTITY_FEATURES,
-    CONF_MAX,
-    CONF_MIN,
-    CONF_MODE,
     CONF_TEMPERATURE,
     DOMAIN,
     TemperatureMode,
 )
+from custom_components.climate_remote_control.delivery import Priority
+
+
+def _replace_config(climate: RestoreAcRemote, **changes: Any) -> None:
+    climate._config = dataclasses.replace(climate._config, **changes)
+    if climate._attr_hvac_mode in climate._config.profiles:
+        climate._apply_profile()
 
 
 async def test_setup(
@@ -110,88 +130,135 @@ async def test_get_attr_command(
     assert climate_remote_control._get_attr_command("dummy_command") == ""
 
 
-async def test_get_temperature_conf(
+async def test_profile_temperature(
     climate_remote_control: RestoreAcRemote,
 ):
-    climate_remote_control._hvac_modes_conf = {
-        HVACMode.OFF: {
-            ATTR_TEMPERATURE: {
-                CONF_MODE: TemperatureMode.NONE,
-            },
-        },
-        HVACMode.HEAT: {
-            ATTR_TEMPERATURE: {
-                CONF_MODE: TemperatureMode.TARGET,
-                CONF_MIN: 11.0,
-                CONF_MAX: 21.0,
-            }
+    _replace_config(
+        climate_remote_control,
+        hvac_modes={
+            HVACMode.OFF: ModeConfig(TemperatureConfig(TemperatureMode.NONE)),
+            HVACMode.HEAT: ModeConfig(
+                TemperatureConfig(TemperatureMode.TARGET, 11.0, 21.0)
+            ),
+            HVACMode.COOL: ModeConfig(),
         },
-        HVACMode.COOL: {},
-    }
+    )
     climate_remote_control._attr_hvac_mode = HVACMode.OFF
-    temperature_conf = climate_remote_control._get_temperature_conf()
-    assert temperature_conf == {CONF_MODE: TemperatureMode.NONE}
+    profile = climate_remote_control._profile
+    assert profile.temperature == TemperatureConfig(TemperatureMode.NONE)
 
     climate_remote_control._attr_hvac_mode = HVACMode.HEAT
-    temperature_conf = climate_remote_control._get_temperature_conf()
-    assert temperature_conf == {
-        CONF_MODE: TemperatureMode.TARGET,
-        CONF_MIN: 11.0,
-        CONF_MAX: 21.0,
-    }
+    profile = climate_remote_control._profile
+    assert profile.temperature == TemperatureConfig(TemperatureMode.TARGET, 11.0, 21.0)
 
     climate_remote_control._attr_hvac_mode = HVACMode.COOL
-    temperature_conf = climate_remote_control._get_temperature_conf()
-    assert temperature_conf == {
-        CONF_MODE: TemperatureMode.TARGET,
-        CONF_MIN: 18.0,
-        CONF_MAX: 28.0,
-    }
+    profile = climate_remote_control._profile
+    assert profile.temperature == TemperatureConfig(TemperatureMode.TARGET, 18.0, 28.0)
 
 
 async def test_get_grouping_attributes(
     climate_remote_control: RestoreAcRemote,
 ):
     # all attributes
-    climate_remote_control._grouping_attributes = [
-        ATTR_HVAC_MODE,
-        ATTR_TEMPERATURE,
-        ATTR_FAN_MODE,
-        ATTR_HUMIDITY,
-        ATTR_SWING_MODE,
-    ]
-    climate_remote_control._attr_swing_modes = []
-    climate_remote_control._attr_supported_features = ClimateEntityFeature(0)
-    climate_remote_control._attr_fan_modes = [FAN_LOW, FAN_MEDIUM]
-    assert climate_remote_control._get_grouping_attributes() == [
+    climate_remote_control._attr_hvac_mode = HVACMode.HEAT
+    _replace_config(
+        climate_remote_control,
+        grouping_attributes=(
+            ATTR_HVAC_MODE,
+            ATTR_TEMPERATURE,
+            ATTR_FAN_MODE,
+            ATTR_HUMIDITY,
+            ATTR_SWING_MODE,
+        ),
+        hvac_modes={HVACMode.HEAT: ModeConfig(TemperatureConfig(TemperatureMode.NONE))},
+        swing_modes=(),
+    )
+    assert climate_remote_control._get_grouping_attributes() == (
         ATTR_HVAC_MODE,
         ATTR_FAN_MODE,
-    ]
+    )
 
     # remove fan modes
-    climate_remote_control._attr_fan_modes = []
-    climate_remote_control._attr_supported_features = (
-        ClimateEntityFeature(0)
-        | ClimateEntityFeature.TARGET_TEMPERATURE
-        | ClimateEntityFeature.TARGET_HUMIDITY
+    _replace_config(
+        climate_remote_control,
+        hvac_modes={HVACMode.HEAT: ModeConfig(fan_modes=())},
     )
-    assert climate_remote_control._get_grouping_attributes() == [
+    assert climate_remote_control._get_grouping_attributes() == (
         ATTR_HVAC_MODE,
         ATTR_TEMPERATURE,
-        ATTR_HUMIDITY,
-    ]
+    )
 
     # test target temperature range
-    climate_remote_control._grouping_attributes = [
-        ATTR_HVAC_MODE,
-        ATTR_TEMPERATURE_RANGE,
-        ATTR_FAN_MODE,
-        ATTR_HUMIDITY,
-    ]
-    climate_remote_control._attr_supported_features = ClimateEntityFeature(0)
-    assert climate_remote_control._get_grouping_attributes() == [
-        ATTR_HVAC_MODE,
-    ]
+    _replace_config(
+        climate_remote_control,
+        grouping_attributes=(
+            ATTR_HVAC_MODE,
+            ATTR_TEMPERATURE_RANGE,
+            ATTR_FAN_MODE,
+            ATTR_HUMIDITY,
+        ),
+        hvac_modes={
+            HVACMode.HEAT: ModeConfig(TemperatureConfig(TemperatureMode.NONE), ())
+        },
+    )
+    assert climate_remote_control._get_grouping_attributes() == (ATTR_HVAC_MODE,)
+
+
+async def test_mode_without_fan(
+    hass: HomeAssistant,
+    climate_remote_control: RestoreAcRemote,
+):
+    """Fan isn't sent and isn't shown in dry mode of the unit"""
+    calls = async_mock_service(
+        hass=hass,
+        domain=Platform.REMOTE,
+        service=SERVICE_SEND_COMMAND,
+    )
+    climate_remote_control._attr_hvac_mode = HVACMode.COOL
+    _replace_config(
+        climate_remote_control,
+        hvac_modes=climate_remote_control._config.hvac_modes
+        | {HVACMode.DRY: ModeConfig(fan_modes=())},
+    )
+    climate_remote_control._attr_fan_mode = FAN_MEDIUM
+
+    await climate_remote_control.async_set_hvac_mode(HVACMode.DRY)
+
+    assert calls[-1].data[ATTR_COMMAND] == ["mode:dry_temp:18"]
+    assert not (
+        climate_remote_control.supported_features & ClimateEntityFeature.FAN_MODE
+    )
+    assert climate_remote_control._attr_fan_modes == []
+    with pytest.raises(ServiceValidationError):
+        await climate_remote_control.async_apply_state({ATTR_FAN_MODE: FAN_LOW})
+
+    await climate_remote_control.async_set_hvac_mode(HVACMode.COOL)
+
+    assert calls[-1].data[ATTR_COMMAND] == ["mode:cool_fan:medium_temp:18"]
+    assert climate_remote_control.supported_features & ClimateEntityFeature.FAN_MODE
+
+
+async def test_mode_with_fan_subset(
+    hass: HomeAssistant,
+    climate_remote_control: RestoreAcRemote,
+):
+    async_mock_service(
+        hass=hass,
+        domain=Platform.REMOTE,
+        service=SERVICE_SEND_COMMAND,
+    )
+    climate_remote_control._attr_hvac_mode = HVACMode.COOL
+    _replace_config(
+        climate_remote_control,
+        hvac_modes=climate_remote_control._config.hvac_modes
+        | {HVACMode.FAN_ONLY: ModeConfig(fan_modes=(FAN_LOW,))},
+    )
+    climate_remote_control._attr_fan_mode = FAN_MEDIUM
+
+    await climate_remote_control.async_set_hvac_mode(HVACMode.FAN_ONLY)
+
+    assert climate_remote_control._attr_fan_modes == [FAN_LOW]
+    assert climate_remote_control._attr_fan_mode == FAN_LOW
 
 
 async def test_get_command_in_grouping_attributes(
@@ -217,12 +284,11 @@ async def test_change_attribute_in_grouping_attributes_with_sequence_mode(
     hass: HomeAssistant,
     climate_remote_control: RestoreAcRemote,
 ):
-    climate_remote_control._grouping_attributes = [
-        ATTR_HVAC_MODE,
-        ATTR_FAN_MODE,
-        ATTR_TEMPERATURE,
-    ]
-    climate_remote_control._grouping_attributes_as_sequence = True
+    _replace_config(
+        climate_remote_control,
+        grouping_attributes=(ATTR_HVAC_MODE, ATTR_FAN_MODE, ATTR_TEMPERATURE),
+        grouping_attributes_as_sequence=True,
+    )
     climate_remote_control._attr_hvac_mode = HVACMode.HEAT
     climate_remote_control._attr_fan_mode = FAN_LOW
     climate_remote_control._attr_target_temperature = 21.0
@@ -297,7 +363,9 @@ async def test_set_swing_mode(
         ) as mock_async_call_remote_command,
     ):
         await climate_remote_control.async_set_swing_mode(SWING_VERTICAL)
-        mock_async_call_remote_command.assert_called_once_with(["test_command"])
+        mock_async_call_remote_command.assert_called_once_with(
+            ["test_command"], priority=Priority.SWING
+        )
 
 
 async def test_set_target_temperature(
@@ -456,7 +524,9 @@ async def test_set_hvac_mode_set_off(
         attribute="_async_call_remote_command",
     ) as mock_async_call_remote_command:
         await climate_remote_control.async_set_hvac_mode(HVACMode.OFF)
-        mock_async_call_remote_command.assert_called_once_with(["off"])
+        mock_async_call_remote_command.assert_called_once_with(
+            ["off"], priority=Priority.OFF
+        )
 
 
 async def test_filling_temperature_attributes_without_temperature(
@@ -469,9 +539,11 @@ async def test_filling_temperature_attributes_without_temperature(
         service=SERVICE_SEND_COMMAND,
     )
     climate_remote_control._attr_hvac_mode = HVACMode.COOL
-    climate_remote_control._hvac_modes_conf[HVACMode.HEAT][CONF_TEMPERATURE] = {
-        CONF_MODE: TemperatureMode.NONE,
-    }
+    _replace_config(
+        climate_remote_control,
+        hvac_modes=climate_remote_control._config.hvac_modes
+        | {HVACMode.HEAT: ModeConfig(TemperatureConfig(TemperatureMode.NONE))},
+    )
 
     await climate_remote_control.async_set_hvac_mode(HVACMode.HEAT)
 
@@ -492,11 +564,11 @@ async def test_filling_temperature_attributes_with_temperature_range(
         service=SERVICE_SEND_COMMAND,
     )
     climate_remote_control._attr_hvac_mode = HVACMode.COOL
-    climate_remote_control._hvac_modes_conf[HVACMode.HEAT][CONF_TEMPERATURE] = {
-        CONF_MODE: TemperatureMode.RANGE,
-        CONF_MIN: 20,
-        CONF_MAX: 30,
-    }
+    _replace_config(
+        climate_remote_control,
+        hvac_modes=climate_remote_control._config.hvac_modes
+        | {HVACMode.HEAT: ModeConfig(TemperatureConfig(TemperatureMode.RANGE, 20, 30))},
+    )
 
     await climate_remote_control.async_set_hvac_mode(HVACMode.HEAT)
 
@@ -505,6 +577,10 @@ async def test_filling_temperature_attributes_with_temperature_range(
         & ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
         == ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
     )
+    assert not (
+        climate_remote_control._attr_supported_features
+        & ClimateEntityFeature.TARGET_TEMPERATURE
+    )
     assert climate_remote_control._attr_target_temperature_low == 20
     assert climate_remote_control._attr_target_temperature_high == 20
 
@@ -580,3 +656,63 @@ async def test_restoring_temperature_state(
     await hass.config_entries.async_reload(config_entry.entry_id)
 
     assert hass.states.get("climate.name_test").attributes.get(CONF_TEMPERATURE) == 20
+
+
+async def test_get_state_commands(
+    climate_remote_control: RestoreAcRemote,
+):
+    climate_remote_control._attr_hvac_mode = HVACMode.OFF
+    assert climate_remote_control._get_state_commands() == [(["off"], True)]
+
+    climate_remote_control._attr_hvac_mode = HVACMode.HEAT
+    climate_remote_control._attr_fan_mode = FAN_MEDIUM
+    climate_remote_control._attr_target_temperature = 20.0
+    assert climate_remote_control._get_state_commands() == [
+        (["on"], False),
+        (["mode:heat_fan:medium_temp:20.0"], True),
+    ]
+
+    _replace_config(climate_remote_control, grouping_attributes=())
+    assert climate_remote_control._get_state_commands() == [
+        (["on"], False),
+        (["mode:heat"], True),
+        (["fan:medium"], True),
+        (["temp:20.0"], True),
+    ]
+
+
+async def test_postpone_commands_while_remote_is_unavailable(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    remote_entity_id: str,
+):
+    send_command_service_calls = async_mock_service(
+        hass=hass,
+        domain=Platform.REMOTE,
+        service=SERVICE_SEND_COMMAND,
+    )
+    hass.states.async_set(remote_entity_id, STATE_UNAVAILABLE)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+
+    for temperature in (20, 21, 22):
+        await hass.services.async_call(
+            domain=CLIMATE_DOMAIN,
+            service=SERVICE_SET_TEMPERATURE,
+            service_data={ATTR_TEMPERATURE: temperature},
+            target={ATTR_ENTITY_ID: "climate.name_test"},
+            blocking=True,
+        )
+    assert len(send_command_service_calls) == 0
+    assert hass.states.get("climate.name_test").attributes[ATTR_PENDING] is True
+
+    hass.states.async_set(remote_entity_id, STATE_ON)
+    await hass.async_block_till_done()
+
+    assert len(send_command_service_calls) == 1
+    assert send_command_service_calls[0].data[ATTR_COMMAND] == ["off"]
+    assert hass.states.get("climate.name_test").attributes[ATTR_PENDING] is False
+
+    hass.states.async_set(remote_entity_id, STATE_OFF)
+    await hass.async_block_till_done()
+    assert len(send_command_service_calls) == 1
@@ -0,0 +1,240 @@
+import base64
+import json
+from pathlib import Path
+
+from homeassistant.components.climate import (
+    FAN_HIGH,
+    FAN_LOW,
+    SWING_OFF,
+    SWING_VERTICAL,
+    HVACMode,
+)
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_COMMAND, Platform
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+from pytest_mock import MockerFixture
+
+from custom_components.climate_remote_control.climate import (
+    RestoreAcRemote,
+)
+from custom_components.climate_remote_control.climate import (
+    async_setup_entry as climate_async_setup_entry,
+)
+from custom_components.climate_remote_control.codes import (
+    CodeFileError,
+    CodeTable,
+    compile_code_file,
+)
+from custom_components.climate_remote_control.const import CONF_CODE_TABLE
+
+
+def _code(value: str) -> str:
+    return base64.b64encode(value.encode()).decode()
+
+
+def _write_code_file(path: Path, content: dict) -> str:
+    path.write_text(json.dumps(content))
+    return str(path)
+
+
+@pytest.fixture
+def code_file(tmp_path: Path) -> str:
+    return _write_code_file(
+        tmp_path / "codes.json",
+        {
+            "manufacturer": "Test",
+            "supportedController": "Broadlink",
+            "commandsEncoding": "Base64",
+            "operationModes": ["heat", "cool", "fan_only"],
+            "fanModes": ["low", "high"],
+            "commands": {
+                "off": _code("off"),
+                "heat": {
+                    "low": {"18": _code("heat_low_18"), "18.5": _code("heat_low_18.5")},
+                    "high": {"18": _code("heat_high_18")},
+                },
+                "cool": {"low": {"18": _code("heat_low_18")}},
+                "fan_only": {"low": _code("fan_only_low")},
+            },
+        },
+    )
+
+
+@pytest.fixture
+def code_table(code_file: str, tmp_path: Path):
+    destination = str(tmp_path / "codes.bin")
+    assert compile_code_file(code_file, destination) == 6
+    table = CodeTable.open(destination)
+    yield table
+    table.close()
+
+
+def test_lookup(code_table: CodeTable):
+    assert code_table.lookup(HVACMode.HEAT, FAN_LOW, None, 18.0) == "b64:" + _code(
+        "heat_low_18"
+    )
+    assert code_table.lookup(HVACMode.HEAT, FAN_LOW, None, 18.5) == "b64:" + _code(
+        "heat_low_18.5"
+    )
+    assert code_table.lookup(HVACMode.HEAT, FAN_HIGH, None, 18) == "b64:" + _code(
+        "heat_high_18"
+    )
+    assert code_table.lookup(HVACMode.OFF) == "b64:" + _code("off")
+
+
+def test_lookup_ignores_not_defined_attributes(code_table: CodeTable):
+    assert code_table.lookup(HVACMode.FAN_ONLY, FAN_LOW, SWING_OFF, 20.0) == (
+        "b64:" + _code("fan_only_low")
+    )
+    assert code_table.lookup(HVACMode.OFF, FAN_LOW, None, 20.0) == "b64:" + _code("off")
+
+
+def test_lookup_missing_code(code_table: CodeTable):
+    assert code_table.lookup(HVACMode.HEAT, FAN_LOW, None, 30.0) is None
+    assert code_table.lookup(HVACMode.HEAT, "unknown", None, 18.0) is None
+    assert code_table.lookup(HVACMode.DRY, FAN_LOW, None, 18.0) is None
+
+
+def test_compile_deduplicates_codes(code_file: str, tmp_path: Path):
+    destination = tmp_path / "codes.bin"
+    compile_code_file(code_file, str(destination))
+    payload = destination.read_bytes()
+    assert payload.count(b"heat_low_18") == 2  # "heat_low_18" and "heat_low_18.5"
+
+
+def test_swing_level(tmp_path: Path):
+    source = _write_code_file(
+        tmp_path / "codes.json",
+        {
+            "supportedController": "Broadlink",
+            "commandsEncoding": "Base64",
+            "swingModes": [SWING_OFF, SWING_VERTICAL],
+            "commands": {
+                "cool": {
+                    "low": {
+                        SWING_OFF: {"20": _code("cool_low_off_20")},
+                        SWING_VERTICAL: {"20": _code("cool_low_vertical_20")},
+                    }
+                }
+            },
+        },
+    )
+    destination = str(tmp_path / "codes.bin")
+    compile_code_file(source, destination)
+    table = CodeTable.open(destination)
+    try:
+        assert table.lookup(HVACMode.COOL, FAN_LOW, SWING_VERTICAL, 20) == (
+            "b64:" + _code("cool_low_vertical_20")
+        )
+        assert table.lookup(HVACMode.COOL, FAN_LOW, SWING_OFF, 20) == (
+            "b64:" + _code("cool_low_off_20")
+        )
+    finally:
+        table.close()
+
+
+def test_raw_encoding(tmp_path: Path):
+    source = _write_code_file(
+        tmp_path / "codes.json",
+        {
+            "supportedController": "Xiaomi",
+            "commandsEncoding": "Raw",
+            "commands": {"off": "Z6VHABEC"},
+        },
+    )
+    destination = str(tmp_path / "codes.bin")
+    compile_code_file(source, destination)
+    table = CodeTable.open(destination)
+    try:
+        assert table.lookup(HVACMode.OFF) == "raw:Z6VHABEC"
+    finally:
+        table.close()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        [],
+        {"commands": []},
+        {"supportedController": "MQTT", "commandsEncoding": "Raw", "commands": {}},
+        {"commands": {"off": "not base64!"}},
+        {"commands": {"heat": {"low": {"hot": _code("code")}}}},
+        {"commands": {"off": 1}},
+        {
+            "supportedController": "Xiaomi",
+            "commandsEncoding": "Raw",
+            "commands": {"off": "Z6VH\u00e9BEC"},
+        },
+        {"commands": {"x" * 70000: _code("code")}},
+    ],
+)
+def test_compile_invalid_file(tmp_path: Path, content):
+    source = _write_code_file(tmp_path / "codes.json", content)
+    with pytest.raises(CodeFileError):
+        compile_code_file(source, str(tmp_path / "codes.bin"))
+
+
+def test_compile_write_failure(code_file: str, tmp_path: Path):
+    """Destination which is a directory can't be replaced"""
+    destination = tmp_path / "codes.bin"
+    destination.mkdir()
+    with pytest.raises(CodeFileError):
+        compile_code_file(code_file, str(destination))
+    assert not (tmp_path / "codes.bin.tmp").exists()
+
+
+def test_compile_missing_file(tmp_path: Path):
+    with pytest.raises(CodeFileError):
+        compile_code_file(str(tmp_path / "missing.json"), str(tmp_path / "codes.bin"))
+
+
+def test_open_invalid_table(tmp_path: Path):
+    path = tmp_path / "codes.bin"
+    path.write_bytes(b"not a table at all, just some bytes")
+    with pytest.raises(CodeFileError):
+        CodeTable.open(str(path))
+
+
+async def test_climate_sends_codes_from_table(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    mocker: MockerFixture,
+    code_file: str,
+    tmp_path: Path,
+):
+    code_table = str(tmp_path / "codes.bin")
+    compile_code_file(code_file, code_table)
+    hass.config_entries.async_update_entry(
+        entry=config_entry,
+        options=config_entry.options | {CONF_CODE_TABLE: code_table},
+    )
+    send_command_service_calls = async_mock_service(
+        hass, Platform.REMOTE, SERVICE_SEND_COMMAND
+    )
+    mock_async_add_devices = mocker.stub("async_add_devices")
+    await climate_async_setup_entry(hass, config_entry, mock_async_add_devices)
+    climate: RestoreAcRemote = mock_async_add_devices.call_args_list[0].args[0][0]
+    climate.hass = hass
+    climate._attr_hvac_mode = HVACMode.HEAT
+    climate._attr_target_temperature = 18.0
+
+    await climate.async_set_fan_mode(FAN_HIGH)
+    await climate.async_set_hvac_mode(HVACMode.OFF)
+
+    assert [call.data[ATTR_COMMAND] for call in send_command_service_calls] == [
+        ["b64:" + _code("heat_high_18")],
+        ["b64:" + _code("off")],
+    ]
+
+    # Falls back to learned commands if code isn't defined in the file
+    climate._attr_hvac_mode = HVACMode.HEAT
+    await climate.async_set_temperature(temperature=25.0)
+    assert send_command_service_calls[-1].data[ATTR_COMMAND] == [
+        "mode:heat_fan:high_temp:25.0"
+    ]
+    climate._code_table.close()
@@ -0,0 +1,102 @@
+import dataclasses
+
+from homeassistant.components.climate import ClimateEntityFeature, HVACMode
+from homeassistant.components.climate import DATA_COMPONENT as CLIMATE_COMPONENT
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.climate_remote_control.config import (
+    EntryConfig,
+    ModeConfig,
+    TemperatureConfig,
+)
+from custom_components.climate_remote_control.const import (
+    CONF_DELIVERY,
+    CONF_FAN_MODES,
+    CONF_HVAC_MODES,
+    CONF_MODE,
+    CONF_RETRY_ATTEMPTS,
+    CONF_SWING,
+    CONF_TEMPERATURE,
+    DATA_CONFIG,
+    DOMAIN,
+    SwingMode,
+    TemperatureMode,
+)
+
+
+def test_entry_config(config_entry: MockConfigEntry):
+    config = EntryConfig.from_options(
+        config_entry.options
+        | {
+            CONF_HVAC_MODES: {
+                HVACMode.OFF: {},
+                "dry": {CONF_TEMPERATURE: {CONF_MODE: "none"}, CONF_FAN_MODES: []},
+                HVACMode.FAN_ONLY: {CONF_FAN_MODES: ["low"]},
+            },
+            CONF_DELIVERY: {CONF_RETRY_ATTEMPTS: 1},
+        }
+    )
+    assert config.temperature_unit == UnitOfTemperature.CELSIUS
+    assert config.temperature == TemperatureConfig(TemperatureMode.TARGET, 18, 28)
+    assert config.hvac_modes == {
+        HVACMode.OFF: ModeConfig(),
+        HVACMode.DRY: ModeConfig(TemperatureConfig(TemperatureMode.NONE), ()),
+        HVACMode.FAN_ONLY: ModeConfig(fan_modes=("low",)),
+    }
+    assert config.profiles[HVACMode.OFF].supported_features == (
+        ClimateEntityFeature.TARGET_TEMPERATURE
+        | ClimateEntityFeature.FAN_MODE
+        | ClimateEntityFeature.PRESET_MODE
+    )
+    assert config.profiles[HVACMode.DRY].supported_features == (
+        ClimateEntityFeature.PRESET_MODE
+    )
+    assert config.profiles[HVACMode.DRY].grouping_attributes == ("hvac_mode",)
+    assert config.profiles[HVACMode.FAN_ONLY].fan_modes == ("low",)
+    assert config.swing_mode == SwingMode.TOGGLE
+    assert config.fan_modes == ("low", "medium", "high", "diffuse")
+    assert config.grouping_attributes == ("hvac_mode", "fan_mode", "temperature")
+    assert config.delivery.retry_attempts == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.device = "other"
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {CONF_HVAC_MODES: {"unknown": {}}},
+        {CONF_HVAC_MODES: {}},
+        {CONF_SWING: {CONF_MODE: "unknown"}},
+        {CONF_TEMPERATURE: {}},
+        {CONF_HVAC_MODES: {"dry": {CONF_FAN_MODES: ["unknown"]}}},
+    ],
+)
+def test_invalid_entry_config(config_entry: MockConfigEntry, options: dict):
+    with pytest.raises(ValueError):
+        EntryConfig.from_options(config_entry.options | options)
+
+
+async def test_invalid_options(hass: HomeAssistant, config_entry: MockConfigEntry):
+    hass.config_entries.async_update_entry(
+        config_entry, options=config_entry.options | {CONF_HVAC_MODES: {}}
+    )
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    assert config_entry.state == ConfigEntryState.SETUP_ERROR
+
+
+async def test_config_is_shared(hass: HomeAssistant, config_entry: MockConfigEntry):
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    config = hass.data[DOMAIN][DATA_CONFIG][config_entry.entry_id]
+    climate = hass.data[CLIMATE_COMPONENT].get_entity("climate.name_test")
+    assert climate._config is config
+    assert hass.states.get("button.name_test_swing_vertical") is not None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert config_entry.entry_id not in hass.data[DOMAIN][DATA_CONFIG]
@@ -1,3 +1,4 @@
+import os
 from unittest.mock import patch
 import uuid
 
@@ -10,10 +11,12 @@ from homeassistant.components.climate import (
     PRESET_NONE,
     HVACMode,
 )
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import (
     ATTR_AREA_ID,
     ATTR_DEVICE_ID,
     ATTR_ENTITY_ID,
+    CONF_ENABLED,
     CONF_NAME,
     CONF_TARGET,
     CONF_TEMPERATURE_UNIT,
@@ -21,27 +24,40 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult, FlowResultType
+from homeassistant.helpers.storage import STORAGE_DIR
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.climate_remote_control.const import (
+    CONF_CODE_FILE,
+    CONF_CODE_TABLE,
+    CONF_CONFIRMATION,
     CONF_CURRENT_HUMIDITY_SENSOR_ENTITY_ID,
     CONF_CURRENT_TEMPERATURE_SENSOR_ENTITY_ID,
     CONF_FAN_MODES,
     CONF_GROUPING_ATTRIBUTES,
     CONF_HVAC_MODES,
+    CONF_HYSTERESIS,
     CONF_MAX,
     CONF_MIN,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
     CONF_MODE,
     CONF_MODES,
+    CONF_POWER_SENSOR_ENTITY_ID,
+    CONF_POWER_THRESHOLD,
     CONF_PRESET_MODES,
+    CONF_PROFILE,
+    CONF_SCHEDULE,
     CONF_SWING,
     CONF_TEMPERATURE,
     CONF_TEMPERATURE_STEP,
+    CONF_THERMOSTAT,
     DOMAIN,
     SwingMode,
     TemperatureMode,
 )
+from custom_components.climate_remote_control.profiles import async_get_profiles
 
 
 @pytest.fixture(autouse=True)
@@ -408,6 +424,279 @@ async def test_previously_configured_preset_modes(
     assert result["step_id"] == "init"
 
 
+async def test_code_file_import(
+    hass: HomeAssistant, config_entry: MockConfigEntry, tmp_path
+):
+    """Test importing device code file"""
+    hass.config.config_dir = str(tmp_path)
+    code_file = tmp_path / "codes.json"
+    code_file.write_text(
+        '{"supportedController": "Broadlink", "commandsEncoding": "Base64",'
+        ' "commands": {"off": "b2Zm"}}'
+    )
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "code_file")
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_CODE_FILE: str(tmp_path / "missing.json")},
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_CODE_FILE: "code_file_invalid"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_CODE_FILE: str(code_file)},
+    )
+    assert result["type"] == FlowResultType.MENU
+    assert result["step_id"] == "init"
+    """Live table isn't replaced until the options are saved"""
+    code_table = tmp_path / STORAGE_DIR / DOMAIN / (config_entry.entry_id + ".codes")
+    assert not code_table.exists()
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    data = result["data"]
+    assert code_table.is_file()
+    assert not os.path.exists(str(code_table) + ".new")
+    assert data[CONF_CODE_FILE] == str(code_file)
+    assert data[CONF_CODE_TABLE].endswith(config_entry.entry_id + ".codes")
+    assert os.path.isfile(hass.config.path(data[CONF_CODE_TABLE]))
+
+    """Abandoned flow leaves the saved table as it is"""
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "code_file")
+    code_file.write_text(
+        '{"supportedController": "Broadlink", "commandsEncoding": "Base64",'
+        ' "commands": {"off": "b24="}}'
+    )
+    saved = code_table.read_bytes()
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_CODE_FILE: str(code_file)},
+    )
+    hass.config_entries.options.async_abort(result["flow_id"])
+    await hass.async_block_till_done()
+    assert code_table.read_bytes() == saved
+    assert not os.path.exists(str(code_table) + ".new")
+
+    """Cleared table is removed when the options are saved"""
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "code_file")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_CODE_FILE: ""},
+    )
+    assert code_table.exists()
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["data"][CONF_CODE_TABLE] is None
+    assert not code_table.exists()
+
+    """Compiled table is deleted with the entry"""
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "code_file")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_CODE_FILE: str(code_file)},
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert code_table.is_file()
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    assert not code_table.exists()
+
+
+async def test_parallel_options_flows(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+):
+    """Options changed in one flow don't leak into another flow"""
+    first = await _go_to_specific_step(hass, config_entry.entry_id, "device")
+    await hass.config_entries.options.async_configure(
+        first["flow_id"], user_input={"device": "first"}
+    )
+
+    second = await _go_to_specific_step(hass, config_entry.entry_id, "device")
+    assert second["data_schema"]({})["device"] == config_entry.options["device"]
+
+    result = await hass.config_entries.options.async_configure(
+        first["flow_id"], user_input={"next_step_id": "device"}
+    )
+    assert result["data_schema"]({})["device"] == "first"
+
+
+async def test_thermostat(hass: HomeAssistant, config_entry: MockConfigEntry):
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "thermostat")
+    assert result["data_schema"]({})[CONF_ENABLED] is False
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_ENABLED: True, CONF_HYSTERESIS: 1},
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_THERMOSTAT] == {
+        CONF_HYSTERESIS: 1.0,
+        CONF_MIN_ON_TIME: 300.0,
+        CONF_MIN_OFF_TIME: 300.0,
+    }
+
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "thermostat")
+    assert result["data_schema"]({})[CONF_HYSTERESIS] == 1.0
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_ENABLED: False},
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["data"][CONF_THERMOSTAT] is None
+
+
+async def test_schedule(hass: HomeAssistant, config_entry: MockConfigEntry):
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "schedule")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_SCHEDULE: [{"at": "25:00", "hvac_mode": "cool"}]},
+    )
+    assert result["errors"] == {CONF_SCHEDULE: "schedule_invalid"}
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_SCHEDULE: [{"at": "07:00", "weekday": "mon"}]},
+    )
+    assert result["errors"] == {CONF_SCHEDULE: "schedule_invalid"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCHEDULE: [{"at": "07:00", "weekday": "mon", "temperature": 22}]
+        },
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_SCHEDULE] == [
+        {"at": "07:00:00", "weekday": ["mon"], "temperature": 22.0}
+    ]
+
+
+async def test_schedule_time_without_padding(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+):
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "schedule")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_SCHEDULE: [{"at": "7:00", "hvac_mode": "cool"}]},
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["data"][CONF_SCHEDULE] == [{"at": "07:00:00", "hvac_mode": "cool"}]
+
+    """Saved options reload the entry, which reads the schedule back"""
+    await hass.async_block_till_done()
+    assert config_entry.state is ConfigEntryState.LOADED
+
+
+async def test_confirmation(hass: HomeAssistant, config_entry: MockConfigEntry):
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "confirmation")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_POWER_SENSOR_ENTITY_ID: "sensor.unit_power",
+            CONF_POWER_THRESHOLD: 20,
+        },
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_CONFIRMATION] == {
+        CONF_POWER_SENSOR_ENTITY_ID: "sensor.unit_power",
+        CONF_POWER_THRESHOLD: 20.0,
+        "confirm_timeout": 60.0,
+        "max_resends": 2,
+    }
+
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "confirmation")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_POWER_SENSOR_ENTITY_ID: None}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"next_step_id": "finish"},
+    )
+    assert result["data"][CONF_CONFIRMATION] is None
+
+
+async def test_profile(hass: HomeAssistant, config_entry: MockConfigEntry):
+    """Defaults come from the profile, options equal to it aren't kept"""
+    async_get_profiles(hass)["lg"] = {
+        CONF_FAN_MODES: [FAN_LOW, FAN_HIGH],
+        CONF_TEMPERATURE_STEP: 1.0,
+    }
+    options = dict(config_entry.options)
+    del options[CONF_FAN_MODES]
+    hass.config_entries.async_update_entry(config_entry, options=options)
+
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "profile")
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_PROFILE: "lg"}
+    )
+    assert result["type"] == FlowResultType.MENU
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={"next_step_id": "fan_modes"}
+    )
+    assert result["data_schema"]({})[CONF_MODES] == [FAN_LOW, FAN_HIGH]
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_MODES: [FAN_LOW, FAN_HIGH]}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={"next_step_id": "finish"}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    data = result["data"]
+    assert data[CONF_PROFILE] == "lg"
+    assert CONF_FAN_MODES not in data
+    assert CONF_TEMPERATURE_STEP not in data
+    assert data[CONF_TEMPERATURE] == options[CONF_TEMPERATURE]
+
+    """Option which differs from the profile overrides it"""
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "fan_modes")
+    assert result["data_schema"]({})[CONF_MODES] == [FAN_LOW, FAN_HIGH]
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_MODES: [FAN_LOW]}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={"next_step_id": "finish"}
+    )
+    assert result["data"][CONF_FAN_MODES] == [FAN_LOW]
+
+    result = await _go_to_specific_step(hass, config_entry.entry_id, "profile")
+    assert result["data_schema"]({})[CONF_PROFILE] == "lg"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_PROFILE: None}
+    )
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={"next_step_id": "finish"}
+    )
+    assert result["data"][CONF_PROFILE] is None
+    assert result["data"][CONF_FAN_MODES] == [FAN_LOW]
+
+
 async def _go_to_specific_step(
     hass: HomeAssistant, config_entry_id: str, step_id: str
 ) -> FlowResult:
@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import SERVICE_SET_HVAC_MODE, HVACMode
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_COMMAND, ATTR_ENTITY_ID, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_component import async_update_entity
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.climate_remote_control.confirmation import (
+    ConfirmationOptions,
+    PowerConfirmation,
+)
+from custom_components.climate_remote_control.const import (
+    CONF_CONFIRM_TIMEOUT,
+    CONF_CONFIRMATION,
+    CONF_MAX_RESENDS,
+    CONF_POWER_SENSOR_ENTITY_ID,
+    DEFAULT_POWER_THRESHOLD,
+    DOMAIN,
+)
+from custom_components.climate_remote_control.hub import async_get_hub
+
+POWER_SENSOR = "sensor.unit_power"
+
+
+def test_confirmation_options():
+    assert ConfirmationOptions.from_options({}) is None
+    assert ConfirmationOptions.from_options({CONF_CONFIRMATION: None}) is None
+    options = ConfirmationOptions.from_options(
+        {CONF_CONFIRMATION: {CONF_POWER_SENSOR_ENTITY_ID: POWER_SENSOR}}
+    )
+    assert options.power_sensor_entity_id == POWER_SENSOR
+    assert options.power_threshold == DEFAULT_POWER_THRESHOLD
+
+
+def test_power_confirmation():
+    options = ConfirmationOptions(POWER_SENSOR, max_resends=1)
+    confirmation = PowerConfirmation()
+    assert confirmation.observe(options, 800) is False
+
+    confirmation.expect(True, ("remote.a",))
+    assert confirmation.observe(options, None) is False
+    assert confirmation.observe(options, 10) is False
+    assert confirmation.observe(options, 800) is True
+    assert confirmation.expected is None
+
+    """Resent frame continues the expectation, so resends are bounded"""
+    confirmation.expect(False, ("remote.a",))
+    assert confirmation.timeout(options) is True
+    confirmation.expect(False, ("remote.a",))
+    assert confirmation.timeout(options) is False
+    assert confirmation.expected is None
+    assert confirmation.timeout(options) is False
+
+
+async def test_entity_confirms_and_resends(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+):
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {
+            CONF_CONFIRMATION: {
+                CONF_POWER_SENSOR_ENTITY_ID: POWER_SENSOR,
+                CONF_CONFIRM_TIMEOUT: 30,
+                CONF_MAX_RESENDS: 1,
+            }
+        },
+    )
+    hass.states.async_set(POWER_SENSOR, "0")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    hub = async_get_hub(hass)
+    key = (CONF_CONFIRMATION, "test")
+
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: "climate.name_test", "hvac_mode": HVACMode.COOL},
+        blocking=True,
+    )
+    assert hub.timers.get_fire_time(key) is not None
+    hass.states.async_set(POWER_SENSOR, "800")
+    await hass.async_block_till_done()
+    assert hub.timers.get_fire_time(key) is None
+    assert hub.async_get_device_stats("test").confirmed == 1
+
+    """Unit which keeps running gets "off" once more, then it is given up"""
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: "climate.name_test", "hvac_mode": HVACMode.OFF},
+        blocking=True,
+    )
+    assert len(calls) == 3
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert [x.data[ATTR_COMMAND] for x in calls[2:]] == [["off"], ["off"]]
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=100))
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+    assert hub.timers.get_fire_time(key) is None
+
+    stats = hub.blasters["remote.test_entity"].stats
+    assert (stats.confirmed, stats.unconfirmed) == (1, 2)
+    await async_update_entity(hass, "sensor.name_test_confirmation_rate")
+    state = hass.states.get("sensor.name_test_confirmation_rate")
+    assert float(state.state) == pytest.approx(33.3)
+    assert state.attributes["blasters"]["remote.test_entity"]["unconfirmed"] == 2
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert len(hub.timers) == 0
@@ -0,0 +1,530 @@
+import asyncio
+from datetime import timedelta
+
+from homeassistant.components.button import DOMAIN as BUTTON_DOMAIN
+from homeassistant.components.button import SERVICE_PRESS
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+)
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import (
+    FAN_LOW,
+    FAN_MEDIUM,
+    SERVICE_SET_FAN_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_COMMAND, ATTR_ENTITY_ID, ATTR_TEMPERATURE, Platform
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+    mock_restore_cache,
+)
+
+from custom_components.climate_remote_control.const import (
+    ATTR_CIRCUIT_BREAKER,
+    ATTR_PENDING,
+    ATTR_RATE_LIMIT_WAIT,
+    CONF_BREAKER_RESET_TIMEOUT,
+    CONF_BREAKER_THRESHOLD,
+    CONF_DELIVERY,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_RESYNC_ON_START,
+    CONF_RETRY_ATTEMPTS,
+    CONF_RETRY_BACKOFF,
+    CONF_SEND_TIMEOUT,
+    DOMAIN,
+)
+from custom_components.climate_remote_control.delivery import (
+    BreakerState,
+    CircuitBreaker,
+    DeliveryOptions,
+    Priority,
+    SendResult,
+    TokenBucket,
+)
+from custom_components.climate_remote_control.hub import (
+    RESYNC_INTERVAL,
+    RESYNC_JITTER,
+    async_get_hub,
+)
+
+
+def test_delivery_options():
+    assert DeliveryOptions.from_options({}) == DeliveryOptions()
+    options = DeliveryOptions.from_options(
+        {
+            CONF_DELIVERY: {
+                CONF_RETRY_ATTEMPTS: 5,
+                CONF_RETRY_BACKOFF: 2,
+                CONF_BREAKER_THRESHOLD: 3,
+                CONF_BREAKER_RESET_TIMEOUT: 10,
+            }
+        }
+    )
+    assert options == DeliveryOptions(5, 2.0, 3, 10.0)
+    assert options.send_timeout == 10.0
+    for attempt in range(10):
+        assert 0 <= options.backoff(attempt) <= min(30, 2 * 2**attempt)
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker()
+    assert breaker.allow(0) is True
+    assert breaker.record_failure(0, threshold=2, reset_timeout=10) is False
+    assert breaker.record_failure(1, threshold=2, reset_timeout=10) is True
+    assert breaker.state(5) == BreakerState.OPEN
+    assert breaker.allow(5) is False
+
+    assert breaker.state(11) == BreakerState.HALF_OPEN
+    assert breaker.allow(11) is True
+    assert breaker.allow(11) is False
+    assert breaker.record_failure(12, threshold=2, reset_timeout=10) is True
+    assert breaker.state(15) == BreakerState.OPEN
+
+    assert breaker.allow(22) is True
+    assert breaker.record_success() is True
+    assert breaker.state(22) == BreakerState.CLOSED
+    assert breaker.record_success() is False
+
+
+def test_token_bucket():
+    bucket = TokenBucket()
+    assert bucket.reserve(0, rate=0, burst=1) == 0
+    assert [bucket.reserve(10, rate=2, burst=2) for _ in range(4)] == [
+        0,
+        0,
+        0.5,
+        1.0,
+    ]
+    assert bucket.wait_time(10) == 1.0
+    assert bucket.wait_time(10.75) == 0.25
+    assert bucket.reserve(12, rate=2, burst=2) == 0
+    assert bucket.wait_time(12) == 0
+    assert bucket.reserve(100, rate=2, burst=2) == 0
+    assert bucket.reserve(100, rate=2, burst=2) == 0
+    assert bucket.reserve(100, rate=2, burst=2) == 0.5
+
+
+async def test_retry_until_delivered(hass: HomeAssistant, remote_entity_id: str):
+    attempts = []
+
+    async def send_command(call):
+        attempts.append(call)
+        if len(attempts) < 3:
+            raise HomeAssistantError("Blaster is busy")
+
+    hass.services.async_register(Platform.REMOTE, SERVICE_SEND_COMMAND, send_command)
+    blaster = async_get_hub(hass).async_get_blaster(remote_entity_id)
+
+    result = await blaster.async_send(
+        {ATTR_COMMAND: ["off"]}, DeliveryOptions(retry_attempts=3, retry_backoff=0)
+    )
+    assert result == SendResult.DELIVERED
+    assert len(attempts) == 3
+    assert blaster.breaker.state() == BreakerState.CLOSED
+    assert blaster.breaker.failures == 0
+
+
+async def test_toggle_is_not_retried(hass: HomeAssistant, remote_entity_id: str):
+    """Toggle which the blaster may have sent before the error isn't repeated"""
+    calls = async_mock_service(
+        hass,
+        Platform.REMOTE,
+        SERVICE_SEND_COMMAND,
+        raise_exception=HomeAssistantError("Blaster is busy"),
+    )
+    blaster = async_get_hub(hass).async_get_blaster(remote_entity_id)
+
+    result = await blaster.async_send(
+        {ATTR_COMMAND: ["swing"]},
+        DeliveryOptions(retry_attempts=3, retry_backoff=0),
+        Priority.SWING,
+        idempotent=False,
+    )
+    assert result == SendResult.FAILED
+    assert len(calls) == 1
+
+
+async def test_missing_code(hass: HomeAssistant, remote_entity_id: str):
+    calls = async_mock_service(
+        hass, Platform.REMOTE, SERVICE_SEND_COMMAND, raise_exception=ValueError
+    )
+    blaster = async_get_hub(hass).async_get_blaster(remote_entity_id)
+
+    result = await blaster.async_send({ATTR_COMMAND: ["off"]}, DeliveryOptions())
+    assert result == SendResult.MISSING_CODE
+    assert len(calls) == 1
+
+
+async def test_breaker_postpones_commands(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    remote_entity_id: str,
+):
+    hass.config_entries.async_update_entry(
+        entry=config_entry,
+        options=config_entry.options
+        | {
+            CONF_DELIVERY: {
+                CONF_RETRY_ATTEMPTS: 2,
+                CONF_RETRY_BACKOFF: 0,
+                CONF_BREAKER_THRESHOLD: 2,
+                CONF_BREAKER_RESET_TIMEOUT: 60,
+            }
+        },
+    )
+    calls = async_mock_service(
+        hass,
+        Platform.REMOTE,
+        SERVICE_SEND_COMMAND,
+        raise_exception=HomeAssistantError("Blaster is offline"),
+    )
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+
+    for temperature in (20, 21):
+        await hass.services.async_call(
+            domain=CLIMATE_DOMAIN,
+            service=SERVICE_SET_TEMPERATURE,
+            service_data={ATTR_TEMPERATURE: temperature},
+            target={ATTR_ENTITY_ID: "climate.name_test"},
+            blocking=True,
+        )
+    assert len(calls) == 2
+    attributes = hass.states.get("climate.name_test").attributes
+    assert attributes[ATTR_PENDING] is True
+    assert attributes[ATTR_CIRCUIT_BREAKER] == BreakerState.OPEN
+
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data[ATTR_COMMAND] == ["off"]
+    attributes = hass.states.get("climate.name_test").attributes
+    assert attributes[ATTR_PENDING] is False
+    assert attributes[ATTR_CIRCUIT_BREAKER] == BreakerState.CLOSED
+
+
+async def test_hung_remote(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    remote_entity_id: str,
+):
+    hass.config_entries.async_update_entry(
+        entry=config_entry,
+        options=config_entry.options
+        | {CONF_DELIVERY: {CONF_RETRY_BACKOFF: 0, CONF_SEND_TIMEOUT: 0.05}},
+    )
+    calls = []
+    cancelled = []
+
+    async def send_command(call):
+        calls.append(call)
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(call)
+            raise
+
+    hass.services.async_register(Platform.REMOTE, SERVICE_SEND_COMMAND, send_command)
+    blaster = async_get_hub(hass).async_get_blaster(remote_entity_id)
+    assert (
+        await blaster.async_send(
+            {ATTR_COMMAND: ["off"]}, DeliveryOptions(send_timeout=0.05)
+        )
+        == SendResult.UNKNOWN
+    )
+    assert len(calls) == 1
+    assert len(cancelled) == 1
+
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    for temperature in (20, 21):
+        await hass.services.async_call(
+            domain=CLIMATE_DOMAIN,
+            service=SERVICE_SET_TEMPERATURE,
+            service_data={ATTR_TEMPERATURE: temperature},
+            target={ATTR_ENTITY_ID: "climate.name_test"},
+            blocking=True,
+        )
+    """Timed out commands are neither repeated nor postponed"""
+    assert len(calls) == 3
+    assert len(cancelled) == 3
+    assert hass.states.get("climate.name_test").attributes[ATTR_PENDING] is False
+
+
+async def test_rate_limit(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    remote_entity_id: str,
+):
+    hass.config_entries.async_update_entry(
+        entry=config_entry,
+        options=config_entry.options
+        | {CONF_DELIVERY: {CONF_RATE_LIMIT: 20, CONF_RATE_BURST: 1}},
+    )
+    sent_at = []
+
+    async def send_command(call):
+        sent_at.append(hass.loop.time())
+
+    hass.services.async_register(Platform.REMOTE, SERVICE_SEND_COMMAND, send_command)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+
+    await asyncio.gather(
+        hass.services.async_call(
+            domain=CLIMATE_DOMAIN,
+            service=SERVICE_SET_TEMPERATURE,
+            service_data={ATTR_TEMPERATURE: 20},
+            target={ATTR_ENTITY_ID: "climate.name_test"},
+            blocking=True,
+        ),
+        hass.services.async_call(
+            domain=BUTTON_DOMAIN,
+            service=SERVICE_PRESS,
+            target={ATTR_ENTITY_ID: "button.name_test_swing_vertical"},
+            blocking=True,
+        ),
+        hass.services.async_call(
+            domain=CLIMATE_DOMAIN,
+            service=SERVICE_SET_FAN_MODE,
+            service_data={ATTR_FAN_MODE: FAN_LOW},
+            target={ATTR_ENTITY_ID: "climate.name_test"},
+            blocking=True,
+        ),
+    )
+    assert len(sent_at) == 3
+    assert sent_at[1] - sent_at[0] >= 0.04
+    assert sent_at[2] - sent_at[1] >= 0.04
+    assert hass.states.get("climate.name_test").attributes[ATTR_RATE_LIMIT_WAIT] == 0
+
+
+async def test_priority_lanes(hass: HomeAssistant, remote_entity_id: str):
+    transmitted = []
+
+    async def send_command(call):
+        transmitted.append(call.data[ATTR_COMMAND][0])
+        await asyncio.sleep(0)
+
+    hass.services.async_register(Platform.REMOTE, SERVICE_SEND_COMMAND, send_command)
+    blaster = async_get_hub(hass).async_get_blaster(remote_entity_id)
+    options = DeliveryOptions()
+
+    def send(command: str, priority: Priority, owner: str) -> asyncio.Task:
+        return hass.async_create_task(
+            blaster.async_send({ATTR_COMMAND: [command]}, options, priority, owner)
+        )
+
+    in_flight = send("fan:low", Priority.ADJUSTMENT, "a")
+    swing = send("swing:vertical", Priority.SWING, "b")
+    adjustment = send("temp:20", Priority.ADJUSTMENT, "a")
+    mode = send("mode:heat", Priority.POWER, "b")
+    assert blaster.queue_depth == 3
+    off = send("off", Priority.OFF, "a")
+    assert blaster.queue_depth == 3
+
+    assert await asyncio.gather(in_flight, swing, adjustment, mode, off) == [
+        SendResult.DELIVERED,
+        SendResult.DELIVERED,
+        SendResult.SUPERSEDED,
+        SendResult.DELIVERED,
+        SendResult.DELIVERED,
+    ]
+    assert transmitted == ["fan:low", "off", "mode:heat", "swing:vertical"]
+    assert blaster.queue_depth == 0
+
+
+async def test_whole_state_supersedes_older_state(
+    hass: HomeAssistant, remote_entity_id: str
+):
+    transmitted = []
+
+    async def send_command(call):
+        transmitted.append(call.data[ATTR_COMMAND][0])
+        await asyncio.sleep(0)
+
+    hass.services.async_register(Platform.REMOTE, SERVICE_SEND_COMMAND, send_command)
+    blaster = async_get_hub(hass).async_get_blaster(remote_entity_id)
+    options = DeliveryOptions()
+
+    def send(command: str, priority: Priority, whole_state: bool) -> asyncio.Task:
+        return hass.async_create_task(
+            blaster.async_send(
+                {ATTR_COMMAND: [command]}, options, priority, "a", None, whole_state
+            )
+        )
+
+    in_flight = send("mode:dry_temp:20", Priority.POWER, True)
+    stale = send("mode:dry_temp:21", Priority.ADJUSTMENT, True)
+    swing = send("swing:vertical", Priority.SWING, False)
+    latest = send("mode:heat_temp:21", Priority.POWER, True)
+
+    assert await asyncio.gather(in_flight, stale, swing, latest) == [
+        SendResult.DELIVERED,
+        SendResult.SUPERSEDED,
+        SendResult.DELIVERED,
+        SendResult.DELIVERED,
+    ]
+    """Older state is never transmitted after the newer one"""
+    assert transmitted == ["mode:dry_temp:20", "mode:heat_temp:21", "swing:vertical"]
+
+
+@pytest.mark.parametrize(("devices", "blasters", "air_time"), [(100, 10, 0.01)])
+async def test_time_to_all_off(
+    hass: HomeAssistant,
+    record_property,
+    devices: int,
+    blasters: int,
+    air_time: float,
+):
+    """Benchmark of turning off all devices while adjustments are queued.
+
+    Time is counted in air time of transmitted commands, so the result doesn't
+    depend on the speed of the event loop.
+    """
+    air_clock: dict[str, float] = {}
+    time_to_all_off = 0.0
+
+    async def send_command(call):
+        nonlocal time_to_all_off
+        remote_entity_id = call.data[ATTR_ENTITY_ID][0]
+        await asyncio.sleep(0)
+        air_clock[remote_entity_id] = air_clock.get(remote_entity_id, 0) + air_time
+        if call.data[ATTR_COMMAND] == ["off"]:
+            time_to_all_off = max(time_to_all_off, air_clock[remote_entity_id])
+
+    hass.services.async_register(Platform.REMOTE, SERVICE_SEND_COMMAND, send_command)
+    hub = async_get_hub(hass)
+    options = DeliveryOptions()
+    adjustments = [
+        hass.async_create_task(
+            hub.async_get_blaster(f"remote.blaster_{device % blasters}").async_send(
+                {ATTR_COMMAND: [f"temp:{temperature}"]},
+                options,
+                Priority.ADJUSTMENT,
+                f"device_{device}",
+            )
+        )
+        for temperature in (20, 21, 22)
+        for device in range(devices)
+    ]
+
+    start = hass.loop.time()
+    results = await asyncio.gather(
+        *(
+            hass.async_create_task(
+                hub.async_get_blaster(f"remote.blaster_{device % blasters}").async_send(
+                    {ATTR_COMMAND: ["off"]}, options, Priority.OFF, f"device_{device}"
+                )
+            )
+            for device in range(devices)
+        )
+    )
+    record_property("wall_time_to_all_off", hass.loop.time() - start)
+    record_property("time_to_all_off", time_to_all_off)
+
+    assert results == [SendResult.DELIVERED] * devices
+    """Each blaster finishes the command in the air and then sends only "off"."""
+    assert time_to_all_off == pytest.approx((devices // blasters + 1) * air_time)
+    adjustment_results = await asyncio.gather(*adjustments)
+    assert adjustment_results.count(SendResult.DELIVERED) == blasters
+    assert adjustment_results.count(SendResult.SUPERSEDED) == 3 * devices - blasters
+
+
+async def test_resync_jobs_are_staggered(hass: HomeAssistant):
+    step = RESYNC_INTERVAL + RESYNC_JITTER
+    done = []
+
+    def job(name: str):
+        async def _job():
+            done.append(name)
+
+        return _job
+
+    hub = async_get_hub(hass)
+    hub.async_request_resync(job("a"), ("remote.a",))
+    cancel = hub.async_request_resync(job("b"), ("remote.a",))
+    hub.async_request_resync(job("c"), ("remote.a", "remote.b"))
+    cancel()
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + timedelta(seconds=RESYNC_INTERVAL / 2))
+    await hass.async_block_till_done()
+    assert done == []
+    async_fire_time_changed(hass, now + timedelta(seconds=step))
+    await hass.async_block_till_done()
+    assert done == ["a"]
+    async_fire_time_changed(hass, now + timedelta(seconds=2 * step))
+    await hass.async_block_till_done()
+    assert done == ["a", "c"]
+
+
+async def test_resync_blasters_concurrently(hass: HomeAssistant):
+    """Restart of many devices takes as long as the busiest blaster needs"""
+    done = []
+
+    def job(name: str):
+        async def _job():
+            done.append(name)
+
+        return _job
+
+    hub = async_get_hub(hass)
+    for blaster in ("a", "b", "c"):
+        for x in range(2):
+            hub.async_request_resync(job(f"{blaster}{x}"), (f"remote.{blaster}",))
+    hub.async_request_resync(job("none"), ())
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(
+        hass, now + timedelta(seconds=RESYNC_INTERVAL + RESYNC_JITTER)
+    )
+    await hass.async_block_till_done()
+    assert sorted(done) == ["a0", "b0", "c0", "none"]
+    async_fire_time_changed(
+        hass, now + timedelta(seconds=2 * (RESYNC_INTERVAL + RESYNC_JITTER))
+    )
+    await hass.async_block_till_done()
+    assert sorted(done) == ["a0", "a1", "b0", "b1", "c0", "c1", "none"]
+    assert hub._resync_jobs == {}
+    assert hub._unsubscribe_resync == {}
+
+
+async def test_resync_on_start(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+):
+    hass.config_entries.async_update_entry(
+        entry=config_entry,
+        options=config_entry.options | {CONF_DELIVERY: {CONF_RESYNC_ON_START: True}},
+    )
+    mock_restore_cache(
+        hass,
+        [State("climate.name_test", HVACMode.HEAT, {ATTR_FAN_MODE: FAN_MEDIUM})],
+    )
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=RESYNC_INTERVAL + RESYNC_JITTER)
+    )
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert [x.data[ATTR_COMMAND] for x in calls] == [
+        ["on"],
+        ["mode:heat_fan:medium_temp:18"],
+    ]
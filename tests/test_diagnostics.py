@@ -0,0 +1,60 @@
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import SERVICE_SET_TEMPERATURE
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_dumps
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from custom_components.climate_remote_control.const import DOMAIN
+from custom_components.climate_remote_control.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_diagnostics(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    remote_entity_id: str,
+):
+    async_mock_service(
+        hass, Platform.REMOTE, SERVICE_SEND_COMMAND, raise_exception=ValueError
+    )
+    hass.states.async_set("sensor.sensor_temperature", "21.5")
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    for temperature in (20, 20):
+        await hass.services.async_call(
+            domain=CLIMATE_DOMAIN,
+            service=SERVICE_SET_TEMPERATURE,
+            service_data={ATTR_TEMPERATURE: temperature},
+            target={ATTR_ENTITY_ID: "climate.name_test"},
+            blocking=True,
+        )
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    json_dumps(diagnostics)
+
+    assert diagnostics["options"] == dict(config_entry.options)
+    entity = diagnostics["entity"]
+    assert entity["compiled"]["grouping_attributes"] == [
+        "hvac_mode",
+        "fan_mode",
+        "temperature",
+    ]
+    assert entity["compiled"]["delivery"]["retry_attempts"] == 3
+    assert entity["remote_entity_ids"] == [remote_entity_id]
+    assert entity["missing_commands"] == [["mode:off_fan:low_temp:20.0"]]
+    assert entity["sensors"]["current_temperature"]["state"] == "21.5"
+    assert entity["sensors"]["current_temperature"]["value"] == 21.5
+    assert diagnostics["stats"]["missing_codes"] == 2
+    assert [
+        (x["remote_entity_id"], x["commands"], x["result"])
+        for x in diagnostics["transmissions"]
+    ] == [(remote_entity_id, ["mode:off_fan:low_temp:20.0"], "missing_code")] * 2
+    assert diagnostics["blasters"][remote_entity_id]["queue_depth"] == 0
+    assert diagnostics["blasters"][remote_entity_id]["circuit_breaker"] == "closed"
@@ -0,0 +1,74 @@
+"""Cold import of the integration, measured by python -X importtime.
+
+Home Assistant modules which are loaded anyway before the integration are
+imported first, so only the integration and dependencies it adds are counted.
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+
+PACKAGE = "custom_components.climate_remote_control"
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.climate",
+    "homeassistant.components.button",
+    "homeassistant.components.sensor",
+    "homeassistant.components.remote",
+    "homeassistant.helpers.restore_state",
+)
+RUNTIME = (PACKAGE, f"{PACKAGE}.climate", f"{PACKAGE}.button", f"{PACKAGE}.sensor")
+
+"""Cumulative import time of the runtime path, it is about 50 ms on a desktop"""
+IMPORT_BUDGET = 0.2
+
+
+def _import(*modules: str) -> dict[str, int]:
+    """Import modules in a fresh interpreter.
+
+    Returns imported modules of the integration with cumulative import time in
+    microseconds, time is 0 for modules imported by other modules.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "; ".join(f"import {x}" for x in PRELOADED + modules),
+        ],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or PACKAGE not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        name = name.removeprefix(" ")
+        times[name.strip()] = 0 if name.startswith(" ") else int(cumulative)
+    return times
+
+
+def test_setup_without_entries():
+    """Climate platform is imported only when an entry is set up"""
+    modules = _import(PACKAGE)
+    assert f"{PACKAGE}.climate" not in modules
+    assert f"{PACKAGE}.config_flow" not in modules
+
+
+def test_runtime_path():
+    modules = _import(*RUNTIME)
+    assert set(RUNTIME) <= set(modules)
+    assert f"{PACKAGE}.config_flow" not in modules
+    assert f"{PACKAGE}.codes" not in modules
+
+
+def test_import_time(record_property):
+    """Best of three runs, the first one may compile bytecode"""
+    import_time = min(sum(_import(*RUNTIME).values()) for _ in range(3)) / 1e6
+    record_property("import_time", import_time)
+    assert import_time < IMPORT_BUDGET
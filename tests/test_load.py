@@ -0,0 +1,200 @@
+import asyncio
+import random
+import statistics
+import time
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+)
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import (
+    FAN_HIGH,
+    FAN_LOW,
+    FAN_MEDIUM,
+    SERVICE_SET_FAN_MODE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    CONF_DEVICE,
+    CONF_NAME,
+    CONF_TARGET,
+    CONF_UNIQUE_ID,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.climate_remote_control.const import (
+    CONF_DELIVERY,
+    CONF_RETRY_BACKOFF,
+    CONF_SEND_TIMEOUT,
+    DOMAIN,
+)
+
+from .fake_remote import FakeRemote
+
+MODES = [HVACMode.HEAT, HVACMode.COOL, HVACMode.DRY, HVACMode.AUTO]
+FAN_MODES = [FAN_LOW, FAN_MEDIUM, FAN_HIGH]
+
+
+def _add_config_entries(
+    hass: HomeAssistant, config_entry: MockConfigEntry, entries: int, blasters: int
+) -> list[str]:
+    """Add entries which are spread over blasters, return climate entity ids."""
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options | {CONF_DELIVERY: {CONF_RETRY_BACKOFF: 0}},
+    )
+    for index in range(1, entries):
+        name = f"ac_{index}"
+        MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=name,
+            title=name,
+            data={CONF_UNIQUE_ID: name, CONF_NAME: name},
+            options=config_entry.options
+            | {
+                CONF_DEVICE: name,
+                CONF_TARGET: {
+                    ATTR_ENTITY_ID: [f"remote.blaster_{index % blasters}"],
+                    ATTR_DEVICE_ID: [],
+                    ATTR_AREA_ID: [],
+                },
+            },
+        ).add_to_hass(hass)
+    return ["climate.name_test"] + [f"climate.ac_{x}" for x in range(1, entries)]
+
+
+def _random_call(
+    rng: random.Random, entity_ids: list[str]
+) -> tuple[str, dict[str, str | float]]:
+    entity_id = rng.choice(entity_ids)
+    service, data = rng.choice(
+        [
+            (SERVICE_SET_TEMPERATURE, {ATTR_TEMPERATURE: rng.randint(18, 28)}),
+            (SERVICE_SET_FAN_MODE, {ATTR_FAN_MODE: rng.choice(FAN_MODES)}),
+            (SERVICE_SET_HVAC_MODE, {ATTR_HVAC_MODE: rng.choice(MODES)}),
+        ]
+    )
+    return service, data | {ATTR_ENTITY_ID: entity_id}
+
+
+def _is_delivered(hass: HomeAssistant, fake_remote: FakeRemote, entity_id: str) -> bool:
+    device = "test" if entity_id == "climate.name_test" else entity_id.split(".")[1]
+    return fake_remote.is_delivered(device, hass.states.get(entity_id))
+
+
+async def _async_run_load(
+    hass: HomeAssistant,
+    fake_remote: FakeRemote,
+    entity_ids: list[str],
+    calls: int,
+    concurrency: int,
+) -> dict[str, float]:
+    """Run random service calls, few of them at once, and measure them."""
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: entity_ids, ATTR_HVAC_MODE: HVACMode.HEAT},
+        blocking=True,
+    )
+    frames_before = fake_remote.frames
+    rng = random.Random(0)
+    latencies: list[float] = []
+    queue = [_random_call(rng, entity_ids) for _ in range(calls)]
+
+    async def _async_worker() -> None:
+        while queue:
+            service, data = queue.pop()
+            start = time.monotonic()
+            await hass.services.async_call(CLIMATE_DOMAIN, service, data, blocking=True)
+            latencies.append(time.monotonic() - start)
+
+    start = time.monotonic()
+    await asyncio.gather(*(_async_worker() for _ in range(concurrency)))
+    await hass.async_block_till_done()
+    wall_time = time.monotonic() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "throughput": calls / wall_time,
+        "latency_p50": quantiles[49],
+        "latency_p99": quantiles[98],
+        "frames": fake_remote.frames - frames_before,
+        "correctness": sum(_is_delivered(hass, fake_remote, x) for x in entity_ids)
+        / len(entity_ids),
+    }
+
+
+@pytest.mark.parametrize(
+    ("entries", "blasters", "calls", "concurrency"), [(20, 4, 200, 10)]
+)
+async def test_load(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_remote: FakeRemote,
+    record_property,
+    entries: int,
+    blasters: int,
+    calls: int,
+    concurrency: int,
+):
+    entity_ids = _add_config_entries(hass, config_entry, entries, blasters)
+    report = await _async_run_load(hass, fake_remote, entity_ids, calls, concurrency)
+    for key, value in report.items():
+        record_property(key, value)
+
+    assert fake_remote.overlaps == 0
+    assert report["frames"] <= calls
+    assert report["correctness"] == 1
+
+
+@pytest.mark.parametrize(
+    ("entries", "blasters", "calls", "concurrency"), [(20, 4, 200, 10)]
+)
+async def test_load_with_failures(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    record_property,
+    entries: int,
+    blasters: int,
+    calls: int,
+    concurrency: int,
+):
+    """Drops, hangs and unknown codes only make states diverge."""
+    fake_remote = FakeRemote(
+        hass,
+        drop_rate=0.05,
+        hang_rate=0.02,
+        codes={"on", "off"}
+        | {
+            f"mode:{mode}_fan:{fan_mode}_temp:{float(temperature)}"
+            for mode in MODES
+            for fan_mode in FAN_MODES
+            for temperature in range(18, 28)
+        },
+    ).register()
+    entity_ids = _add_config_entries(hass, config_entry, entries, blasters)
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        hass.config_entries.async_update_entry(
+            entry,
+            options=entry.options
+            | {CONF_DELIVERY: {CONF_RETRY_BACKOFF: 0, CONF_SEND_TIMEOUT: 0.05}},
+        )
+    report = await _async_run_load(hass, fake_remote, entity_ids, calls, concurrency)
+    for key, value in report.items():
+        record_property(key, value)
+
+    assert fake_remote.overlaps == 0
+    assert fake_remote.dropped > 0
+    assert fake_remote.hangs > 0
+    assert 0 <= report["correctness"] < 1
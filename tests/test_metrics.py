@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import SERVICE_SET_TEMPERATURE
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    STATE_UNAVAILABLE,
+    Platform,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.climate_remote_control.const import DOMAIN
+from custom_components.climate_remote_control.metrics import (
+    DeliveryStats,
+    LatencyHistogram,
+    Transmission,
+)
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.quantile(0.5) is None
+    assert histogram.mean is None
+    for latency in (0.01, 0.05, 0.2, 0.3, 0.3, 0.7, 20):
+        histogram.observe(latency)
+    assert histogram.count == 7
+    assert histogram.quantile(0.5) == 0.5
+    assert histogram.quantile(0.25) == 0.05
+    assert histogram.quantile(0.99) == float("inf")
+    assert histogram.as_dict() == {
+        "le_0.05": 2,
+        "le_0.1": 0,
+        "le_0.25": 1,
+        "le_0.5": 2,
+        "le_1.0": 1,
+        "le_2.5": 0,
+        "le_5.0": 0,
+        "le_10.0": 0,
+        "le_inf": 1,
+    }
+
+
+def test_delivery_stats():
+    stats = DeliveryStats()
+    stats.record_send(0.1)
+    stats.record_send(0.2, missing_code=True)
+    stats.record_send(10, timeout=True)
+    stats.record_suppressed(2)
+    assert (stats.sends, stats.suppressed, stats.missing_codes, stats.timeouts) == (
+        3,
+        2,
+        1,
+        1,
+    )
+    assert stats.as_dict()["latency_p50"] == 0.25
+
+
+async def test_diagnostic_sensors(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    remote_entity_id: str,
+):
+    async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.name_test_commands_sent").state == "0"
+
+    for temperature in (20, 21):
+        await hass.services.async_call(
+            domain=CLIMATE_DOMAIN,
+            service=SERVICE_SET_TEMPERATURE,
+            service_data={ATTR_TEMPERATURE: temperature},
+            target={ATTR_ENTITY_ID: "climate.name_test"},
+            blocking=True,
+        )
+    hass.states.async_set(remote_entity_id, STATE_UNAVAILABLE)
+    await hass.services.async_call(
+        domain=CLIMATE_DOMAIN,
+        service=SERVICE_SET_TEMPERATURE,
+        service_data={ATTR_TEMPERATURE: 22},
+        target={ATTR_ENTITY_ID: "climate.name_test"},
+        blocking=True,
+    )
+    """States are written on interval only"""
+    assert hass.states.get("sensor.name_test_commands_sent").state == "0"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.name_test_commands_sent").state == "2"
+    assert hass.states.get("sensor.name_test_commands_suppressed").state == "1"
+    assert hass.states.get("sensor.name_test_missing_codes").state == "0"
+    assert hass.states.get("sensor.name_test_send_timeouts").state == "0"
+    latency = hass.states.get("sensor.name_test_command_latency")
+    assert float(latency.state) > 0
+    assert latency.attributes["count"] == 2
+    assert latency.attributes["blasters"][remote_entity_id]["count"] == 2
+
+
+def test_transmission_history():
+    stats = DeliveryStats(history_size=2)
+    for command in ("on", "off", "on"):
+        stats.history.append(
+            Transmission(dt_util.utcnow(), "remote.test", command, 0, "delivered", 0.1)
+        )
+    assert [x.commands for x in stats.history] == ["off", "on"]
+    assert DeliveryStats().history.maxlen == 0
@@ -0,0 +1,201 @@
+from datetime import timedelta
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, HVACMode
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import (
+    ATTR_COMMAND,
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    ATTR_TIME,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.climate_remote_control.const import (
+    ATTR_PRECONDITION,
+    ATTR_PRECONDITION_START,
+    DOMAIN,
+    SERVICE_CANCEL_PRECONDITION,
+    SERVICE_PRECONDITION,
+)
+from custom_components.climate_remote_control.hub import async_get_hub
+from custom_components.climate_remote_control.precondition import (
+    LEAD_MARGIN,
+    MAX_LEAD_TIME,
+    get_lead_time,
+)
+from custom_components.climate_remote_control.thermal import ThermalEstimate
+from custom_components.climate_remote_control.timers import TimerQueue
+
+SENSOR = "sensor.sensor_temperature"
+
+ESTIMATE = ThermalEstimate(
+    heating_rate=3.0, cooling_rate=2.5, drift=0.2, ambient=10.0, samples=100
+)
+
+
+def test_lead_time():
+    """Room at 18 heats towards 25, to 21 it takes ln(7 / 4) / 0.2 hours"""
+    assert get_lead_time(ESTIMATE, HVACMode.HEAT, 18, 21) == pytest.approx(
+        2.798 * 3600 * (1 + LEAD_MARGIN), rel=1e-3
+    )
+    assert get_lead_time(ESTIMATE, HVACMode.HEAT, 18, 25) == MAX_LEAD_TIME
+    assert get_lead_time(ESTIMATE, HVACMode.HEAT, 22, 21) == 0
+    assert get_lead_time(ESTIMATE, HVACMode.COOL, 22, 21) > 0
+    assert get_lead_time(ESTIMATE, HVACMode.DRY, 22, 21) == 0
+    assert get_lead_time(None, HVACMode.COOL, 22, 21) == 3600 * (1 + LEAD_MARGIN)
+    assert get_lead_time(None, HVACMode.COOL, None, 21) == 0
+
+
+async def test_timer_queue(hass: HomeAssistant):
+    timers = TimerQueue(hass)
+    fired: list[str] = []
+
+    def job(key: str):
+        async def _async_run() -> None:
+            fired.append(key)
+
+        return _async_run
+
+    now = dt_util.utcnow()
+    start = now.timestamp()
+    timers.async_schedule("a", start + 30, job("a"))
+    timers.async_schedule("b", start + 10, job("b"))
+    timers.async_schedule("c", start + 20, job("c"))
+    timers.async_schedule("b", start + 40, job("b"))
+    timers.async_cancel("c")
+    assert timers.get_fire_time("b") == start + 40
+
+    """Replaced entries don't pile up"""
+    for x in range(100):
+        timers.async_schedule("b", start + 40 + x, job("b"))
+    assert len(timers._heap) <= 2 * len(timers) + 1
+
+    async_fire_time_changed(hass, now + timedelta(seconds=35))
+    await hass.async_block_till_done()
+    assert fired == ["a"]
+    async_fire_time_changed(hass, now + timedelta(seconds=200))
+    await hass.async_block_till_done()
+    assert fired == ["a", "b"]
+    assert len(timers) == 0
+    assert timers._unsubscribe_timer is None
+
+
+async def test_precondition(hass: HomeAssistant, config_entry: MockConfigEntry):
+    hass.states.async_set(SENSOR, "25")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    now = dt_util.utcnow()
+    deadline = now + timedelta(hours=5)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PRECONDITION,
+        {
+            ATTR_ENTITY_ID: "climate.name_test",
+            ATTR_TEMPERATURE: 22,
+            ATTR_TIME: deadline.isoformat(),
+        },
+        blocking=True,
+    )
+    state = hass.states.get("climate.name_test")
+    assert state.state == HVACMode.OFF
+    assert state.attributes[ATTR_PRECONDITION][ATTR_HVAC_MODE] == HVACMode.COOL
+    start = state.attributes[ATTR_PRECONDITION_START]
+    assert start == pytest.approx(
+        deadline - timedelta(hours=3 * (1 + LEAD_MARGIN)), abs=timedelta(seconds=1)
+    )
+
+    """Room which cools by itself starts later"""
+    hass.states.async_set(SENSOR, "24")
+    await hass.async_block_till_done()
+    later = dt_util.utc_from_timestamp(
+        async_get_hub(hass).timers.get_fire_time((ATTR_PRECONDITION, "test"))
+    )
+    assert later > start + timedelta(minutes=30)
+
+    async_fire_time_changed(hass, start + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert calls == []
+    async_fire_time_changed(hass, later + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert [x.data[ATTR_COMMAND] for x in calls] == [
+        ["on"],
+        ["mode:cool_fan:low_temp:22.0"],
+    ]
+    state = hass.states.get("climate.name_test")
+    assert state.state == HVACMode.COOL
+    assert ATTR_PRECONDITION not in state.attributes
+    assert len(async_get_hub(hass).timers) == 0
+
+
+async def test_cancel_precondition(hass: HomeAssistant, config_entry: MockConfigEntry):
+    hass.states.async_set(SENSOR, "25")
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    with pytest.raises(ServiceValidationError, match="has already passed"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PRECONDITION,
+            {
+                ATTR_ENTITY_ID: "climate.name_test",
+                ATTR_TEMPERATURE: 22,
+                ATTR_TIME: (dt_util.utcnow() - timedelta(hours=1)).isoformat(),
+            },
+            blocking=True,
+        )
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PRECONDITION,
+        {ATTR_ENTITY_ID: "climate.name_test", ATTR_TEMPERATURE: 22, ATTR_TIME: "7:00"},
+        blocking=True,
+    )
+    assert len(async_get_hub(hass).timers) == 1
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CANCEL_PRECONDITION,
+        {ATTR_ENTITY_ID: "climate.name_test"},
+        blocking=True,
+    )
+    assert len(async_get_hub(hass).timers) == 0
+    assert ATTR_PRECONDITION not in hass.states.get("climate.name_test").attributes
+
+
+async def test_precondition_restore(hass: HomeAssistant, config_entry: MockConfigEntry):
+    deadline = dt_util.utcnow() + timedelta(hours=5)
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State("climate.name_test", HVACMode.OFF),
+                {
+                    ATTR_TEMPERATURE: 22,
+                    ATTR_PRECONDITION: {
+                        ATTR_TIME: deadline.timestamp(),
+                        ATTR_HVAC_MODE: HVACMode.HEAT,
+                        ATTR_TEMPERATURE: 22,
+                    },
+                },
+            )
+        ],
+    )
+    hass.states.async_set(SENSOR, "20")
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    state = hass.states.get("climate.name_test")
+    assert state.attributes[ATTR_PRECONDITION][ATTR_TIME] == pytest.approx(
+        deadline, abs=timedelta(seconds=1)
+    )
+    assert ATTR_PRECONDITION_START in state.attributes
@@ -0,0 +1,227 @@
+from typing import Any
+
+from homeassistant.components.climate import ATTR_FAN_MODES
+from homeassistant.components.climate import DATA_COMPONENT as CLIMATE_COMPONENT
+from homeassistant.components.climate import HVACMode
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    CONF_DEVICE,
+    CONF_NAME,
+    CONF_TARGET,
+    CONF_UNIQUE_ID,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.climate_remote_control.config_flow import ENTRY_ONLY_OPTIONS
+from custom_components.climate_remote_control.const import (
+    ATTR_PROFILE_ID,
+    CONF_FAN_MODES,
+    CONF_MODE,
+    CONF_OPTIONS,
+    CONF_PROFILE,
+    CONF_SWING,
+    DATA_PROFILES,
+    DOMAIN,
+    SERVICE_REMOVE_PROFILE,
+    SERVICE_SET_PROFILE,
+    SwingMode,
+)
+from custom_components.climate_remote_control.profiles import STORAGE_KEY
+
+ROOMS = 20
+
+
+@pytest.fixture
+def profile(config_entry: MockConfigEntry) -> dict[str, Any]:
+    return {
+        key: value
+        for key, value in config_entry.options.items()
+        if key not in ENTRY_ONLY_OPTIONS
+    }
+
+
+@pytest.fixture
+def profile_entries(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: MockConfigEntry,
+    profile: dict[str, Any],
+) -> list[MockConfigEntry]:
+    """Entries of the same model which keep only their own options."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {DATA_PROFILES: {"lg": profile}},
+    }
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={
+            CONF_DEVICE: "test",
+            CONF_TARGET: config_entry.options[CONF_TARGET],
+            CONF_PROFILE: "lg",
+        },
+    )
+    entries = [config_entry]
+    for x in range(ROOMS - 1):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=f"room_{x}",
+            title=f"room_{x}",
+            data={CONF_UNIQUE_ID: f"room_{x}", CONF_NAME: f"room_{x}"},
+            options=config_entry.options | {CONF_DEVICE: f"room_{x}"},
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    return entries
+
+
+async def test_profile_is_shared(
+    hass: HomeAssistant, profile_entries: list[MockConfigEntry]
+):
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    assert all(x.state == ConfigEntryState.LOADED for x in profile_entries)
+    climates = [
+        hass.data[CLIMATE_COMPONENT].get_entity(f"climate.room_{x}")
+        for x in range(ROOMS - 1)
+    ]
+    assert climates[0]._config.device == "room_0"
+    assert climates[0]._config.profiles is climates[1]._config.profiles
+
+
+async def test_set_profile(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    profile_entries: list[MockConfigEntry],
+    profile: dict[str, Any],
+    record_property,
+):
+    """Entities are updated in place, nothing is reloaded"""
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    climate = hass.data[CLIMATE_COMPONENT].get_entity("climate.name_test")
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {"entity_id": "climate.name_test", "hvac_mode": HVACMode.COOL},
+        blocking=True,
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PROFILE,
+        {
+            ATTR_PROFILE_ID: "lg",
+            CONF_OPTIONS: profile | {CONF_FAN_MODES: ["low", "high"]},
+        },
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+    record_property("wall_time", response["wall_time"])
+    assert len(response["updated"]) == ROOMS
+    assert response["reloaded"] == []
+    assert hass.data[CLIMATE_COMPONENT].get_entity("climate.name_test") is climate
+    state = hass.states.get("climate.name_test")
+    assert state.state == HVACMode.COOL
+    assert state.attributes[ATTR_FAN_MODES] == ["low", "high"]
+    assert hass.states.get("climate.room_0").attributes[ATTR_FAN_MODES] == [
+        "low",
+        "high",
+    ]
+    assert hass_storage[STORAGE_KEY]["data"][DATA_PROFILES]["lg"][CONF_FAN_MODES] == [
+        "low",
+        "high",
+    ]
+
+
+async def test_set_profile_reloads_buttons(
+    hass: HomeAssistant,
+    profile_entries: list[MockConfigEntry],
+    profile: dict[str, Any],
+):
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    assert hass.states.get("button.name_test_swing_vertical") is not None
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PROFILE,
+        {
+            ATTR_PROFILE_ID: "lg",
+            CONF_OPTIONS: profile | {CONF_SWING: {CONF_MODE: SwingMode.STATE}},
+        },
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+    assert len(response["reloaded"]) == ROOMS
+    state = hass.states.get("button.name_test_swing_vertical")
+    assert state.state == STATE_UNAVAILABLE
+
+
+async def test_invalid_profile(
+    hass: HomeAssistant,
+    profile_entries: list[MockConfigEntry],
+    profile: dict[str, Any],
+):
+    """Profile which is invalid for any entry isn't saved"""
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    with pytest.raises(ServiceValidationError, match="hvac_modes"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PROFILE,
+            {ATTR_PROFILE_ID: "lg", CONF_OPTIONS: profile | {"hvac_modes": {}}},
+            blocking=True,
+        )
+    with pytest.raises(ServiceValidationError, match="Invalid options"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_PROFILE,
+            {ATTR_PROFILE_ID: "lg", CONF_OPTIONS: {CONF_DEVICE: "other"}},
+            blocking=True,
+        )
+    assert hass.data[DOMAIN][DATA_PROFILES]["lg"] == profile
+
+
+async def test_remove_profile(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    profile_entries: list[MockConfigEntry],
+    profile: dict[str, Any],
+):
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    with pytest.raises(ServiceValidationError, match="is used by"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_REMOVE_PROFILE, {ATTR_PROFILE_ID: "lg"}, blocking=True
+        )
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_PROFILE,
+        {ATTR_PROFILE_ID: "unused", CONF_OPTIONS: profile},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN, SERVICE_REMOVE_PROFILE, {ATTR_PROFILE_ID: "unused"}, blocking=True
+    )
+    assert set(hass_storage[STORAGE_KEY]["data"][DATA_PROFILES]) == {"lg"}
+
+
+async def test_missing_profile(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+):
+    hass.config_entries.async_update_entry(
+        config_entry, options=config_entry.options | {CONF_PROFILE: "missing"}
+    )
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    assert config_entry.state == ConfigEntryState.SETUP_ERROR
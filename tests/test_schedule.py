@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_COMMAND, Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.climate_remote_control.const import CONF_SCHEDULE, DOMAIN
+from custom_components.climate_remote_control.hub import async_get_hub
+from custom_components.climate_remote_control.schedule import (
+    ScheduleEvent,
+    get_next_state,
+    schedule_from_options,
+)
+
+
+def test_schedule_from_options():
+    assert schedule_from_options({}) == ()
+    (event,) = schedule_from_options(
+        {
+            CONF_SCHEDULE: [
+                {"at": "07:30", "weekday": ["sat", "sun"], "hvac_mode": "heat"}
+            ]
+        }
+    )
+    assert event.weekdays == {5, 6}
+    assert event.state == (("hvac_mode", HVACMode.HEAT),)
+    for options in (
+        {"hvac_mode": "heat"},
+        {"at": "7:30:00", "hvac_mode": "heat"},
+        {"at": "07:30", "weekday": ["someday"], "hvac_mode": "heat"},
+        {"at": "07:30"},
+    ):
+        with pytest.raises(ValueError):
+            ScheduleEvent.from_options(options)
+
+
+async def test_get_next_state(hass: HomeAssistant):
+    """Monday in local time zone"""
+    now = datetime(2026, 10, 19, 12, 0, tzinfo=dt_util.get_default_time_zone())
+    schedule = schedule_from_options(
+        {
+            CONF_SCHEDULE: [
+                {"at": "07:00", "weekday": ["mon", "tue"], "hvac_mode": "heat"},
+                {"at": "18:00", "weekday": ["mon"], "hvac_mode": "off"},
+                {"at": "07:00", "weekday": ["tue"], "temperature": 21},
+            ]
+        }
+    )
+    fire_at, state = get_next_state(schedule, now)
+    assert fire_at == now.replace(hour=18)
+    assert state == {"hvac_mode": HVACMode.OFF}
+
+    """Events at the same time are merged"""
+    fire_at, state = get_next_state(schedule, fire_at)
+    assert fire_at == now.replace(hour=7) + timedelta(days=1)
+    assert state == {"hvac_mode": HVACMode.HEAT, "temperature": 21}
+
+    fire_at, _state = get_next_state(schedule, fire_at)
+    assert fire_at == now.replace(hour=7) + timedelta(days=7)
+    assert get_next_state((), now) is None
+
+
+async def test_schedule_applies_state(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+):
+    now = dt_util.now().replace(microsecond=0)
+    first = now + timedelta(minutes=1)
+    second = now + timedelta(minutes=2)
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {
+            CONF_SCHEDULE: [
+                {
+                    "at": first.time().isoformat(),
+                    "hvac_mode": "cool",
+                    "temperature": 22,
+                },
+                {"at": second.time().isoformat(), "temperature": 22},
+            ]
+        },
+    )
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    timers = async_get_hub(hass).timers
+    assert timers.get_fire_time((CONF_SCHEDULE, "test")) == first.timestamp()
+
+    async_fire_time_changed(hass, first)
+    await hass.async_block_till_done()
+    assert [x.data[ATTR_COMMAND] for x in calls] == [
+        ["on"],
+        ["mode:cool_fan:low_temp:22.0"],
+    ]
+    assert hass.states.get("climate.name_test").state == HVACMode.COOL
+    assert timers.get_fire_time((CONF_SCHEDULE, "test")) == second.timestamp()
+
+    """State which is already applied isn't sent again"""
+    async_fire_time_changed(hass, second)
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert (
+        timers.get_fire_time((CONF_SCHEDULE, "test"))
+        == (first + timedelta(days=1)).timestamp()
+    )
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert len(timers) == 0
@@ -0,0 +1,412 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from homeassistant.components.climate import (
+    ATTR_FAN_MODE,
+    ATTR_HVAC_MODE,
+)
+from homeassistant.components.climate import DATA_COMPONENT as CLIMATE_COMPONENT
+from homeassistant.components.climate import FAN_LOW, HVACMode
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_COMMAND,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    CONF_DEVICE,
+    CONF_NAME,
+    CONF_TARGET,
+    CONF_UNIQUE_ID,
+    Platform,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from custom_components.climate_remote_control.const import (
+    ATTR_DOCUMENT,
+    ATTR_ENTRIES,
+    ATTR_MAX_LANES,
+    CONF_CODE_FILE,
+    CONF_CODE_TABLE,
+    DOMAIN,
+    SERVICE_EXPORT_OPTIONS,
+    SERVICE_IMPORT_OPTIONS,
+    SERVICE_SET_ALL,
+)
+from custom_components.climate_remote_control.services import _get_lanes
+
+
+def _add_config_entry(
+    hass: HomeAssistant, config_entry: MockConfigEntry, name: str, remote: str
+) -> MockConfigEntry:
+    other_config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=name,
+        title=name,
+        data={CONF_UNIQUE_ID: name, CONF_NAME: name},
+        options=config_entry.options
+        | {
+            CONF_TARGET: {
+                ATTR_ENTITY_ID: [remote],
+                ATTR_DEVICE_ID: [],
+                ATTR_AREA_ID: [],
+            }
+        },
+    )
+    other_config_entry.add_to_hass(hass)
+    return other_config_entry
+
+
+async def test_set_all(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    remote_entity_id: str,
+):
+    _add_config_entry(hass, config_entry, "bedroom", remote_entity_id)
+    _add_config_entry(hass, config_entry, "kitchen", "remote.kitchen")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ALL,
+        {ATTR_HVAC_MODE: HVACMode.OFF},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["results"] == {
+        "climate.bedroom": "unchanged",
+        "climate.kitchen": "unchanged",
+        "climate.name_test": "unchanged",
+    }
+    assert response["wall_time"] >= 0
+    assert len(calls) == 0
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ALL,
+        {ATTR_HVAC_MODE: HVACMode.HEAT, ATTR_FAN_MODE: FAN_LOW, ATTR_TEMPERATURE: 22},
+        blocking=True,
+        return_response=True,
+    )
+    assert set(response["results"].values()) == {"changed"}
+    """Devices which share the remote are changed one by one in its lane"""
+    commands = {remote_entity_id: [], "remote.kitchen": []}
+    for call in calls:
+        commands[call.data[ATTR_ENTITY_ID][0]].append(call.data[ATTR_COMMAND][0])
+    assert commands == {
+        remote_entity_id: ["on", "mode:heat_fan:low_temp:22.0"] * 2,
+        "remote.kitchen": ["on", "mode:heat_fan:low_temp:22.0"],
+    }
+    state = hass.states.get("climate.kitchen")
+    assert state.state == HVACMode.HEAT
+    assert state.attributes[ATTR_FAN_MODE] == FAN_LOW
+    assert state.attributes[ATTR_TEMPERATURE] == 22
+
+    calls.clear()
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ALL,
+        {ATTR_FAN_MODE: "unknown"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["results"]["climate.kitchen"] == (
+        "fan_mode unknown is not supported by climate.kitchen"
+    )
+    assert len(calls) == 0
+
+
+def test_set_all_lanes():
+    """Entity with several blasters joins their lanes"""
+    entities = [
+        SimpleNamespace(remote_entity_ids=ids)
+        for ids in (
+            ("remote.a",),
+            ("remote.b",),
+            ("remote.c",),
+            ("remote.a", "remote.b"),
+            (),
+            (),
+        )
+    ]
+    assert _get_lanes(entities) == [
+        [entities[2]],
+        [entities[0], entities[1], entities[3]],
+        [entities[4], entities[5]],
+    ]
+
+
+async def test_set_all_bounded_lanes(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+):
+    _add_config_entry(hass, config_entry, "kitchen", "remote.kitchen")
+    _add_config_entry(hass, config_entry, "bedroom", "remote.bedroom")
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    running = []
+    concurrency = []
+
+    async def _async_apply_state(state):
+        running.append(None)
+        concurrency.append(len(running))
+        await asyncio.sleep(0)
+        running.pop()
+        return True
+
+    component = hass.data[CLIMATE_COMPONENT]
+    with (
+        patch.object(
+            component.get_entity("climate.name_test"),
+            "async_apply_state",
+            side_effect=RuntimeError("boom"),
+        ),
+        patch.object(
+            component.get_entity("climate.kitchen"),
+            "async_apply_state",
+            _async_apply_state,
+        ),
+        patch.object(
+            component.get_entity("climate.bedroom"),
+            "async_apply_state",
+            _async_apply_state,
+        ),
+    ):
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_ALL,
+            {ATTR_HVAC_MODE: HVACMode.COOL},
+            blocking=True,
+            return_response=True,
+        )
+        assert max(concurrency) == 2
+        """Unexpected error of one entity doesn't stop the others"""
+        assert response["results"] == {
+            "climate.bedroom": "changed",
+            "climate.kitchen": "changed",
+            "climate.name_test": "RuntimeError: boom",
+        }
+
+        concurrency.clear()
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_ALL,
+            {ATTR_HVAC_MODE: HVACMode.COOL, ATTR_MAX_LANES: 1},
+            blocking=True,
+        )
+        assert concurrency == [1, 1]
+
+
+async def test_set_all_filtered_by_area(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+):
+    _add_config_entry(hass, config_entry, "kitchen", "remote.kitchen")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    area = ar.async_get(hass).async_create("Kitchen")
+    er.async_get(hass).async_update_entity("climate.kitchen", area_id=area.id)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ALL,
+        {ATTR_HVAC_MODE: HVACMode.COOL},
+        blocking=True,
+    )
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ALL,
+        {ATTR_HVAC_MODE: HVACMode.OFF, ATTR_AREA_ID: area.id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["results"] == {"climate.kitchen": "changed"}
+    assert calls[-1].data[ATTR_COMMAND] == ["off"]
+    assert hass.states.get("climate.kitchen").state == HVACMode.OFF
+    assert hass.states.get("climate.name_test").state == HVACMode.COOL
+
+
+async def test_export_import_options(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+):
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+
+    document = await hass.services.async_call(
+        DOMAIN, SERVICE_EXPORT_OPTIONS, blocking=True, return_response=True
+    )
+    assert document[ATTR_ENTRIES] == {
+        "test": {CONF_NAME: "name_test", "options": config_entry.options}
+    }
+
+    entries = document[ATTR_ENTRIES] | {
+        f"room_{x}": {"options": config_entry.options | {CONF_DEVICE: f"room_{x}"}}
+        for x in range(100)
+    }
+    entries["test"] = {
+        CONF_NAME: "renamed",
+        "options": {CONF_DEVICE: "renamed"},
+    }
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_IMPORT_OPTIONS,
+        {ATTR_DOCUMENT: json.dumps({ATTR_ENTRIES: entries})},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+    assert len(response["created"]) == 100
+    assert response["updated"] == ["test"]
+    assert config_entry.title == "renamed"
+    assert config_entry.options[CONF_DEVICE] == "renamed"
+    assert (
+        config_entry.options[CONF_TARGET]
+        == document[ATTR_ENTRIES]["test"]["options"][CONF_TARGET]
+    )
+    assert hass.states.get("climate.room_99") is not None
+    assert len(hass.config_entries.async_loaded_entries(DOMAIN)) == 101
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_IMPORT_OPTIONS,
+        {ATTR_ENTRIES: entries},
+        blocking=True,
+        return_response=True,
+    )
+    assert len(response["unchanged"]) == 101
+
+
+async def test_import_code_files(
+    hass: HomeAssistant, config_entry: MockConfigEntry, tmp_path
+):
+    """Every entry gets its own table compiled from the imported code file"""
+    hass.config.config_dir = str(tmp_path)
+    code_file = tmp_path / "codes.json"
+    code_file.write_text(
+        '{"supportedController": "Broadlink", "commandsEncoding": "Base64",'
+        ' "commands": {"off": "b2Zm"}}'
+    )
+    storage = tmp_path / STORAGE_DIR / DOMAIN
+    shared = os.path.join(STORAGE_DIR, DOMAIN, "shared.codes")
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {CONF_CODE_FILE: str(code_file), CONF_CODE_TABLE: shared},
+    )
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+
+    document = await hass.services.async_call(
+        DOMAIN, SERVICE_EXPORT_OPTIONS, blocking=True, return_response=True
+    )
+    assert CONF_CODE_TABLE not in document[ATTR_ENTRIES]["test"]["options"]
+
+    entries = document[ATTR_ENTRIES] | {
+        "room": {
+            "options": config_entry.options
+            | {CONF_DEVICE: "room", CONF_CODE_TABLE: shared}
+        }
+    }
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_IMPORT_OPTIONS,
+        {ATTR_ENTRIES: entries},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_block_till_done()
+    assert response["created"] == ["room"]
+    assert response["updated"] == ["test"]
+    room = hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, "room")
+    tables = set()
+    for entry in (config_entry, room):
+        code_table = entry.options[CONF_CODE_TABLE]
+        assert code_table == os.path.join(
+            STORAGE_DIR, DOMAIN, entry.entry_id + ".codes"
+        )
+        assert os.path.isfile(hass.config.path(code_table))
+        tables.add(code_table)
+    assert len(tables) == 2
+    assert sorted(os.listdir(storage)) == sorted(os.path.basename(x) for x in tables)
+
+    """Removed entry takes only its own table"""
+    await hass.config_entries.async_remove(room.entry_id)
+    await hass.async_block_till_done()
+    assert os.listdir(storage) == [config_entry.entry_id + ".codes"]
+
+    """Code file which doesn't compile fails the whole import"""
+    code_file.write_text("{}")
+    entries = {
+        "test": {"options": {CONF_CODE_FILE: str(code_file)}},
+        "other": {"options": config_entry.options | {CONF_DEVICE: "other"}},
+    }
+    with pytest.raises(ServiceValidationError, match="test:"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_OPTIONS,
+            {ATTR_ENTRIES: entries},
+            blocking=True,
+            return_response=True,
+        )
+    assert hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, "other") is None
+    assert os.listdir(storage) == [config_entry.entry_id + ".codes"]
+
+
+async def test_import_invalid_options(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+):
+    """Nothing is applied if any entry is invalid"""
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    document = """
+entries:
+  test:
+    options:
+      device: changed
+  new_room:
+    options:
+      device: new_room
+  broken:
+    options:
+      temperature_step: 100
+"""
+    with pytest.raises(ServiceValidationError) as ex:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_OPTIONS,
+            {ATTR_DOCUMENT: document},
+            blocking=True,
+            return_response=True,
+        )
+    assert "test" not in str(ex.value)
+    assert "new_room: hvac_modes is required" in str(ex.value)
+    assert "broken: value must be at most 10" in str(ex.value)
+    assert config_entry.options[CONF_DEVICE] == "test"
+    assert len(hass.config_entries.async_entries(DOMAIN)) == 1
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_IMPORT_OPTIONS,
+            {ATTR_DOCUMENT: "entries: ["},
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.climate_remote_control.const import DATA_HUB, DOMAIN
+from custom_components.climate_remote_control.hub import async_unload_hub
+from custom_components.climate_remote_control.target import RemoteTarget
+
+
+def _create_remote(
+    hass: HomeAssistant, name: str, area_id: str | None = None
+) -> tuple[str, str]:
+    config_entry = MockConfigEntry(domain="broadlink")
+    config_entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("broadlink", name)},
+    )
+    if area_id is not None:
+        dr.async_get(hass).async_update_device(device.id, area_id=area_id)
+    entity = er.async_get(hass).async_get_or_create(
+        "remote",
+        "broadlink",
+        name,
+        config_entry=config_entry,
+        device_id=device.id,
+        suggested_object_id=name,
+    )
+    er.async_get(hass).async_get_or_create(
+        "switch",
+        "broadlink",
+        name,
+        config_entry=config_entry,
+        device_id=device.id,
+    )
+    return device.id, entity.entity_id
+
+
+async def test_resolve_entities(hass: HomeAssistant):
+    target = RemoteTarget(
+        hass,
+        {
+            ATTR_ENTITY_ID: ["remote.b", "remote.a", "switch.ignored"],
+            ATTR_DEVICE_ID: [],
+            ATTR_AREA_ID: [],
+        },
+    )
+    assert target.entity_ids == ("remote.a", "remote.b")
+
+
+async def test_resolve_devices_and_areas(hass: HomeAssistant):
+    area = ar.async_get(hass).async_create("Living room")
+    device_id, remote_entity_id = _create_remote(hass, "bedroom")
+    _, area_remote_entity_id = _create_remote(hass, "living_room", area.id)
+
+    target = RemoteTarget(
+        hass,
+        {
+            ATTR_ENTITY_ID: [],
+            ATTR_DEVICE_ID: [device_id],
+            ATTR_AREA_ID: [area.id],
+        },
+    )
+    assert target.entity_ids == tuple(sorted([remote_entity_id, area_remote_entity_id]))
+
+
+async def test_resolution_is_cached(hass: HomeAssistant):
+    target = RemoteTarget(hass, {ATTR_ENTITY_ID: ["remote.a"]})
+    with patch(
+        "custom_components.climate_remote_control.target.async_extract_referenced_entity_ids",
+        wraps=async_extract_referenced_entity_ids,
+    ) as mock_extract:
+        assert target.entity_ids == ("remote.a",)
+        assert target.entity_ids == ("remote.a",)
+        assert mock_extract.call_count == 1
+
+
+async def test_resolution_is_invalidated_by_registry_updates(hass: HomeAssistant):
+    area = ar.async_get(hass).async_create("Living room")
+    target = RemoteTarget(hass, {ATTR_AREA_ID: [area.id]})
+    assert target.entity_ids == ()
+
+    _, remote_entity_id = _create_remote(hass, "living_room", area.id)
+    await hass.async_block_till_done()
+    assert target.entity_ids == (remote_entity_id,)
+
+    dr.async_get(hass).async_update_device(
+        er.async_get(hass).async_get(remote_entity_id).device_id, area_id=None
+    )
+    await hass.async_block_till_done()
+    assert target.entity_ids == ()
+
+
+async def test_unload_hub(hass: HomeAssistant):
+    RemoteTarget(hass, {ATTR_ENTITY_ID: ["remote.a"]})
+    assert DATA_HUB in hass.data[DOMAIN]
+    async_unload_hub(hass)
+    assert DATA_HUB not in hass.data[DOMAIN]
@@ -0,0 +1,161 @@
+import random
+import time
+
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import SERVICE_SET_HVAC_MODE, HVACMode
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_ENTITY_ID, STATE_UNKNOWN, Platform
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers.entity_component import async_update_entity
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.climate_remote_control.const import (
+    ATTR_THERMAL_MODEL,
+    DOMAIN,
+)
+from custom_components.climate_remote_control.hub import async_get_hub
+from custom_components.climate_remote_control.thermal import (
+    MIN_INTERVAL,
+    MIN_SAMPLES,
+    STRIDE,
+    ThermalModels,
+)
+
+SENSOR = "sensor.sensor_temperature"
+
+
+def simulate_room(models: ThermalModels, key: str, days: int = 3) -> None:
+    """Room heated in the morning and cooled in the afternoon, sampled by noisy sensor"""
+    rng = random.Random(1)
+    temperature = 18.0
+    heat = cool = False
+    interval = 300
+    for step in range(days * 24 * 3600 // interval):
+        now = step * interval
+        if (now / 3600) % 24 < 12:
+            heat, cool = temperature < (22 if heat else 21), False
+        else:
+            heat, cool = False, temperature > 15
+        models.observe(key, temperature + rng.gauss(0, 0.05), now, heat, cool)
+        for _ in range(10):
+            rate = 0.2 * (10 - temperature) + 3.0 * heat - 2.5 * cool
+            temperature += rate * interval / 10 / 3600
+
+
+def test_estimate_converges():
+    models = ThermalModels()
+    models.add("room")
+    simulate_room(models, "room")
+    estimate = models.estimate("room")
+    assert estimate.heating_rate == pytest.approx(3.0, rel=0.05)
+    assert estimate.cooling_rate == pytest.approx(2.5, rel=0.05)
+    assert estimate.drift == pytest.approx(0.2, rel=0.1)
+    assert estimate.ambient == pytest.approx(10, abs=0.5)
+
+
+def test_short_intervals():
+    models = ThermalModels()
+    models.add("room")
+    assert models.observe("room", 20, 0, False, False) is False
+    assert models.observe("room", 20.1, MIN_INTERVAL / 2, False, False) is False
+    assert models.observe("room", 20.2, MIN_INTERVAL, False, False) is True
+
+    """Interval in which the unit was switched is dropped"""
+    models.interrupt("room", False, True, MIN_INTERVAL * 1.5)
+    assert models.observe("room", 20.2, MIN_INTERVAL * 3, False, True) is False
+    assert models.observe("room", 20, MIN_INTERVAL * 4, False, True) is True
+
+    """Switch right after the reading keeps the interval"""
+    models.interrupt("room", False, False, MIN_INTERVAL * 4 + 1)
+    assert models.observe("room", 20, MIN_INTERVAL * 5, False, False) is True
+
+    """Clock which went back starts a new interval"""
+    assert models.observe("room", 20, 0, False, False) is False
+    assert models.estimate("room") is None
+
+
+def test_slots():
+    models = ThermalModels()
+    models.add("first")
+    models.add("second")
+    simulate_room(models, "first", days=1)
+    state = models.get_state("first")
+    assert len(state) == STRIDE
+    estimate = models.estimate("first")
+
+    models.remove("first")
+    assert len(models) == 1
+    assert models.estimate("first") is None
+    assert models.observe("first", 20, 0, False, False) is False
+
+    """Saved state is restored in the free slot"""
+    models.add("third", state)
+    assert len(models._data) == 2 * STRIDE
+    assert models.estimate("third") == estimate
+    assert models.estimate("second") is None
+
+
+async def test_entity_learns_from_sensor(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+):
+    hass.states.async_set(SENSOR, "25")
+    async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.name_test_cooling_rate").state == STATE_UNKNOWN
+
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: "climate.name_test", "hvac_mode": HVACMode.COOL},
+        blocking=True,
+    )
+    temperature = 25.0
+    now = time.time()
+    for _ in range(MIN_SAMPLES + 1):
+        now += 600
+        temperature -= 0.5
+        hass.states.async_set(SENSOR, str(temperature), timestamp=now)
+        await hass.async_block_till_done()
+
+    await async_update_entity(hass, "sensor.name_test_cooling_rate")
+    state = hass.states.get("sensor.name_test_cooling_rate")
+    assert float(state.state) > 0
+    assert state.attributes["unit_of_measurement"] == "°C/h"
+    assert len(async_get_hub(hass).thermal) == 1
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert len(async_get_hub(hass).thermal) == 0
+
+
+async def test_entity_restores_model(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+):
+    models = ThermalModels()
+    models.add("room")
+    simulate_room(models, "room")
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State("climate.name_test", HVACMode.OFF),
+                {ATTR_THERMAL_MODEL: models.get_state("room")},
+            )
+        ],
+    )
+    hass.states.async_set(SENSOR, "25")
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.name_test_estimated_ambient_temperature")
+    assert float(state.state) == pytest.approx(10, abs=0.5)
+    assert float(
+        hass.states.get("sensor.name_test_thermal_time_constant").state
+    ) == pytest.approx(5, rel=0.1)
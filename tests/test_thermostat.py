@@ -0,0 +1,251 @@
+from homeassistant.components.climate import (
+    ATTR_HVAC_ACTION,
+)
+from homeassistant.components.climate import DATA_COMPONENT as CLIMATE_COMPONENT
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import (
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.components.remote import SERVICE_SEND_COMMAND
+from homeassistant.const import ATTR_COMMAND, ATTR_ENTITY_ID, ATTR_TEMPERATURE, Platform
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.climate_remote_control.const import (
+    ATTR_THERMOSTAT_RUNNING,
+    CONF_HYSTERESIS,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
+    CONF_THERMOSTAT,
+    DOMAIN,
+)
+from custom_components.climate_remote_control.thermostat import (
+    Thermostat,
+    ThermostatOptions,
+)
+
+SENSOR = "sensor.sensor_temperature"
+
+
+def test_thermostat_options():
+    assert ThermostatOptions.from_options({}) is None
+    assert ThermostatOptions.from_options({CONF_THERMOSTAT: None}) is None
+    assert ThermostatOptions.from_options(
+        {CONF_THERMOSTAT: {CONF_HYSTERESIS: 1}}
+    ) == ThermostatOptions(hysteresis=1.0)
+
+
+def test_hysteresis():
+    options = ThermostatOptions(hysteresis=0.5, min_on_time=0, min_off_time=0)
+    thermostat = Thermostat()
+    assert thermostat.update(options, HVACMode.COOL, 24, 22, 0) is None
+    assert thermostat.running is True
+
+    """Noise inside the band doesn't switch the unit"""
+    assert thermostat.update(options, HVACMode.COOL, 22.4, 22, 1) is None
+    assert thermostat.update(options, HVACMode.COOL, 21.5, 22, 2) is False
+    assert thermostat.update(options, HVACMode.COOL, 21.8, 22, 3) is None
+    assert thermostat.update(options, HVACMode.COOL, 22.4, 22, 4) is None
+    assert thermostat.update(options, HVACMode.COOL, None, 22, 5) is None
+    assert thermostat.update(options, HVACMode.COOL, 22.5, 22, 6) is True
+
+    assert thermostat.update(options, HVACMode.HEAT, 22.5, 22, 7) is False
+    assert thermostat.update(options, HVACMode.HEAT, 21.5, 22, 8) is True
+    assert thermostat.update(options, HVACMode.HEAT, 22.5, 22, 9) is False
+    assert thermostat.update(options, HVACMode.DRY, 22.5, 22, 10) is True
+
+
+def test_min_cycle_time():
+    options = ThermostatOptions(hysteresis=0.5, min_on_time=60, min_off_time=120)
+    thermostat = Thermostat()
+    assert thermostat.update(options, HVACMode.HEAT, 20, 22, 0) is None
+
+    assert thermostat.update(options, HVACMode.HEAT, 23, 22, 30) is None
+    assert thermostat.retry_at == 60
+    assert thermostat.update(options, HVACMode.HEAT, 23, 22, 60) is False
+    assert thermostat.retry_at is None
+
+    assert thermostat.update(options, HVACMode.HEAT, 21, 22, 100) is None
+    assert thermostat.retry_at == 180
+    assert thermostat.update(options, HVACMode.HEAT, 21, 22, 180) is True
+
+    """Turning off and on by user starts a new cycle, off time counts from off"""
+    assert thermostat.update(options, HVACMode.OFF, 21, 22, 200) is None
+    assert thermostat.update(options, HVACMode.HEAT, 23, 22, 210) is None
+    assert thermostat.running is False
+    assert thermostat.update(options, HVACMode.HEAT, 21, 22, 300) is None
+    assert thermostat.retry_at == 320
+
+
+def test_start_on_demand():
+    options = ThermostatOptions(hysteresis=0.5, min_on_time=60, min_off_time=60)
+    thermostat = Thermostat()
+    assert thermostat.update(options, HVACMode.OFF, 22, 22, 0) is None
+    assert thermostat.update(options, HVACMode.COOL, 22.2, 22, 10) is None
+    assert thermostat.running is False
+    assert thermostat.update(options, HVACMode.OFF, 22, 22, 20) is None
+    assert thermostat.update(options, HVACMode.COOL, None, 22, 30) is None
+    assert thermostat.running is True
+    assert thermostat.update(options, HVACMode.OFF, 22, 22, 40) is None
+    assert thermostat.update(options, HVACMode.HEAT, 21, 22, 50) is None
+    assert thermostat.running is True
+
+
+@pytest.fixture
+def thermostat_entry(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> MockConfigEntry:
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options=config_entry.options
+        | {
+            CONF_THERMOSTAT: {
+                CONF_HYSTERESIS: 0.5,
+                CONF_MIN_ON_TIME: 0,
+                CONF_MIN_OFF_TIME: 0,
+            }
+        },
+    )
+    return config_entry
+
+
+async def test_thermostat_switches_unit(
+    hass: HomeAssistant, thermostat_entry: MockConfigEntry
+):
+    hass.states.async_set(SENSOR, "25")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_ENTITY_ID: "climate.name_test", ATTR_TEMPERATURE: 22},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: "climate.name_test", "hvac_mode": HVACMode.COOL},
+        blocking=True,
+    )
+    state = hass.states.get("climate.name_test")
+    assert state.attributes[ATTR_HVAC_ACTION] == HVACAction.COOLING
+    calls.clear()
+
+    for temperature in ("22.3", "21.9", "21.5", "21.6", "21.8"):
+        hass.states.async_set(SENSOR, temperature)
+        await hass.async_block_till_done()
+    assert [x.data[ATTR_COMMAND] for x in calls] == [["off"]]
+    state = hass.states.get("climate.name_test")
+    assert state.state == HVACMode.COOL
+    assert state.attributes[ATTR_HVAC_ACTION] == HVACAction.IDLE
+
+    """Changes of the held unit are sent when it starts"""
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_ENTITY_ID: "climate.name_test", ATTR_TEMPERATURE: 23},
+        blocking=True,
+    )
+    assert len(calls) == 1
+    hass.states.async_set(SENSOR, "23.5")
+    await hass.async_block_till_done()
+    assert [x.data[ATTR_COMMAND] for x in calls[1:]] == [
+        ["on"],
+        ["mode:cool_fan:low_temp:23.0"],
+    ]
+    state = hass.states.get("climate.name_test")
+    assert state.attributes[ATTR_HVAC_ACTION] == HVACAction.COOLING
+
+
+async def test_thermostat_start_without_demand(
+    hass: HomeAssistant, thermostat_entry: MockConfigEntry
+):
+    """Room which needs nothing gets no frames when the mode is selected"""
+    hass.states.async_set(SENSOR, "21")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_ENTITY_ID: "climate.name_test", ATTR_TEMPERATURE: 22},
+        blocking=True,
+    )
+    calls.clear()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_ENTITY_ID: "climate.name_test", "hvac_mode": HVACMode.COOL},
+        blocking=True,
+    )
+    assert calls == []
+    state = hass.states.get("climate.name_test")
+    assert state.state == HVACMode.COOL
+    assert state.attributes[ATTR_HVAC_ACTION] == HVACAction.IDLE
+
+    hass.states.async_set(SENSOR, "22.5")
+    await hass.async_block_till_done()
+    assert [x.data[ATTR_COMMAND] for x in calls] == [
+        ["on"],
+        ["mode:cool_fan:low_temp:22.0"],
+    ]
+
+
+async def test_thermostat_blocked_switch(
+    hass: HomeAssistant, thermostat_entry: MockConfigEntry
+):
+    """Switch which is blocked by minimal run time is evaluated again by timer"""
+    hass.config_entries.async_update_entry(
+        thermostat_entry,
+        options=thermostat_entry.options | {CONF_THERMOSTAT: {CONF_MIN_ON_TIME: 60}},
+    )
+    hass.states.async_set(SENSOR, "25")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    climate = hass.data[CLIMATE_COMPONENT].get_entity("climate.name_test")
+    await climate.async_set_hvac_mode(HVACMode.COOL)
+    calls.clear()
+
+    hass.states.async_set(SENSOR, "16")
+    await hass.async_block_till_done()
+    assert calls == []
+    assert climate._unsubscribe_thermostat_retry is not None
+
+    await hass.config_entries.async_unload(thermostat_entry.entry_id)
+    assert climate._unsubscribe_thermostat_retry is None
+
+
+async def test_thermostat_restore(
+    hass: HomeAssistant, thermostat_entry: MockConfigEntry
+):
+    """Unit which was held off stays off after restart"""
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State("climate.name_test", HVACMode.COOL),
+                {ATTR_TEMPERATURE: 22, ATTR_THERMOSTAT_RUNNING: False},
+            )
+        ],
+    )
+    hass.states.async_set(SENSOR, "22")
+    calls = async_mock_service(hass, Platform.REMOTE, SERVICE_SEND_COMMAND)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    state = hass.states.get("climate.name_test")
+    assert state.attributes[ATTR_HVAC_ACTION] == HVACAction.IDLE
+
+    hass.states.async_set(SENSOR, "23")
+    await hass.async_block_till_done()
+    assert calls[0].data[ATTR_COMMAND] == ["on"]
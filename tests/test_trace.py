@@ -0,0 +1,112 @@
+from pathlib import Path
+
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+)
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate import (
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACMode,
+)
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    CONF_DEVICE,
+    CONF_NAME,
+    CONF_TARGET,
+    CONF_UNIQUE_ID,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.climate_remote_control.const import DOMAIN
+
+from .fake_remote import FakeRemote
+from .trace import TraceRecorder, async_replay, load_trace
+
+TRACES = Path(__file__).parent / "traces"
+
+
+async def test_record_trace(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_remote: FakeRemote,
+    tmp_path: Path,
+):
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    recorder = TraceRecorder(hass, {"climate.name_test"})
+    recorder.async_start()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_TEMPERATURE: 21},
+        target={ATTR_ENTITY_ID: "climate.name_test"},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_HVAC_MODE,
+        {ATTR_HVAC_MODE: HVACMode.OFF},
+        target={ATTR_ENTITY_ID: ["climate.name_test", "climate.other"]},
+        blocking=True,
+    )
+    recorder.async_stop()
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_TEMPERATURE: 22, ATTR_ENTITY_ID: "climate.name_test"},
+        blocking=True,
+    )
+
+    assert [(x.service, x.data) for x in recorder.calls] == [
+        (
+            SERVICE_SET_TEMPERATURE,
+            {ATTR_TEMPERATURE: 21, ATTR_ENTITY_ID: ["climate.name_test"]},
+        ),
+        (
+            SERVICE_SET_HVAC_MODE,
+            {ATTR_HVAC_MODE: HVACMode.OFF, ATTR_ENTITY_ID: ["climate.name_test"]},
+        ),
+    ]
+    assert 0 <= recorder.calls[0].time <= recorder.calls[1].time
+    recorder.save(tmp_path / "trace.jsonl")
+    assert load_trace(tmp_path / "trace.jsonl") == recorder.calls
+
+
+async def test_replay_household_trace(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    fake_remote: FakeRemote,
+    record_property,
+):
+    """Two units behind one blaster, traffic of one evening."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="bedroom",
+        title="bedroom",
+        data={CONF_UNIQUE_ID: "bedroom", CONF_NAME: "bedroom"},
+        options=config_entry.options | {CONF_DEVICE: "bedroom"},
+    ).add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {}) is True
+    await hass.async_block_till_done()
+    calls = load_trace(TRACES / "household.jsonl")
+
+    report = await async_replay(hass, fake_remote, calls, speed=100, max_gap=0.05)
+    record_property("wall_time", report.wall_time)
+    record_property("frames", report.frames)
+    for entity_id, busy_time in report.busy_time.items():
+        record_property(f"busy_time_{entity_id}", busy_time)
+
+    assert report.calls == 29
+    assert report.divergent == []
+    assert fake_remote.overlaps == 0
+    """Each call sends at most one frame, turning on sends two"""
+    assert report.frames <= report.calls + 2
+    assert set(report.busy_time) == {
+        config_entry.options[CONF_TARGET][ATTR_ENTITY_ID][0]
+    }
+    assert hass.states.get("climate.bedroom").state == HVACMode.OFF
+    assert hass.states.get("climate.name_test").state == HVACMode.AUTO
@@ -0,0 +1,163 @@
+"""Record and replay of climate service calls.
+
+Trace is a JSON lines file, each line is a service call with the time in seconds
+since the start of recording. Replay sends the calls against FakeRemote faster
+than they were recorded and measures what reached the air.
+"""
+
+import asyncio
+from collections.abc import Container
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import time
+from typing import Any, NamedTuple
+
+from homeassistant.components.climate import DATA_COMPONENT as CLIMATE_COMPONENT
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.const import (
+    ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
+    ATTR_SERVICE,
+    ATTR_SERVICE_DATA,
+    EVENT_CALL_SERVICE,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+
+from .fake_remote import FakeRemote
+
+
+class TraceCall(NamedTuple):
+    """Recorded service call"""
+
+    time: float
+    service: str
+    data: dict[str, Any]
+
+
+class TraceRecorder:
+    """Records climate service calls which target the given entities."""
+
+    def __init__(
+        self, hass: HomeAssistant, entity_ids: Container[str] | None = None
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entity_ids = entity_ids
+        self.calls: list[TraceCall] = []
+        self._start = 0.0
+        self._unsubscribe: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start recording, time of calls is counted from now."""
+        self._start = time.time()
+        self._unsubscribe = self.hass.bus.async_listen(
+            EVENT_CALL_SERVICE, self._async_call_service
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop recording."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def _async_call_service(self, event: Event) -> None:
+        if event.data[ATTR_DOMAIN] != CLIMATE_DOMAIN:
+            return
+        data = dict(event.data[ATTR_SERVICE_DATA])
+        entity_ids = cv.ensure_list(data.get(ATTR_ENTITY_ID))
+        if self.entity_ids is not None:
+            entity_ids = [x for x in entity_ids if x in self.entity_ids]
+            if not entity_ids:
+                return
+        data[ATTR_ENTITY_ID] = entity_ids
+        self.calls.append(
+            TraceCall(
+                round(event.time_fired_timestamp - self._start, 3),
+                event.data[ATTR_SERVICE],
+                data,
+            )
+        )
+
+    def save(self, path: Path) -> None:
+        """Write calls to a trace file."""
+        save_trace(path, self.calls)
+
+
+def save_trace(path: Path, calls: list[TraceCall]) -> None:
+    """Write calls as JSON lines."""
+    with path.open("w", encoding="utf-8") as file:
+        for call in calls:
+            file.write(json.dumps(call._asdict()) + "\n")
+
+
+def load_trace(path: Path) -> list[TraceCall]:
+    """Read calls from a trace file."""
+    with path.open(encoding="utf-8") as file:
+        return [TraceCall(**json.loads(line)) for line in file if line.strip()]
+
+
+@dataclass
+class ReplayReport:
+    """What reached the air during replay."""
+
+    calls: int = 0
+    wall_time: float = 0.0
+    frames: int = 0
+    busy_time: dict[str, float] = field(default_factory=dict)
+    divergent: list[str] = field(default_factory=list)
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    fake_remote: FakeRemote,
+    calls: list[TraceCall],
+    speed: float = 10.0,
+    max_gap: float = 1.0,
+) -> ReplayReport:
+    """Replay calls speed times faster, idle gaps are cut to max_gap seconds.
+
+    Calls aren't awaited one by one, so they overlap like they would do in a
+    household. Blaster busy time is counted in air time of the fake remote.
+    """
+    frames = fake_remote.frames
+    busy_time = dict(fake_remote.busy_time)
+    start = time.monotonic()
+    tasks: list[asyncio.Task] = []
+    previous = calls[0].time if calls else 0.0
+    for call in calls:
+        await asyncio.sleep(min((call.time - previous) / speed, max_gap))
+        previous = call.time
+        tasks.append(
+            hass.async_create_task(
+                hass.services.async_call(
+                    CLIMATE_DOMAIN, call.service, call.data, blocking=True
+                )
+            )
+        )
+    await asyncio.gather(*tasks)
+    await hass.async_block_till_done()
+
+    component = hass.data[CLIMATE_COMPONENT]
+    entity_ids = sorted({x for call in calls for x in call.data[ATTR_ENTITY_ID]})
+    return ReplayReport(
+        calls=len(calls),
+        wall_time=time.monotonic() - start,
+        frames=fake_remote.frames - frames,
+        busy_time={
+            entity_id: round(value - busy_time.get(entity_id, 0.0), 6)
+            for entity_id, value in fake_remote.busy_time.items()
+        },
+        divergent=[
+            entity_id
+            for entity_id in entity_ids
+            if not fake_remote.is_delivered(
+                component.get_entity(entity_id)._config.device,
+                hass.states.get(entity_id),
+            )
+        ],
+    )